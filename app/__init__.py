@@ -1,15 +1,31 @@
 from flask import Flask, jsonify
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from .config import Config
 from .database import db
 from .utils.errors import register_error_handlers
+from .utils.auth import require_auth
+from .utils.audit import audit_sink
+from .utils.admin_cache import admin_cache
+from .utils.passwords import password_hasher
+from .utils.rate_limit import rate_limiter
+from .utils.timing import request_timer
+from .utils.metrics import metrics, instrument_pool
+from .utils.slow_queries import slow_query_log
 from .utils.file import init_cloudinary
+from .utils.db_pool import configure_engine, pool_stats
+from .utils.db_routing import replica_router, REPLICA_BIND
+from .migrations import check_schema, SchemaOutdated
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
+    # IP real del cliente (bitacora y rate limiting) cuando hay proxies delante
+    if app.config['TRUSTED_PROXIES']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'], x_proto=app.config['TRUSTED_PROXIES'])
+
     # Inicializar Cloudinary
     with app.app_context():
         init_cloudinary()
@@ -22,17 +38,43 @@ def create_app():
             "origins": allowed_origins,
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
             "allow_headers": ["Content-Type", "Authorization"],
-            "expose_headers": ["Content-Type"],
+            "expose_headers": ["Content-Type", "Retry-After", "Server-Timing"],
             "supports_credentials": True
         }
     })
     
     db.init_app(app)
     register_error_handlers(app)
+    audit_sink.init_app(app)
+    admin_cache.init_app(app)
+    password_hasher.init_app(app)
+    metrics.init_app(app)
+    slow_query_log.init_app(app)
+    request_timer.init_app(app)  # antes del rate limit: un 429 tambien se mide
+    rate_limiter.init_app(app)
+
+    # La serializacion se mide en los schemas de respuesta, no en cada ruta
+    from .schemas.admin_schema import AdminResponseSchema
+    from .schemas.audit        import AuditLogResponseSchema
+    from .schemas.category     import CategoryResponseSchema
+    from .schemas.product      import ProductResponseSchema, ProductImageSchema
+    from .schemas.provider     import ProviderResponseSchema
+    from .schemas.site_content import SiteContentResponseSchema
+    from .schemas.tag          import TagResponseSchema
+    request_timer.instrument_serializers(
+        AdminResponseSchema, AuditLogResponseSchema, CategoryResponseSchema, ProductResponseSchema,
+        ProductImageSchema, ProviderResponseSchema, SiteContentResponseSchema, TagResponseSchema,
+    )
 
     with app.app_context():
         from . import models  # noqa: importar para que SQLAlchemy registre los modelos
-        db.create_all()
+        for bind, engine in db.engines.items():
+            configure_engine(engine, app.config['DB_POOL_SETTINGS'])
+            request_timer.instrument(engine)
+            slow_query_log.instrument(engine)
+            instrument_pool(engine, bind or 'primary', app.config['DB_POOL_SETTINGS'])
+        replica_router.init_app(app, db.engines.get(REPLICA_BIND))
+        _check_schema_version(app)
 
     # Blueprints
     from .routes.auth_routes         import auth_bp
@@ -56,6 +98,34 @@ def create_app():
     def health():
         return jsonify({'status': 'ok'})
 
+    @app.route('/health/db')
+    @require_auth
+    def health_db():
+        """Estado del pool de conexiones: tamaño, en uso, libres y overflow (solo admins)."""
+        replica_engine = db.engines.get(REPLICA_BIND)
+        if replica_engine is not None:
+            replica_router.available()  # refresca el atraso si ya toca
+        return jsonify({
+            'pooler_mode':  app.config['DB_POOL_SETTINGS']['pooler_mode'],
+            'pool':         pool_stats(db.engine),
+            'replica_pool': pool_stats(replica_engine) if replica_engine is not None else None,
+            'replica':      replica_router.status(),
+        })
+
     # Ya no necesitamos servir uploads porque Cloudinary lo hace
 
-    return app
\ No newline at end of file
+    return app
+
+
+def _check_schema_version(app):
+    """Compara la version de la base con la del codigo (una consulta).
+    Las migraciones no corren al arrancar: se aplican con migrate.py."""
+    mode = app.config['SCHEMA_CHECK']
+    if mode == 'off':
+        return
+    try:
+        check_schema(db.engine)
+    except SchemaOutdated as e:
+        if mode == 'strict':
+            raise
+        print(f"⚠️  {e}")
@@ -0,0 +1,69 @@
+"""
+Ruta de lectura async del catalogo publico (opcional).
+
+Starlette atiende con asyncpg los GET publicos mas pedidos y todo lo demas
+(admin, login, subidas) sigue yendo a la app Flask, montada debajo como WSGI.
+Las respuestas tienen la misma forma que las de Flask.
+
+    uvicorn asgi:app
+"""
+from contextlib import asynccontextmanager
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Mount, Route
+from .. import create_app
+from ..utils.metrics import instrument_pool
+from ..utils.slow_queries import slow_query_log
+from ..utils.timing import request_timer
+from . import routes
+from .database import build_async_engine, build_sessionmaker
+from .middleware import InstrumentationMiddleware
+
+
+def create_asgi_app(flask_app=None):
+    flask_app = flask_app or create_app()
+    config = flask_app.config
+
+    # Mismos origenes que Flask-CORS; solo en las rutas async para no duplicar
+    # cabeceras en las respuestas que ya arma Flask
+    route_middleware = [Middleware(
+        CORSMiddleware,
+        allow_origins=config.get('CORS_ORIGINS', 'http://localhost:5173').split(','),
+        allow_methods=['GET', 'OPTIONS'],
+        allow_headers=['Content-Type', 'Authorization'],
+        expose_headers=['Content-Type', 'Retry-After', 'Server-Timing'],
+        allow_credentials=True,
+    ), Middleware(InstrumentationMiddleware)]
+
+    def read_route(path, endpoint):
+        return Route(path, endpoint, methods=['GET', 'OPTIONS'], middleware=route_middleware)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # El engine se crea dentro de cada worker (despues del fork) y en su event loop
+        engine = build_async_engine(config['SQLALCHEMY_DATABASE_URI'], config['DB_POOL_SETTINGS'])
+        request_timer.instrument(engine.sync_engine)
+        slow_query_log.instrument(engine.sync_engine)
+        instrument_pool(engine.sync_engine, 'asgi', config['DB_POOL_SETTINGS'])
+        app.state.sessionmaker = build_sessionmaker(engine)
+        try:
+            yield
+        finally:
+            await engine.dispose()
+
+    app = Starlette(
+        routes=[
+            read_route('/api/products', routes.list_products),
+            read_route('/api/products/{product_id:int}', routes.get_product),
+            read_route('/api/categories', routes.list_categories),
+            read_route('/api/tags', routes.list_tags),
+            read_route('/api/site-content/{key}', routes.get_site_content),
+            Mount('/', app=WSGIMiddleware(flask_app)),
+        ],
+        lifespan=lifespan,
+    )
+    # gunicorn.conf.py usa la app Flask para descartar las conexiones heredadas del fork
+    app.state.flask_app = flask_app
+    return app
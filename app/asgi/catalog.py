@@ -0,0 +1,81 @@
+import math
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import selectinload
+from ..models import Category, Product, SiteContent, Tag
+from ..repositories.product_repository import ProductRepository
+
+
+# Todo lo que lee ProductResponseSchema (sin campos de admin): con AsyncSession
+# no hay lazy loading, cada relacion se trae en una consulta para toda la pagina
+PUBLIC_PRODUCT_LOADS = (
+    selectinload(Product.categories),
+    selectinload(Product.tags),
+    selectinload(Product.images),
+    selectinload(Product.primary_image),
+)
+
+
+class CatalogPage:
+    """Mismos atributos que el Pagination de Flask-SQLAlchemy que usan las rutas."""
+
+    def __init__(self, items, total, page, per_page):
+        self.items    = items
+        self.total    = total
+        self.page     = page
+        self.per_page = per_page
+        self.pages    = math.ceil(total / per_page) if total else 0
+
+
+class AsyncCatalogRepository:
+    """
+    Lecturas del catalogo publico sobre AsyncSession. Los filtros salen de
+    ProductRepository.catalog_filters para que ambas rutas devuelvan lo mismo.
+    """
+
+    @staticmethod
+    async def get_paginated(session, page, per_page, category_ids=None, tag_ids=None, search=None):
+        # Igual que paginate(error_out=False): una pagina invalida vuelve a la 1
+        page = max(page, 1)
+        conditions = ProductRepository.catalog_filters(category_ids, tag_ids, None, search)
+
+        total = await session.scalar(select(func.count()).select_from(Product).where(*conditions))
+        result = await session.scalars(
+            select(Product)
+            .where(*conditions)
+            .options(*PUBLIC_PRODUCT_LOADS)
+            .order_by(Product.name)
+            .limit(per_page)
+            .offset((page - 1) * per_page)
+        )
+        return CatalogPage(result.all(), total, page, per_page)
+
+    @staticmethod
+    async def get_product(session, product_id):
+        return await session.get(Product, product_id, options=PUBLIC_PRODUCT_LOADS)
+
+    @staticmethod
+    async def get_categories(session):
+        result = await session.scalars(select(Category).order_by(Category.name))
+        return result.all()
+
+    @staticmethod
+    async def get_tags(session):
+        result = await session.scalars(select(Tag).order_by(Tag.name))
+        return result.all()
+
+    @staticmethod
+    async def get_or_create_site_content(session, key):
+        """Como SiteContentRepository.get_or_create, sin carrera entre dos requests que crean la misma clave."""
+        query = select(SiteContent).where(SiteContent.key == key)
+        content = await session.scalar(query)
+        if content is None:
+            await session.execute(
+                insert(SiteContent)
+                .values(key=key, title='', content='', updated_at=datetime.utcnow())
+                .on_conflict_do_nothing(index_elements=['key'])
+            )
+            await session.commit()
+            content = await session.scalar(query)
+        return content
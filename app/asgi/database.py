@@ -0,0 +1,64 @@
+from uuid import uuid4
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+def async_database_url(database_uri):
+    """
+    Convierte SQLALCHEMY_DATABASE_URI al driver asyncpg. asyncpg no entiende
+    sslmode: se traduce a su parametro ssl. Retorna (url, connect_args).
+    """
+    url = make_url(database_uri)
+    if url.get_backend_name() != 'postgresql':
+        raise RuntimeError('La ruta async del catalogo requiere PostgreSQL (DATABASE_URL)')
+
+    query = dict(url.query)
+    connect_args = {}
+    sslmode = query.pop('sslmode', None)
+    if sslmode:
+        connect_args['ssl'] = sslmode
+    return url.set(drivername='postgresql+asyncpg', query=query), connect_args
+
+
+def build_async_engine(database_uri, settings):
+    """
+    Engine asyncpg con el mismo perfil de pool que el engine sincrono
+    (DB_POOL_SETTINGS). En modo transaction (PgBouncer / Supabase 6543) no se
+    usan prepared statements con nombre fijo y el statement_timeout va por
+    SET LOCAL, igual que en configure_engine.
+    """
+    url, connect_args = async_database_url(database_uri)
+    connect_args['timeout'] = settings['connect_timeout']
+
+    transaction_mode = settings['pooler_mode'] == 'transaction'
+    if transaction_mode:
+        connect_args['statement_cache_size'] = 0
+        connect_args['prepared_statement_cache_size'] = 0
+        connect_args['prepared_statement_name_func'] = lambda: f'__asyncpg_{uuid4()}__'
+    elif settings['statement_timeout_ms']:
+        connect_args['server_settings'] = {'statement_timeout': str(settings['statement_timeout_ms'])}
+
+    engine = create_async_engine(
+        url,
+        pool_size=settings['pool_size'],
+        max_overflow=settings['max_overflow'],
+        pool_timeout=settings['pool_timeout'],
+        pool_recycle=settings['pool_recycle'],
+        pool_pre_ping=settings['pool_pre_ping'],
+        connect_args=connect_args,
+    )
+
+    if transaction_mode and settings['statement_timeout_ms']:
+        timeout = int(settings['statement_timeout_ms'])
+
+        @event.listens_for(engine.sync_engine, 'begin')
+        def set_statement_timeout(conn):
+            conn.exec_driver_sql(f'SET LOCAL statement_timeout = {timeout}')
+
+    return engine
+
+
+def build_sessionmaker(engine):
+    # expire_on_commit=False: los objetos se serializan despues del commit sin volver a la base
+    return async_sessionmaker(engine, expire_on_commit=False)
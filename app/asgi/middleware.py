@@ -0,0 +1,42 @@
+from starlette.datastructures import MutableHeaders
+from ..utils.metrics import metrics, observe_request
+from ..utils.timing import current_timings, request_timer, reset_timing, start_timing
+
+
+class InstrumentationMiddleware:
+    """
+    Misma medicion que hacen RequestTimer y Metrics en Flask, para las rutas
+    async: cabecera Server-Timing, linea JSON en el log y metricas de
+    Prometheus (blueprint 'asgi'). Va por ruta (no global) para no medir dos
+    veces los requests que atiende la app Flask montada.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not (request_timer.enabled or metrics.enabled):
+            await self.app(scope, receive, send)
+            return
+
+        endpoint = scope.get('endpoint')
+        endpoint_name = endpoint.__name__ if endpoint else None
+        token = start_timing(f'asgi.{endpoint_name}')
+        timings = current_timings()
+
+        async def send_instrumented(message):
+            if message['type'] == 'http.response.start':
+                if request_timer.enabled:
+                    header = request_timer.report(
+                        timings, scope['method'], scope['path'], timings.endpoint, message['status']
+                    )
+                    if header:
+                        MutableHeaders(scope=message).append('Server-Timing', header)
+                if metrics.enabled:
+                    observe_request('asgi', endpoint_name, scope['method'], message['status'], timings.elapsed())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_instrumented)
+        finally:
+            reset_timing(token)
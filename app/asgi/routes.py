@@ -0,0 +1,116 @@
+from starlette.responses import JSONResponse
+from ..schemas.category import CategoryResponseSchema
+from ..schemas.product import ProductResponseSchema
+from ..schemas.site_content import SiteContentResponseSchema
+from ..schemas.tag import TagResponseSchema
+from ..utils.rate_limit import ROUTE_POLICIES, TOO_MANY_REQUESTS, rate_limiter
+from .catalog import AsyncCatalogRepository
+
+
+# Mismo tamaño de pagina que app/routes/product_routes.py
+PER_PAGE = 15
+
+
+def _int_arg(request, name, default):
+    """Como request.args.get(name, default, type=int): un valor invalido usa el default."""
+    try:
+        return int(request.query_params[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _get_filter_ids(request, param_name):
+    """?category_id=1&category_id=2 -> [1, 2]. Los valores no numericos se ignoran (igual que Flask)."""
+    ids = []
+    for value in request.query_params.getlist(param_name):
+        try:
+            ids.append(int(value))
+        except ValueError:
+            continue
+    return ids
+
+
+def _rate_limited(request, endpoint):
+    """
+    Aplica las politicas de ROUTE_POLICIES del endpoint Flask equivalente, con
+    el mismo backend: un cliente no duplica su cupo alternando entre rutas.
+    Retorna la respuesta 429 o None.
+    """
+    if not rate_limiter.enabled:
+        return None
+    client_ip = request.client.host if request.client else None
+    if client_ip is None:
+        return None
+    retry_after = rate_limiter.consume([(policy, client_ip) for policy, _ in ROUTE_POLICIES[endpoint]])
+    if retry_after is not None:
+        return JSONResponse({'error': TOO_MANY_REQUESTS}, status_code=429, headers={'Retry-After': str(retry_after)})
+    return None
+
+
+async def list_products(request):
+    limited = _rate_limited(request, 'products.list_products')
+    if limited:
+        return limited
+
+    search = request.query_params.get('search', '').strip()
+    async with request.app.state.sessionmaker() as session:
+        paginated = await AsyncCatalogRepository.get_paginated(
+            session,
+            page=_int_arg(request, 'page', 1),
+            per_page=PER_PAGE,
+            category_ids=_get_filter_ids(request, 'category_id'),
+            tag_ids=_get_filter_ids(request, 'tag_id'),
+            search=search if search else None,
+        )
+
+    return JSONResponse({
+        'products': ProductResponseSchema.serialize_many(paginated.items, include_admin_fields=False),
+        'total': paginated.total,
+        'pages': paginated.pages,
+        'current_page': paginated.page,
+        'per_page': PER_PAGE,
+    })
+
+
+async def get_product(request):
+    """Obtener un producto por ID (publico, sin precio ni proveedores)"""
+    limited = _rate_limited(request, 'products.get_product')
+    if limited:
+        return limited
+
+    async with request.app.state.sessionmaker() as session:
+        product = await AsyncCatalogRepository.get_product(session, request.path_params['product_id'])
+    if not product:
+        return JSONResponse({'error': 'Producto no encontrado'}, status_code=404)
+    return JSONResponse(ProductResponseSchema.serialize(product, include_admin_fields=False))
+
+
+async def list_categories(request):
+    limited = _rate_limited(request, 'categories.list_categories')
+    if limited:
+        return limited
+
+    async with request.app.state.sessionmaker() as session:
+        categories = await AsyncCatalogRepository.get_categories(session)
+    return JSONResponse(CategoryResponseSchema.serialize_many(categories))
+
+
+async def list_tags(request):
+    limited = _rate_limited(request, 'tags.list_tags')
+    if limited:
+        return limited
+
+    async with request.app.state.sessionmaker() as session:
+        tags = await AsyncCatalogRepository.get_tags(session)
+    return JSONResponse(TagResponseSchema.serialize_many(tags))
+
+
+async def get_site_content(request):
+    """Retorna el contenido con esa clave. Si no existe, retorna vacio."""
+    limited = _rate_limited(request, 'site_content.get_site_content')
+    if limited:
+        return limited
+
+    async with request.app.state.sessionmaker() as session:
+        content = await AsyncCatalogRepository.get_or_create_site_content(session, request.path_params['key'])
+    return JSONResponse(SiteContentResponseSchema.serialize(content))
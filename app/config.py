@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from .utils.db_pool import read_pool_settings, build_engine_options
 
 load_dotenv()
 
@@ -21,16 +22,104 @@ class Config:
             f"{os.environ.get('DB_PORT', '5432')}/"
             f"{os.environ.get('DB_NAME')}"
         )
+
+    # Perfil del pool de conexiones (ver app/utils/db_pool.py). Para Supabase:
+    # puerto 5432 -> DB_POOLER_MODE=session, puerto 6543 -> DB_POOLER_MODE=transaction
+    DB_POOL_SETTINGS = read_pool_settings(os.environ)
+    SQLALCHEMY_ENGINE_OPTIONS = build_engine_options(SQLALCHEMY_DATABASE_URI, DB_POOL_SETTINGS)
+
+    # Replica de lectura opcional: el catalogo publico lee de aca, los admins siempre del primario
+    REPLICA_DATABASE_URL    = os.environ.get('REPLICA_DATABASE_URL')
+    REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', 10))
+    REPLICA_CHECK_INTERVAL  = float(os.environ.get('REPLICA_CHECK_INTERVAL', 5))   # segundos entre chequeos de atraso
+    if REPLICA_DATABASE_URL:
+        SQLALCHEMY_BINDS = {
+            'replica': {'url': REPLICA_DATABASE_URL, **build_engine_options(REPLICA_DATABASE_URL, DB_POOL_SETTINGS)},
+        }
+
+
+    # Al arrancar se verifica que la base tenga todas las migraciones (python migrate.py upgrade).
+    # 'strict' no arranca si faltan, 'warn' solo avisa, 'off' no consulta.
+    SCHEMA_CHECK = os.environ.get('SCHEMA_CHECK', 'strict')
     
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key')
     
+    # Bitacora: 'async' encola y escribe por lotes en segundo plano, 'sync' escribe en el request
+    AUDIT_WRITE_MODE     = os.environ.get('AUDIT_WRITE_MODE', 'async')
+    AUDIT_BATCH_SIZE     = int(os.environ.get('AUDIT_BATCH_SIZE', 50))
+    AUDIT_FLUSH_INTERVAL = float(os.environ.get('AUDIT_FLUSH_INTERVAL', 1.0))   # segundos
+    AUDIT_QUEUE_MAX_SIZE = int(os.environ.get('AUDIT_QUEUE_MAX_SIZE', 10_000))
+    # Si el INSERT falla se reintenta con espera exponencial; agotados los intentos
+    # las entradas se guardan en AUDIT_SPILL_DIR y se reinsertan cuando la base responde
+    AUDIT_WRITE_RETRIES  = int(os.environ.get('AUDIT_WRITE_RETRIES', 3))
+    AUDIT_RETRY_BACKOFF  = float(os.environ.get('AUDIT_RETRY_BACKOFF', 0.5))    # segundos, se duplica
+    AUDIT_SPILL_DIR      = os.environ.get('AUDIT_SPILL_DIR', os.path.join(os.getcwd(), 'archive', 'audit-spill'))
+
+    # Retencion de la bitacora (particiones mensuales en PostgreSQL, ver archive_audit_logs.py)
+    AUDIT_RETENTION_MONTHS  = int(os.environ.get('AUDIT_RETENTION_MONTHS', 12))
+    AUDIT_PARTITIONS_AHEAD  = int(os.environ.get('AUDIT_PARTITIONS_AHEAD', 3))
+    AUDIT_ARCHIVE_DIR       = os.environ.get('AUDIT_ARCHIVE_DIR', os.path.join(os.getcwd(), 'archive', 'audit'))
+
+    # Contraseñas: esquema de Werkzeug (ej: 'pbkdf2:sha256:600000', 'scrypt:32768:8:1').
+    # Los hashes con otro esquema se actualizan en el siguiente login exitoso.
+    PASSWORD_HASH_METHOD      = os.environ.get('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_HASH_WORKERS     = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 8))
+    PASSWORD_HASH_TIMEOUT     = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))  # segundos
+
+    # Cache del admin autenticado en require_auth (por worker)
+    ADMIN_CACHE_TTL            = float(os.environ.get('ADMIN_CACHE_TTL', 30))             # segundos, 0 desactiva
+    ADMIN_CACHE_VERSION_CHECK  = float(os.environ.get('ADMIN_CACHE_VERSION_CHECK', 2))     # segundos entre chequeos de version
+
+    # Rate limiting (token bucket). RATE_LIMIT_STORAGE: 'memory' (por worker) o redis://host:6379/0 (compartido)
+    RATE_LIMIT_ENABLED     = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_STORAGE     = os.environ.get('RATE_LIMIT_STORAGE', 'memory')
+    RATE_LIMIT_LOGIN_IP    = os.environ.get('RATE_LIMIT_LOGIN_IP', '10/minute')
+    RATE_LIMIT_LOGIN_EMAIL = os.environ.get('RATE_LIMIT_LOGIN_EMAIL', '5/minute')
+    RATE_LIMIT_CATALOG     = os.environ.get('RATE_LIMIT_CATALOG', '120/minute')
+    RATE_LIMIT_PUBLIC      = os.environ.get('RATE_LIMIT_PUBLIC', '300/minute')
+
+    # Instrumentacion por request: cabecera Server-Timing + linea JSON en el log.
+    # REQUEST_TIMING_LOG: 'all', 'budget' (solo los que superan el presupuesto) u 'off'
+    REQUEST_TIMING_ENABLED = os.environ.get('REQUEST_TIMING_ENABLED', 'true').lower() == 'true'
+    REQUEST_TIMING_HEADER  = os.environ.get('REQUEST_TIMING_HEADER', 'true').lower() == 'true'
+    REQUEST_TIMING_LOG     = os.environ.get('REQUEST_TIMING_LOG', 'budget')
+    REQUEST_BUDGET_QUERIES = int(os.environ.get('REQUEST_BUDGET_QUERIES', 20))   # consultas SQL, 0 desactiva
+    REQUEST_BUDGET_MS      = int(os.environ.get('REQUEST_BUDGET_MS', 500))       # milisegundos, 0 desactiva
+
+    # Registro de consultas lentas (opcional). SLOW_QUERY_EXPLAIN_SAMPLE: fraccion (0 a 1) de los
+    # SELECT lentos a los que se les captura EXPLAIN (ANALYZE, BUFFERS); los vuelve a ejecutar
+    SLOW_QUERY_ENABLED        = os.environ.get('SLOW_QUERY_ENABLED', 'false').lower() == 'true'
+    SLOW_QUERY_THRESHOLD_MS   = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 200))
+    SLOW_QUERY_EXPLAIN_SAMPLE = float(os.environ.get('SLOW_QUERY_EXPLAIN_SAMPLE', 0))
+    SLOW_QUERY_BUFFER_SIZE    = int(os.environ.get('SLOW_QUERY_BUFFER_SIZE', 100))   # entradas por worker
+
+    # Metricas Prometheus en /metrics con Authorization: Bearer <METRICS_TOKEN>.
+    # Sin METRICS_TOKEN las metricas se desactivan (con un aviso al arrancar)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN   = os.environ.get('METRICS_TOKEN') or None
+
+    # Cantidad de proxies delante de la API (Render, nginx) cuyo X-Forwarded-For se confia.
+    # Con 0 se usa la IP de la conexion; detras de un proxy todas las IPs serian la del proxy.
+    TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES', 0))
+
     # CORS: permitir múltiples orígenes separados por coma
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'http://localhost:5173')
 
     # Ya no necesitamos UPLOAD_FOLDER porque usamos Cloudinary
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5MB
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'webp'}
+
+    # Procesamiento local de imagenes antes de subirlas (utils/file.py)
+    IMAGE_MAX_DIMENSION  = int(os.environ.get('IMAGE_MAX_DIMENSION', 2000))        # px, lado mas largo
+    IMAGE_MAX_PIXELS     = int(os.environ.get('IMAGE_MAX_PIXELS', 40_000_000))     # anti bombas de descompresion
+    IMAGE_QUALITY        = int(os.environ.get('IMAGE_QUALITY', 85))
+    IMAGE_SPOOL_MAX_SIZE = 1 * 1024 * 1024  # Por encima de 1MB el resultado pasa a disco
+
+    # Variantes responsivas (srcset) y placeholder LQIP generados al subir
+    IMAGE_VARIANT_WIDTHS   = [int(w) for w in os.environ.get('IMAGE_VARIANT_WIDTHS', '320,640,960,1280').split(',')]
+    IMAGE_PLACEHOLDER_SIZE = int(os.environ.get('IMAGE_PLACEHOLDER_SIZE', 16))  # px
     
     # Cloudinary (se configura en utils/file.py)
     CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME')
@@ -0,0 +1,162 @@
+"""
+Migraciones de esquema versionadas.
+
+Cada revision es un modulo en versions/ llamado NNNN_descripcion.py con:
+
+    revision      = '0002'                  # orden de aplicacion
+    description   = 'Texto corto'
+    transactional = True                     # False para CREATE INDEX CONCURRENTLY y similares
+    def upgrade(conn): ...                   # recibe una Connection de SQLAlchemy
+
+Las revisiones transaccionales corren junto con el registro en
+schema_migrations: o se aplica todo o nada. Las no transaccionales corren
+en autocommit y deben ser idempotentes (IF NOT EXISTS), porque si fallan a
+mitad se vuelven a ejecutar completas.
+
+Al arrancar, la app solo compara la ultima version aplicada con la ultima
+revision conocida (check_schema). Las migraciones se aplican con migrate.py.
+"""
+import importlib
+import pkgutil
+import re
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import ProgrammingError
+
+
+VERSIONS_PACKAGE = f'{__name__}.versions'
+VERSION_TABLE = 'schema_migrations'
+ADVISORY_LOCK_KEY = 4_201_775  # evita que dos procesos migren a la vez
+
+_MODULE_RE = re.compile(r'^(\d{4})_\w+$')
+
+
+class SchemaOutdated(RuntimeError):
+    """La base no tiene aplicadas todas las revisiones que espera el codigo."""
+
+
+def load_revisions():
+    """Modulos de versions/ ordenados por revision."""
+    package = importlib.import_module(VERSIONS_PACKAGE)
+    revisions = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        match = _MODULE_RE.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f'{VERSIONS_PACKAGE}.{module_info.name}')
+        if module.revision != match.group(1):
+            raise RuntimeError(f'{module_info.name}: revision {module.revision!r} no coincide con el nombre del archivo')
+        revisions.append(module)
+
+    revisions.sort(key=lambda m: m.revision)
+    seen = set()
+    for module in revisions:
+        if module.revision in seen:
+            raise RuntimeError(f'Revision duplicada: {module.revision}')
+        seen.add(module.revision)
+    return revisions
+
+
+def head_revision():
+    revisions = load_revisions()
+    return revisions[-1].revision if revisions else None
+
+
+def _ensure_version_table(conn):
+    conn.execute(text(
+        f'CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ('
+        '  version     VARCHAR(32) PRIMARY KEY,'
+        '  description VARCHAR(200),'
+        "  applied_at  TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc')"
+        ')'
+    ))
+
+
+def applied_versions(conn):
+    """Versiones registradas. Conjunto vacio si la tabla todavia no existe."""
+    if not inspect(conn).has_table(VERSION_TABLE):
+        return set()
+    return set(conn.execute(text(f'SELECT version FROM {VERSION_TABLE}')).scalars())
+
+
+def _record(conn, module):
+    conn.execute(
+        text(f'INSERT INTO {VERSION_TABLE} (version, description) VALUES (:version, :description)'),
+        {'version': module.revision, 'description': module.description},
+    )
+
+
+def status(engine):
+    """[(revision, descripcion, aplicada)] de todas las revisiones conocidas."""
+    with engine.connect() as conn:
+        applied = applied_versions(conn)
+    return [(m.revision, m.description, m.revision in applied) for m in load_revisions()]
+
+
+def upgrade(engine, target=None, log=print):
+    """Aplica en orden las revisiones pendientes hasta target (o hasta la ultima)."""
+    revisions = load_revisions()
+    if target is not None and target not in {m.revision for m in revisions}:
+        raise RuntimeError(f'Revision desconocida: {target}')
+
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as lock_conn:
+        lock_conn.execute(text('SELECT pg_advisory_lock(:key)'), {'key': ADVISORY_LOCK_KEY})
+        try:
+            with engine.begin() as conn:
+                _ensure_version_table(conn)
+            with engine.connect() as conn:
+                applied = applied_versions(conn)
+
+            count = 0
+            for module in revisions:
+                if target is not None and module.revision > target:
+                    break
+                if module.revision in applied:
+                    continue
+
+                if module.transactional:
+                    with engine.begin() as conn:
+                        module.upgrade(conn)
+                        _record(conn, module)
+                else:
+                    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                        module.upgrade(conn)
+                        _record(conn, module)
+                log(f"✅ {module.revision} {module.description}")
+                count += 1
+            return count
+        finally:
+            lock_conn.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': ADVISORY_LOCK_KEY})
+
+
+def stamp(engine, version):
+    """Marca como aplicadas todas las revisiones hasta version, sin ejecutarlas."""
+    revisions = load_revisions()
+    if version not in {m.revision for m in revisions}:
+        raise RuntimeError(f'Revision desconocida: {version}')
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        applied = applied_versions(conn)
+        for module in revisions:
+            if module.revision > version:
+                break
+            if module.revision not in applied:
+                _record(conn, module)
+
+
+def check_schema(engine):
+    """
+    Verificacion de arranque: una sola consulta a schema_migrations.
+    Lanza SchemaOutdated si la base esta por detras del codigo.
+    """
+    head = head_revision()
+    with engine.connect() as conn:
+        try:
+            current = conn.execute(text(f'SELECT max(version) FROM {VERSION_TABLE}')).scalar()
+        except ProgrammingError:
+            current = None
+    if current is None or (head is not None and current < head):
+        raise SchemaOutdated(
+            f'Esquema desactualizado (base: {current or "sin migrar"}, codigo: {head}). '
+            f'Ejecutar: python migrate.py upgrade'
+        )
+    return current
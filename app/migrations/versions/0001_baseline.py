@@ -0,0 +1,119 @@
+"""
+Esquema inicial: las tablas tal como las creaba db.create_all() antes de las
+migraciones versionadas. Usa IF NOT EXISTS para que una base existente
+adopte esta revision sin cambios.
+"""
+from sqlalchemy import text
+
+revision = '0001'
+description = 'Esquema inicial'
+transactional = True
+
+STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS admins (
+        id            SERIAL PRIMARY KEY,
+        email         VARCHAR(200) NOT NULL UNIQUE,
+        password_hash VARCHAR(256) NOT NULL,
+        name          VARCHAR(200) NOT NULL,
+        is_active     BOOLEAN,
+        created_at    TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS categories (
+        id         SERIAL PRIMARY KEY,
+        name       VARCHAR(100) NOT NULL UNIQUE,
+        created_at TIMESTAMP WITHOUT TIME ZONE,
+        updated_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tags (
+        id         SERIAL PRIMARY KEY,
+        name       VARCHAR(100) NOT NULL UNIQUE,
+        created_at TIMESTAMP WITHOUT TIME ZONE,
+        updated_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS providers (
+        id          SERIAL PRIMARY KEY,
+        name        VARCHAR(200) NOT NULL,
+        contact     VARCHAR(200),
+        phone       VARCHAR(50),
+        description TEXT,
+        created_at  TIMESTAMP WITHOUT TIME ZONE,
+        updated_at  TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS products (
+        id          SERIAL PRIMARY KEY,
+        name        VARCHAR(200) NOT NULL,
+        description TEXT,
+        price       NUMERIC(12, 2) NOT NULL,
+        image_path  VARCHAR(500),
+        created_at  TIMESTAMP WITHOUT TIME ZONE,
+        updated_at  TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS product_images (
+        id            SERIAL PRIMARY KEY,
+        product_id    INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+        image_path    VARCHAR(500) NOT NULL,
+        is_primary    BOOLEAN NOT NULL,
+        display_order INTEGER NOT NULL,
+        created_at    TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS product_categories (
+        product_id  INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+        category_id INTEGER NOT NULL REFERENCES categories (id) ON DELETE CASCADE,
+        PRIMARY KEY (product_id, category_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS product_tags (
+        product_id INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+        tag_id     INTEGER NOT NULL REFERENCES tags (id) ON DELETE CASCADE,
+        PRIMARY KEY (product_id, tag_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS product_providers (
+        product_id  INTEGER NOT NULL REFERENCES products (id) ON DELETE CASCADE,
+        provider_id INTEGER NOT NULL REFERENCES providers (id) ON DELETE CASCADE,
+        PRIMARY KEY (product_id, provider_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS audit_logs (
+        id         SERIAL PRIMARY KEY,
+        admin_id   INTEGER REFERENCES admins (id),
+        action     VARCHAR(50) NOT NULL,
+        entity     VARCHAR(50),
+        entity_id  INTEGER,
+        details    JSON,
+        ip_address VARCHAR(45),
+        created_at TIMESTAMP WITHOUT TIME ZONE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS site_content (
+        id         SERIAL PRIMARY KEY,
+        key        VARCHAR(100) NOT NULL UNIQUE,
+        title      VARCHAR(200),
+        content    TEXT,
+        updated_at TIMESTAMP WITHOUT TIME ZONE,
+        updated_by INTEGER REFERENCES admins (id)
+    )
+    """,
+]
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.execute(text(statement))
@@ -0,0 +1,95 @@
+"""
+Variantes responsivas y placeholder por imagen, y products.primary_image_id
+como puntero a la imagen principal (antes era un recorrido de product.images).
+"""
+from sqlalchemy import text
+
+revision = '0002'
+description = 'Variantes de imagen y puntero a la imagen principal'
+transactional = True
+
+# Congelado al momento de la migracion: anchos y transformacion de las variantes
+# (los de IMAGE_VARIANT_WIDTHS y build_variant_urls de entonces). Si cambian
+# despues, repetir esta migracion tiene que dar el mismo resultado.
+VARIANT_WIDTHS = [320, 640, 960, 1280]
+
+STATEMENTS = [
+    'ALTER TABLE product_images ADD COLUMN IF NOT EXISTS variants JSON',
+    'ALTER TABLE product_images ADD COLUMN IF NOT EXISTS placeholder TEXT',
+    'ALTER TABLE products ADD COLUMN IF NOT EXISTS primary_image_id INTEGER',
+    # Un puntero a la imagen de otro producto no pasaria la FK compuesta: se rellena abajo
+    """
+    UPDATE products p
+    SET primary_image_id = NULL
+    WHERE p.primary_image_id IS NOT NULL
+      AND NOT EXISTS (
+          SELECT 1 FROM product_images i WHERE i.id = p.primary_image_id AND i.product_id = p.id
+      )
+    """,
+    # La principal tiene que ser del mismo producto: FK compuesta contra UNIQUE (id, product_id).
+    # Borrar la imagen solo anula primary_image_id (PostgreSQL 15+); se rehace si la base
+    # tiene la FK de una sola columna o la que crea db.create_all (sin el ON DELETE)
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_product_images_id_product_id') THEN
+            ALTER TABLE product_images ADD CONSTRAINT uq_product_images_id_product_id UNIQUE (id, product_id);
+        END IF;
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint
+            WHERE conname = 'fk_products_primary_image_id'
+              AND cardinality(conkey) = 2 AND confdelsetcols IS NOT NULL
+        ) THEN
+            ALTER TABLE products DROP CONSTRAINT IF EXISTS fk_products_primary_image_id;
+            ALTER TABLE products ADD CONSTRAINT fk_products_primary_image_id
+                FOREIGN KEY (primary_image_id, id) REFERENCES product_images (id, product_id)
+                ON DELETE SET NULL (primary_image_id);
+        END IF;
+    END $$
+    """,
+    'CREATE INDEX IF NOT EXISTS ix_products_primary_image_id ON products (primary_image_id)',
+    # Relleno del puntero con la imagen marcada (o la primera por orden)
+    """
+    UPDATE products p
+    SET primary_image_id = (
+        SELECT i.id FROM product_images i
+        WHERE i.product_id = p.id
+        ORDER BY i.is_primary DESC, i.display_order, i.id
+        LIMIT 1
+    )
+    WHERE p.primary_image_id IS NULL
+    """,
+    # is_primary queda como espejo del puntero
+    """
+    UPDATE product_images i
+    SET is_primary = COALESCE(i.id = p.primary_image_id, FALSE)
+    FROM products p
+    WHERE p.id = i.product_id
+      AND i.is_primary <> COALESCE(i.id = p.primary_image_id, FALSE)
+    """,
+]
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.execute(text(statement))
+
+    # Variantes de las imagenes subidas antes de que existieran, en un solo UPDATE.
+    # Misma URL que armaba build_variant_urls: la nube sale de la URL original
+    # y el public_id es lo que sigue a pisos-kermy/ sin la extension. El
+    # placeholder LQIP requiere los pixeles originales, por eso queda vacio.
+    conn.execute(text(r"""
+        UPDATE product_images i
+        SET variants = (
+            SELECT json_object_agg(
+                w::text,
+                'https://res.cloudinary.com/' || split_part(i.image_path, '/', 4)
+                    || '/image/upload/c_limit,w_' || w || '/f_auto,q_auto/v1/'
+                    || regexp_replace(substring(i.image_path FROM '/(pisos-kermy/.*)$'), '\.[^./]*$', '')
+                ORDER BY w
+            )
+            FROM unnest(CAST(:widths AS integer[])) AS w
+        )
+        WHERE i.variants IS NULL
+          AND i.image_path LIKE 'https://res.cloudinary.com/%/pisos-kermy/%'
+    """), {'widths': VARIANT_WIDTHS})
@@ -0,0 +1,38 @@
+"""
+Indices de la bitacora para filtros y paginacion por cursor. CONCURRENTLY no
+bloquea las escrituras mientras se construyen, pero no puede correr dentro
+de una transaccion.
+"""
+from sqlalchemy import text
+
+revision = '0003'
+description = 'Indices de audit_logs'
+transactional = False
+
+AUDIT_INDEXES = (
+    ('ix_audit_logs_created_at_id',        '(created_at, id)'),
+    ('ix_audit_logs_admin_id_created_at',  '(admin_id, created_at)'),
+    ('ix_audit_logs_entity_entity_id',     '(entity, entity_id)'),
+)
+
+
+def upgrade(conn):
+    # En la tabla particionada los indices los crea la conversion (0004)
+    # (PostgreSQL no permite CONCURRENTLY sobre tablas particionadas)
+    partitioned = conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = 'audit_logs' AND c.relnamespace = 'public'::regnamespace"
+    )).scalar()
+    if partitioned:
+        return
+    for index_name, columns in AUDIT_INDEXES:
+        # Un CREATE INDEX CONCURRENTLY interrumpido deja el indice invalido;
+        # IF NOT EXISTS lo daria por creado, asi que se elimina y se rehace
+        invalid = conn.execute(text(
+            'SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid '
+            'WHERE c.relname = :name AND NOT i.indisvalid'
+        ), {'name': index_name}).scalar()
+        if invalid:
+            conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}'))
+        conn.execute(text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON audit_logs {columns}'))
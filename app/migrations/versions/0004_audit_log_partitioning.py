@@ -0,0 +1,83 @@
+"""
+audit_logs pasa a ser una tabla particionada por mes (ver archive_audit_logs.py).
+
+La migracion no depende del codigo de la aplicacion: el DDL y los nombres
+quedan fijos aunque AuditPartitionRepository cambie despues. Crea las
+particiones hasta MONTHS_AHEAD meses adelante; las siguientes las crea
+archive_audit_logs.py segun AUDIT_PARTITIONS_AHEAD.
+"""
+from datetime import date
+from sqlalchemy import text
+
+revision = '0004'
+description = 'Particionado mensual de audit_logs'
+transactional = True
+
+MONTHS_AHEAD = 3
+
+# Los mismos indices que 0003, ahora sobre la tabla padre
+AUDIT_INDEXES = (
+    ('ix_audit_logs_created_at_id',        '(created_at, id)'),
+    ('ix_audit_logs_admin_id_created_at',  '(admin_id, created_at)'),
+    ('ix_audit_logs_entity_entity_id',     '(entity, entity_id)'),
+)
+
+
+def _add_months(month_start, months):
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade(conn):
+    partitioned = conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = 'audit_logs' AND c.relnamespace = 'public'::regnamespace"
+    )).scalar()
+    if partitioned:
+        return
+
+    # La clave primaria pasa a ser (id, created_at) porque PostgreSQL exige
+    # que incluya la columna de particion; la secuencia de id se conserva
+    conn.execute(text('ALTER TABLE audit_logs RENAME TO audit_logs_legacy'))
+    for index_name, _ in AUDIT_INDEXES:
+        conn.execute(text(f'ALTER INDEX IF EXISTS {index_name} RENAME TO {index_name}_legacy'))
+    conn.execute(text('ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE'))
+
+    conn.execute(text(
+        "CREATE TABLE audit_logs ("
+        "  id          INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),"
+        "  admin_id    INTEGER REFERENCES admins (id),"
+        "  action      VARCHAR(50) NOT NULL,"
+        "  entity      VARCHAR(50),"
+        "  entity_id   INTEGER,"
+        "  details     JSON,"
+        "  ip_address  VARCHAR(45),"
+        "  created_at  TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),"
+        "  PRIMARY KEY (id, created_at)"
+        ") PARTITION BY RANGE (created_at)"
+    ))
+    conn.execute(text('ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id'))
+    conn.execute(text('CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT'))
+
+    oldest = conn.execute(text('SELECT min(created_at) FROM audit_logs_legacy')).scalar()
+    current_month = date.today().replace(day=1)
+    month = oldest.date().replace(day=1) if oldest else current_month
+    while month <= _add_months(current_month, MONTHS_AHEAD):
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS audit_logs_p{month:%Y%m} PARTITION OF audit_logs '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        ))
+        month = _add_months(month, 1)
+
+    conn.execute(text(
+        'INSERT INTO audit_logs (id, admin_id, action, entity, entity_id, details, ip_address, created_at) '
+        "SELECT id, admin_id, action, entity, entity_id, details, ip_address, "
+        "       COALESCE(created_at, now() AT TIME ZONE 'utc') "
+        'FROM audit_logs_legacy'
+    ))
+    conn.execute(text('DROP TABLE audit_logs_legacy'))
+
+    # Indices en la tabla padre: PostgreSQL los replica en cada particion
+    for index_name, columns in AUDIT_INDEXES:
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS {index_name} ON audit_logs {columns}'))
@@ -0,0 +1,17 @@
+"""
+Contadores de version para invalidar caches entre workers (cache de admins).
+"""
+from sqlalchemy import text
+
+revision = '0005'
+description = 'Tabla cache_versions'
+transactional = True
+
+
+def upgrade(conn):
+    conn.execute(text(
+        'CREATE TABLE IF NOT EXISTS cache_versions ('
+        '  name    VARCHAR(50) PRIMARY KEY,'
+        '  version INTEGER NOT NULL'
+        ')'
+    ))
@@ -0,0 +1,34 @@
+"""
+Indices del catalogo:
+- Asociaciones en orden inverso (X_id, product_id): los filtros
+  category_id/tag_id/provider_id IN (...) no pueden usar la PK (product_id, X_id).
+- product_images (product_id, display_order) para cargar las imagenes de una pagina.
+- products.name (orden del catalogo) y products.created_at.
+"""
+from sqlalchemy import text
+
+revision = '0006'
+description = 'Indices de asociaciones, imagenes y orden del catalogo'
+transactional = False
+
+CATALOG_INDEXES = (
+    ('ix_product_categories_category_id_product_id', 'product_categories', '(category_id, product_id)'),
+    ('ix_product_tags_tag_id_product_id',            'product_tags',       '(tag_id, product_id)'),
+    ('ix_product_providers_provider_id_product_id',  'product_providers',  '(provider_id, product_id)'),
+    ('ix_product_images_product_id_display_order',   'product_images',     '(product_id, display_order)'),
+    ('ix_products_name',                             'products',           '(name)'),
+    ('ix_products_created_at',                       'products',           '(created_at)'),
+)
+
+
+def upgrade(conn):
+    for index_name, table, columns in CATALOG_INDEXES:
+        # Un CREATE INDEX CONCURRENTLY interrumpido deja el indice invalido;
+        # IF NOT EXISTS lo daria por creado, asi que se elimina y se rehace
+        invalid = conn.execute(text(
+            'SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid '
+            'WHERE c.relname = :name AND NOT i.indisvalid'
+        ), {'name': index_name}).scalar()
+        if invalid:
+            conn.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {index_name}'))
+        conn.execute(text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {table} {columns}'))
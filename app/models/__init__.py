@@ -1,9 +1,11 @@
 from .admin import Admin
 from .audit_log import AuditLog
+from .cache_version import CacheVersion
 from .category import Category
 from .tag import Tag
 from .provider import Provider
 from .product import Product
+from .product_image import ProductImage
 from .site_content import SiteContent
 
-__all__ = ['Admin', 'AuditLog', 'Category', 'Tag', 'Provider', 'Product', 'SiteContent']
\ No newline at end of file
+__all__ = ['Admin', 'AuditLog', 'CacheVersion', 'Category', 'Tag', 'Provider', 'Product', 'ProductImage', 'SiteContent']
\ No newline at end of file
@@ -1,6 +1,7 @@
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.security import check_password_hash
 from ..database import db
+from ..utils.passwords import password_hasher
 
 
 class Admin(db.Model):
@@ -14,7 +15,7 @@ class Admin(db.Model):
     created_at     = db.Column(db.DateTime, default=datetime.utcnow)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        self.password_hash = password_hasher.hash_inline(password)
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
\ No newline at end of file
@@ -4,6 +4,11 @@ from ..database import db
 
 class AuditLog(db.Model):
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        db.Index('ix_audit_logs_created_at_id', 'created_at', 'id'),           # orden + cursor
+        db.Index('ix_audit_logs_admin_id_created_at', 'admin_id', 'created_at'),
+        db.Index('ix_audit_logs_entity_entity_id', 'entity', 'entity_id'),
+    )
 
     id          = db.Column(db.Integer, primary_key=True)
     admin_id    = db.Column(db.Integer, db.ForeignKey('admins.id'))
@@ -0,0 +1,10 @@
+from ..database import db
+
+
+class CacheVersion(db.Model):
+    """Contador de version por cache. Cada worker lo consulta cada pocos
+    segundos: si cambio, descarta su copia local (invalidacion entre workers)."""
+    __tablename__ = 'cache_versions'
+
+    name    = db.Column(db.String(50), primary_key=True)  # ej: 'admins'
+    version = db.Column(db.Integer, nullable=False, default=0)
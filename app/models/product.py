@@ -10,18 +10,22 @@ product_categories = db.Table(
     'product_categories',
     db.Column('product_id',  db.Integer, db.ForeignKey('products.id',   ondelete='CASCADE'), primary_key=True),
     db.Column('category_id', db.Integer, db.ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True),
+    # La PK (product_id, category_id) no sirve para filtrar por categoria: indice en orden inverso
+    db.Index('ix_product_categories_category_id_product_id', 'category_id', 'product_id'),
 )
 
 product_tags = db.Table(
     'product_tags',
     db.Column('product_id', db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), primary_key=True),
     db.Column('tag_id',     db.Integer, db.ForeignKey('tags.id',     ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_product_tags_tag_id_product_id', 'tag_id', 'product_id'),
 )
 
 product_providers = db.Table(
     'product_providers',
     db.Column('product_id',  db.Integer, db.ForeignKey('products.id',  ondelete='CASCADE'), primary_key=True),
     db.Column('provider_id', db.Integer, db.ForeignKey('providers.id', ondelete='CASCADE'), primary_key=True),
+    db.Index('ix_product_providers_provider_id_product_id', 'provider_id', 'product_id'),
 )
 
 
@@ -31,32 +35,42 @@ product_providers = db.Table(
 
 class Product(db.Model):
     __tablename__ = 'products'
+    __table_args__ = (
+        # La principal tiene que ser una imagen del mismo producto: la FK compuesta apunta
+        # a UNIQUE (id, product_id) de product_images. use_alter: las tablas se referencian
+        # mutuamente. El ON DELETE SET NULL (primary_image_id) lo agrega la migracion:
+        # SQLAlchemy no admite la lista de columnas y un SET NULL comun anularia products.id
+        db.ForeignKeyConstraint(
+            ['primary_image_id', 'id'], ['product_images.id', 'product_images.product_id'],
+            name='fk_products_primary_image_id', use_alter=True,
+        ),
+    )
 
-    id          = db.Column(db.Integer, primary_key=True)
-    name        = db.Column(db.String(200), nullable=False)
+    id          = db.Column(db.Integer, primary_key=True, autoincrement=True)  # tambien esta en la FK compuesta
+    name        = db.Column(db.String(200), nullable=False, index=True)  # orden del catalogo
     description = db.Column(db.Text, nullable=True)
     price       = db.Column(db.Numeric(12, 2), nullable=False)
     image_path  = db.Column(db.String(500), nullable=True)  # DEPRECATED: Mantener por compatibilidad, usar images
 
+    # Puntero desnormalizado a la imagen principal. Al ser una sola columna la base
+    # de datos garantiza que haya como maximo una principal por producto.
+    primary_image_id = db.Column(db.Integer, nullable=True, index=True)
+
     categories = db.relationship('Category', secondary=product_categories, backref='products')
     tags       = db.relationship('Tag',      secondary=product_tags,       backref='products')
     providers  = db.relationship('Provider', secondary=product_providers,  backref='products')
     
     # NUEVO: Relación con ProductImage
     images = db.relationship('ProductImage', back_populates='product', cascade='all, delete-orphan', 
-                            order_by='ProductImage.display_order')
+                            order_by='ProductImage.display_order', foreign_keys='ProductImage.product_id')
 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Imagen principal (many-to-one): si la imagen ya esta en la sesion se resuelve
+    # por identidad sin consultar, y nunca recorre la coleccion completa.
+    # post_update: el UPDATE del puntero se emite aparte para romper el ciclo de FKs.
+    primary_image = db.relationship('ProductImage', foreign_keys=[primary_image_id], post_update=True)
 
-    @property
-    def primary_image(self):
-        """Retorna la imagen principal del producto"""
-        for img in self.images:
-            if img.is_primary:
-                return img
-        # Si no hay imagen principal, retornar la primera
-        return self.images[0] if self.images else None
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     @property
     def image_url(self):
@@ -72,4 +86,4 @@ class Product(db.Model):
         if self.image_path:
             from ..utils.file import get_image_url
             return get_image_url(self.image_path)
-        return None
\ No newline at end of file
+        return None
@@ -8,16 +8,24 @@ class ProductImage(db.Model):
     Cada producto puede tener varias imágenes, una de ellas marcada como principal.
     """
     __tablename__ = 'product_images'
+    __table_args__ = (
+        # Carga de product.images (WHERE product_id IN ... ORDER BY display_order)
+        db.Index('ix_product_images_product_id_display_order', 'product_id', 'display_order'),
+        # Destino de la FK compuesta products.(primary_image_id, id)
+        db.UniqueConstraint('id', 'product_id', name='uq_product_images_id_product_id'),
+    )
 
     id            = db.Column(db.Integer, primary_key=True)
     product_id    = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
     image_path    = db.Column(db.String(500), nullable=False)
-    is_primary    = db.Column(db.Boolean, default=False, nullable=False)  # Imagen principal
+    is_primary    = db.Column(db.Boolean, default=False, nullable=False)  # Espejo de products.primary_image_id
     display_order = db.Column(db.Integer, default=0, nullable=False)       # Orden de visualización
+    variants      = db.Column(db.JSON, nullable=True)                     # {ancho: url} precalculado al subir
+    placeholder   = db.Column(db.Text, nullable=True)                     # Data URI LQIP (base64)
     created_at    = db.Column(db.DateTime, default=datetime.utcnow)
 
     # Relación con Product
-    product = db.relationship('Product', back_populates='images')
+    product = db.relationship('Product', back_populates='images', foreign_keys=[product_id])
 
     def __repr__(self):
         return f'<ProductImage {self.id} - Product {self.product_id} - Primary: {self.is_primary}>'
\ No newline at end of file
@@ -47,6 +47,13 @@ class AdminRepository:
         db.session.commit()
         return admin
 
+    @staticmethod
+    def set_password_hash(admin, password_hash):
+        """Guardar un hash ya calculado (rehash en el login)."""
+        admin.password_hash = password_hash
+        db.session.commit()
+        return admin
+
     @staticmethod
     def toggle_active(admin):
         """Cambiar estado activo/inactivo de un admin."""
@@ -54,6 +61,12 @@ class AdminRepository:
         db.session.commit()
         return admin
 
+    @staticmethod
+    def delete(admin):
+        """Eliminar un admin."""
+        db.session.delete(admin)
+        db.session.commit()
+
     @staticmethod
     def count_active():
         """Contar admins activos."""
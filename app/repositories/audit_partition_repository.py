@@ -0,0 +1,90 @@
+from datetime import date
+from sqlalchemy import text
+
+
+PARTITION_PREFIX = 'audit_logs_p'
+
+
+def add_months(month_start, months):
+    """Suma meses a una fecha que es primer dia de mes."""
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month_start):
+    return f'{PARTITION_PREFIX}{month_start:%Y%m}'
+
+
+class AuditPartitionRepository:
+    """
+    Particionado mensual de audit_logs (solo PostgreSQL).
+
+    La tabla padre esta particionada por RANGE (created_at); cada mes es una
+    particion audit_logs_pYYYYMM y audit_logs_default recibe cualquier fila
+    fuera de rango para que un INSERT nunca falle.
+    """
+
+    @staticmethod
+    def is_partitioned(conn):
+        """True si audit_logs ya es una tabla particionada."""
+        return bool(conn.execute(text(
+            "SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = 'audit_logs' AND c.relnamespace = 'public'::regnamespace"
+        )).scalar())
+
+    @staticmethod
+    def create_partition(conn, month_start):
+        """Crea la particion del mes si no existe."""
+        conn.execute(text(
+            f'CREATE TABLE IF NOT EXISTS {partition_name(month_start)} '
+            f'PARTITION OF audit_logs '
+            f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{add_months(month_start, 1).isoformat()}')"
+        ))
+
+    @staticmethod
+    def ensure_partitions(conn, first_month, last_month):
+        """Crea las particiones mensuales de first_month a last_month (inclusive)."""
+        month = first_month
+        while month <= last_month:
+            AuditPartitionRepository.create_partition(conn, month)
+            month = add_months(month, 1)
+
+    @staticmethod
+    def list_partitions(conn):
+        """Retorna [(nombre, primer_dia_del_mes)] de las particiones mensuales, ordenadas."""
+        rows = conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'audit_logs' AND c.relname LIKE :prefix "
+            "ORDER BY c.relname"
+        ), {'prefix': f'{PARTITION_PREFIX}%'}).scalars()
+
+        partitions = []
+        for name in rows:
+            suffix = name[len(PARTITION_PREFIX):]
+            partitions.append((name, date(int(suffix[:4]), int(suffix[4:6]), 1)))
+        return partitions
+
+    @staticmethod
+    def count_rows(conn, name):
+        return conn.execute(text(f'SELECT count(*) FROM {name}')).scalar()
+
+    @staticmethod
+    def stream_rows(conn, name, batch_size=1000):
+        """Itera las filas de la particion (con el email del admin) usando un cursor del servidor."""
+        result = conn.execution_options(yield_per=batch_size).execute(text(
+            f'SELECT l.id, l.admin_id, a.email AS admin_email, l.action, l.entity, l.entity_id, '
+            f'l.details, l.ip_address, l.created_at '
+            f'FROM {name} l LEFT JOIN admins a ON a.id = l.admin_id '
+            f'ORDER BY l.created_at, l.id'
+        ))
+        for row in result.mappings():
+            yield row
+
+    @staticmethod
+    def drop_partition(conn, name):
+        """Desacopla y elimina la particion (no toca el resto de la tabla)."""
+        conn.execute(text(f'ALTER TABLE audit_logs DETACH PARTITION {name}'))
+        conn.execute(text(f'DROP TABLE {name}'))
@@ -0,0 +1,76 @@
+from sqlalchemy import tuple_
+from ..database import db
+from ..models import Admin, AuditLog
+
+
+class AuditRepository:
+    """Unica capa que toca la base de datos para la bitacora.
+    El email del admin se trae con un JOIN en la misma consulta (sin N+1)."""
+
+    @staticmethod
+    def _filtered_query(filters):
+        query = (
+            AuditLog.query
+            .outerjoin(Admin, AuditLog.admin_id == Admin.id)
+            .add_columns(Admin.email)
+        )
+
+        if filters.get('admin_id') is not None:
+            query = query.filter(AuditLog.admin_id == filters['admin_id'])
+        if filters.get('action'):
+            query = query.filter(AuditLog.action == filters['action'])
+        if filters.get('entity'):
+            query = query.filter(AuditLog.entity == filters['entity'])
+        if filters.get('entity_id') is not None:
+            query = query.filter(AuditLog.entity_id == filters['entity_id'])
+        if filters.get('date_from'):
+            query = query.filter(AuditLog.created_at >= filters['date_from'])
+        if filters.get('date_to'):
+            query = query.filter(AuditLog.created_at < filters['date_to'])
+
+        return query
+
+    @staticmethod
+    def get_paginated(filters, page, per_page):
+        """Paginacion por offset (incluye total). Retorna filas (AuditLog, admin_email)."""
+        return (
+            AuditRepository._filtered_query(filters)
+            .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+            .paginate(page=page, per_page=per_page, error_out=False)
+        )
+
+    @staticmethod
+    def get_after(filters, after, limit):
+        """
+        Paginacion por cursor (keyset): filas anteriores a after=(created_at, id)
+        en orden descendente. Usa el indice (created_at, id) sin OFFSET ni COUNT.
+        """
+        query = AuditRepository._filtered_query(filters)
+        if after is not None:
+            query = query.filter(tuple_(AuditLog.created_at, AuditLog.id) < tuple_(*after))
+
+        return (
+            query
+            .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def get_by_id(log_id):
+        return db.session.get(AuditLog, log_id)
+
+    @staticmethod
+    def get_updates_after(entity, entity_id, log):
+        """Entradas UPDATE de la entidad posteriores a log, de la mas reciente a la mas vieja."""
+        return (
+            AuditLog.query
+            .filter(
+                AuditLog.entity == entity,
+                AuditLog.entity_id == entity_id,
+                AuditLog.action == 'UPDATE',
+                tuple_(AuditLog.created_at, AuditLog.id) > tuple_(log.created_at, log.id),
+            )
+            .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+            .all()
+        )
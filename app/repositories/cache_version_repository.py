@@ -0,0 +1,33 @@
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from ..database import db
+from ..models import CacheVersion
+
+
+class CacheVersionRepository:
+    """Contadores de version para invalidar caches en todos los workers.
+    Usa su propia conexion para no mezclarse con la transaccion del request."""
+
+    @staticmethod
+    def get(name):
+        """Version actual (0 si nunca se incremento)."""
+        with db.engine.connect() as conn:
+            version = conn.execute(
+                select(CacheVersion.version).where(CacheVersion.name == name)
+            ).scalar()
+        return version or 0
+
+    @staticmethod
+    def bump(name):
+        """Incrementa la version. Crea la fila la primera vez."""
+        stmt = update(CacheVersion).where(CacheVersion.name == name).values(version=CacheVersion.version + 1)
+        with db.engine.begin() as conn:
+            if conn.execute(stmt).rowcount:
+                return
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(CacheVersion.__table__.insert().values(name=name, version=1))
+        except IntegrityError:
+            # Otro worker creo la fila al mismo tiempo
+            with db.engine.begin() as conn:
+                conn.execute(stmt)
@@ -14,6 +14,13 @@ class CategoryRepository:
     def get_by_id(category_id):
         return db.session.get(Category, category_id)
 
+    @staticmethod
+    def get_by_ids(ids):
+        """Retorna las instancias de ids (en cualquier orden) en una sola consulta."""
+        if not ids:
+            return []
+        return Category.query.filter(Category.id.in_(ids)).all()
+
     @staticmethod
     def get_by_name(name):
         return Category.query.filter_by(name=name).first()
@@ -1,43 +1,65 @@
+from sqlalchemy import Integer, column, select, update, values
+from sqlalchemy.orm import selectinload
 from ..database import db
-from ..models import Product
+from ..models import Product, ProductImage
 from ..models.product import product_categories, product_tags, product_providers
 
 
 class ProductRepository:
 
+    LIST_LOADS = (
+        selectinload(Product.categories),
+        selectinload(Product.tags),
+        selectinload(Product.images),
+        selectinload(Product.primary_image),
+    )
+
     @staticmethod
-    def get_paginated(page, per_page, category_ids=None, tag_ids=None, provider_ids=None, search=None):
-        """Retorna productos paginados. Filtra por categorias, etiquetas, proveedores y/o búsqueda por nombre."""
-        query = Product.query
+    def catalog_filters(category_ids=None, tag_ids=None, provider_ids=None, search=None):
+        """
+        Condiciones WHERE del listado del catalogo. Se arman con select() y no
+        con db.session para que la ruta async (app/asgi) filtre exactamente igual.
+        """
+        conditions = []
 
         # Búsqueda por nombre (insensible a mayúsculas/minúsculas)
         if search:
-            search_pattern = f'%{search}%'
-            query = query.filter(Product.name.ilike(search_pattern))
+            conditions.append(Product.name.ilike(f'%{search}%'))
 
         if category_ids:
-            query = query.filter(
-                Product.id.in_(
-                    db.session.query(product_categories.c.product_id)
-                    .filter(product_categories.c.category_id.in_(category_ids))
-                )
-            )
+            conditions.append(Product.id.in_(
+                select(product_categories.c.product_id)
+                .where(product_categories.c.category_id.in_(category_ids))
+            ))
 
         if tag_ids:
-            query = query.filter(
-                Product.id.in_(
-                    db.session.query(product_tags.c.product_id)
-                    .filter(product_tags.c.tag_id.in_(tag_ids))
-                )
-            )
+            conditions.append(Product.id.in_(
+                select(product_tags.c.product_id)
+                .where(product_tags.c.tag_id.in_(tag_ids))
+            ))
 
         if provider_ids:
-            query = query.filter(
-                Product.id.in_(
-                    db.session.query(product_providers.c.product_id)
-                    .filter(product_providers.c.provider_id.in_(provider_ids))
-                )
-            )
+            conditions.append(Product.id.in_(
+                select(product_providers.c.product_id)
+                .where(product_providers.c.provider_id.in_(provider_ids))
+            ))
+
+        return conditions
+
+    @staticmethod
+    def get_paginated(page, per_page, category_ids=None, tag_ids=None, provider_ids=None, search=None,
+                      include_providers=False):
+        """
+        Retorna productos paginados. Filtra por categorias, etiquetas, proveedores y/o búsqueda por nombre.
+        include_providers: cargar tambien los proveedores (solo los muestra el listado admin).
+        """
+        query = Product.query.filter(*ProductRepository.catalog_filters(category_ids, tag_ids, provider_ids, search))
+
+        # Cada relacion que serializa el listado se carga en una sola consulta para
+        # toda la pagina; con el lazy loading por defecto serian varias por producto
+        query = query.options(*ProductRepository.LIST_LOADS)
+        if include_providers:
+            query = query.options(selectinload(Product.providers))
 
         return query.order_by(Product.name).paginate(page=page, per_page=per_page, error_out=False)
 
@@ -80,4 +102,56 @@ class ProductRepository:
     @staticmethod
     def delete(product):
         db.session.delete(product)
-        db.session.commit()
\ No newline at end of file
+        db.session.commit()
+
+    @staticmethod
+    def get_image(product_id, image_id):
+        """Retorna la imagen solo si pertenece al producto."""
+        return ProductImage.query.filter_by(id=image_id, product_id=product_id).first()
+
+    @staticmethod
+    def set_primary_image(product, image):
+        """
+        Marca la imagen como principal con dos UPDATE por conjunto, sin cargar
+        la coleccion de imagenes: uno mueve el puntero del producto (y el cache
+        legacy image_path) y otro sincroniza el flag is_primary.
+        """
+        db.session.execute(
+            update(Product)
+            .where(Product.id == product.id)
+            .values(primary_image_id=image.id, image_path=image.image_path)
+        )
+        db.session.execute(
+            update(ProductImage)
+            .where(ProductImage.product_id == product.id)
+            .values(is_primary=(ProductImage.id == image.id))
+        )
+        db.session.commit()
+
+    @staticmethod
+    def get_image_ids(product_id):
+        """Retorna los IDs de las imagenes del producto sin cargar las filas completas."""
+        rows = db.session.query(ProductImage.id).filter(ProductImage.product_id == product_id).all()
+        return [row.id for row in rows]
+
+    @staticmethod
+    def reorder_images(product, ordered_ids):
+        """
+        Reescribe display_order de todas las imagenes en un solo
+        UPDATE ... FROM (VALUES (id, posicion), ...).
+        """
+        new_order = values(
+            column('id', Integer),
+            column('position', Integer),
+            name='new_order',
+        ).data([(image_id, position) for position, image_id in enumerate(ordered_ids)])
+
+        db.session.execute(
+            update(ProductImage)
+            .where(ProductImage.id == new_order.c.id)
+            .where(ProductImage.product_id == product.id)
+            .values(display_order=new_order.c.position),
+            execution_options={'synchronize_session': False},
+        )
+        db.session.commit()
+        db.session.expire(product, ['images'])
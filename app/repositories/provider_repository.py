@@ -11,6 +11,13 @@ class ProviderRepository:
     def get_by_id(provider_id):
         return db.session.get(Provider, provider_id)
 
+    @staticmethod
+    def get_by_ids(ids):
+        """Retorna las instancias de ids (en cualquier orden) en una sola consulta."""
+        if not ids:
+            return []
+        return Provider.query.filter(Provider.id.in_(ids)).all()
+
     @staticmethod
     def create(data):
         provider = Provider(
@@ -11,6 +11,13 @@ class TagRepository:
     def get_by_id(tag_id):
         return db.session.get(Tag, tag_id)
 
+    @staticmethod
+    def get_by_ids(ids):
+        """Retorna las instancias de ids (en cualquier orden) en una sola consulta."""
+        if not ids:
+            return []
+        return Tag.query.filter(Tag.id.in_(ids)).all()
+
     @staticmethod
     def get_by_name(name):
         return Tag.query.filter_by(name=name).first()
@@ -1,7 +1,12 @@
-from flask import Blueprint, request, jsonify
-from ..models import Admin
+from flask import Blueprint, current_app, request, jsonify
+from ..services.admin_service import AdminService
+from ..services.audit_service import AuditService
+from ..services.audit_archive_service import AuditArchiveService
+from ..schemas.audit import AuditLogQuerySchema, AuditLogResponseSchema
 from ..utils.auth import generate_token, require_auth
 from ..utils.audit import log_audit
+from ..utils.errors import ValidationError
+from ..utils.slow_queries import slow_query_log
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -23,9 +28,9 @@ def login():
     if not email or not password:
         return jsonify({'error': 'Email y password requeridos'}), 400
 
-    admin = Admin.query.filter_by(email=email).first()
+    admin = AdminService.authenticate(email, password)
 
-    if not admin or not admin.is_active or not admin.check_password(password):
+    if not admin:
         return jsonify({'error': 'Credenciales incorrectas'}), 401
 
     token = generate_token(admin.id)
@@ -61,35 +66,73 @@ def get_me():
 @auth_bp.route('/api/auth/audit', methods=['GET'])
 @require_auth
 def list_audit_logs():
-    """Listar bitácora de auditoría."""
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 50, type=int)
-
-    from ..models import AuditLog
-
-    paginated = (
-        AuditLog.query
-        .order_by(AuditLog.created_at.desc())
-        .paginate(page=page, per_page=per_page, error_out=False)
-    )
-
-    logs = []
-    for log in paginated.items:
-        logs.append({
-            'id': log.id,
-            'admin_id': log.admin_id,
-            'admin_email': log.admin.email if log.admin else None,
-            'action': log.action,
-            'entity': log.entity,
-            'entity_id': log.entity_id,
-            'details': log.details,
-            'ip_address': log.ip_address,
-            'created_at': log.created_at.isoformat() if log.created_at else None,
+    """Listar bitácora de auditoría.
+
+    Filtros: admin_id, action, entity, entity_id, date_from, date_to.
+    Paginación: ?cursor= (keyset, recomendado) o ?page= (offset, con total).
+    """
+    validated, errors = AuditLogQuerySchema.validate(request.args)
+    if errors:
+        raise ValidationError(errors)
+
+    filters  = validated['filters']
+    per_page = validated['per_page']
+
+    if validated['cursor'] is not None:
+        rows, next_cursor = AuditService.list_by_cursor(filters, validated['cursor'], per_page)
+        return jsonify({
+            'logs': AuditLogResponseSchema.serialize_many(rows),
+            'next_cursor': next_cursor,
+            'per_page': per_page,
         })
 
+    paginated = AuditService.list_paginated(filters, validated['page'], per_page)
     return jsonify({
-        'logs': logs,
+        'logs': AuditLogResponseSchema.serialize_many(paginated.items),
         'total': paginated.total,
         'pages': paginated.pages,
         'current_page': paginated.page,
-    })
\ No newline at end of file
+        'per_page': per_page,
+    })
+
+
+@auth_bp.route('/api/auth/audit/archive', methods=['GET'])
+@require_auth
+def search_archived_audit_logs():
+    """Consultar la bitácora archivada (lectura lenta desde los archivos comprimidos).
+
+    Sin ?month= retorna los meses disponibles. Con ?month=YYYY-MM acepta los
+    mismos filtros que /api/auth/audit y retorna hasta per_page entradas.
+    """
+    archive_dir = current_app.config['AUDIT_ARCHIVE_DIR']
+    month = request.args.get('month')
+
+    if not month:
+        return jsonify({'months': AuditArchiveService.list_archived_months(archive_dir)})
+
+    validated, errors = AuditLogQuerySchema.validate(request.args)
+    if errors:
+        raise ValidationError(errors)
+
+    logs = AuditArchiveService.search_archive(archive_dir, month, validated['filters'], validated['per_page'])
+    return jsonify({'month': month, 'logs': logs})
+
+
+# ---------------------------------------------------------------------------
+# Diagnostico (solo admins)
+# ---------------------------------------------------------------------------
+
+@auth_bp.route('/api/auth/slow-queries', methods=['GET'])
+@require_auth
+def list_slow_queries():
+    """Consultas lentas recientes de este worker (SLOW_QUERY_ENABLED), mas recientes primero.
+
+    ?limit= limita la cantidad. Con SLOW_QUERY_EXPLAIN_SAMPLE > 0 algunas traen el plan (EXPLAIN ANALYZE).
+    """
+    limit = request.args.get('limit', type=int)
+    return jsonify({
+        'enabled':        slow_query_log.enabled,
+        'threshold_ms':   slow_query_log.threshold * 1000,
+        'explain_sample': slow_query_log.explain_sample,
+        'queries':        slow_query_log.snapshot(limit),
+    })
@@ -3,6 +3,7 @@ from ..services.category_service import CategoryService
 from ..schemas.category import CategoryCreateSchema, CategoryUpdateSchema, CategoryResponseSchema
 from ..utils.auth import require_auth
 from ..utils.audit import log_audit
+from ..utils.diff import diff_fields
 from ..utils.errors import ValidationError
 
 category_bp = Blueprint('categories', __name__)
@@ -63,7 +64,7 @@ def update_category(category_id):
         action='UPDATE',
         entity='category',
         entity_id=category_id,
-        details={'old_name': old_name, 'new_name': category.name}
+        details={'changes': diff_fields({'name': old_name}, {'name': category.name})}
     )
 
     return jsonify(CategoryResponseSchema.serialize(category))
@@ -1,9 +1,16 @@
 from flask import Blueprint, request, jsonify
 import json
 from ..services.product_service import ProductService
-from ..schemas.product import ProductCreateSchema, ProductUpdateSchema, ProductResponseSchema
+from ..schemas.product import (
+    ProductCreateSchema,
+    ProductUpdateSchema,
+    ProductResponseSchema,
+    ProductImageSchema,
+    ProductImageOrderSchema,
+)
 from ..utils.auth import require_auth
 from ..utils.audit import log_audit
+from ..utils.diff import diff_fields
 from ..utils.errors import ValidationError, AppError
 
 product_bp = Blueprint('products', __name__)
@@ -120,6 +127,7 @@ def admin_list_products():
         tag_ids=tag_ids,
         provider_ids=provider_ids,
         search=search if search else None,
+        include_providers=True,
     )
 
     return jsonify({
@@ -190,7 +198,7 @@ def update_product(product_id):
     # El frontend usa DELETE endpoints especificos para eliminar imagenes individuales
     keep_existing = True  # FIX: Siempre mantener imagenes existentes
 
-    product = ProductService.update(
+    product, old_data = ProductService.update(
         product_id, 
         validated, 
         image_files if image_files else None,
@@ -202,7 +210,11 @@ def update_product(product_id):
         action='UPDATE',
         entity='product',
         entity_id=product_id,
-        details={'name': product.name, 'new_images_count': len(image_files) if image_files else 0}
+        details={
+            'name': product.name,
+            'changes': diff_fields(old_data, ProductService.audit_snapshot(product), text_fields=('description',)),
+            'new_images_count': len(image_files) if image_files else 0,
+        }
     )
 
     return jsonify(ProductResponseSchema.serialize(product, include_admin_fields=True))
@@ -259,4 +271,28 @@ def set_primary_image(product_id, image_id):
         details={'image_id': image_id}
     )
     
-    return jsonify({'message': 'Imagen marcada como principal'})
\ No newline at end of file
+    return jsonify({'message': 'Imagen marcada como principal'})
+
+
+@product_bp.route('/api/admin/products/<int:product_id>/images/order', methods=['PUT'])
+@require_auth
+def reorder_product_images(product_id):
+    """Reordenar las imágenes del producto: {"image_ids": [3, 1, 2]}"""
+    validated, errors = ProductImageOrderSchema.validate(request.get_json())
+    if errors:
+        raise ValidationError(errors)
+
+    product = ProductService.reorder_images(product_id, validated)
+
+    log_audit(
+        admin_id=request.current_admin.id,
+        action='REORDER_IMAGES',
+        entity='product',
+        entity_id=product_id,
+        details={'image_ids': validated['image_ids']}
+    )
+
+    return jsonify({
+        'message': 'Imágenes reordenadas',
+        'images': ProductImageSchema.serialize_many(product.images),
+    })
@@ -3,6 +3,7 @@ from ..services.provider_service import ProviderService
 from ..schemas.provider import ProviderCreateSchema, ProviderUpdateSchema, ProviderResponseSchema
 from ..utils.auth import require_auth
 from ..utils.audit import log_audit
+from ..utils.diff import diff_fields
 from ..utils.errors import ValidationError
 
 provider_bp = Blueprint('providers', __name__)
@@ -53,7 +54,16 @@ def update_provider(provider_id):
         action='UPDATE',
         entity='provider',
         entity_id=provider_id,
-        details={'old': old_data, 'new': ProviderResponseSchema.serialize(provider)}
+        details={'changes': diff_fields(
+            old_data,
+            {
+                'name':        provider.name,
+                'contact':     provider.contact,
+                'phone':       provider.phone,
+                'description': provider.description,
+            },
+            text_fields=('description',),
+        )}
     )
 
     return jsonify(ProviderResponseSchema.serialize(provider))
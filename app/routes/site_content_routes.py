@@ -3,6 +3,7 @@ from ..services.site_content_service import SiteContentService
 from ..schemas.site_content import SiteContentUpdateSchema, SiteContentResponseSchema
 from ..utils.auth import require_auth
 from ..utils.audit import log_audit
+from ..utils.diff import diff_fields
 from ..utils.errors import ValidationError
 
 site_content_bp = Blueprint('site_content', __name__)
@@ -37,7 +38,22 @@ def update_site_content(key):
         action='UPDATE',
         entity='site_content',
         entity_id=content.id,
-        details={'key': key, 'old': old_data, 'new': SiteContentResponseSchema.serialize(content)}
+        details={
+            'key': key,
+            'changes': diff_fields(
+                old_data,
+                {'title': content.title, 'content': content.content},
+                text_fields=('content',),
+            ),
+        }
     )
 
-    return jsonify(SiteContentResponseSchema.serialize(content))
\ No newline at end of file
+    return jsonify(SiteContentResponseSchema.serialize(content))
+
+
+@site_content_bp.route('/api/admin/site-content/<key>/versions/<int:audit_id>', methods=['GET'])
+@require_auth
+def get_site_content_version(key, audit_id):
+    """Retorna el contenido tal como quedo despues de la edicion registrada en audit_id."""
+    version = SiteContentService.get_version(key, audit_id)
+    return jsonify({'key': key, 'audit_id': audit_id, **version})
\ No newline at end of file
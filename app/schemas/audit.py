@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+
+MAX_PER_PAGE = 100
+
+
+def _parse_int(args, name, errors):
+    value = args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        errors[name] = f'{name} debe ser un número entero'
+        return None
+
+
+def _parse_datetime(args, name, errors, end_of_day=False):
+    """Acepta fecha (2025-01-31) o fecha y hora ISO. Con end_of_day una fecha
+    sola se interpreta como el inicio del dia siguiente (limite exclusivo)."""
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        errors[name] = f'{name} debe ser una fecha ISO (YYYY-MM-DD o YYYY-MM-DDTHH:MM:SS)'
+        return None
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+
+class AuditLogQuerySchema:
+    """Valida los filtros y la paginacion de la bitacora (query string)."""
+
+    @staticmethod
+    def validate(args):
+        """
+        Retorna (datos_limpios, errores).
+
+        Filtros: admin_id, action, entity, entity_id, date_from, date_to.
+        Paginacion: cursor (keyset) o page (offset); per_page con tope MAX_PER_PAGE.
+        """
+        errors = {}
+
+        # El default solo aplica si no vino el parametro: per_page=0 es un error
+        per_page = _parse_int(args, 'per_page', errors)
+        page     = _parse_int(args, 'page', errors)
+        per_page = 50 if per_page is None else per_page
+        page     = 1 if page is None else page
+        if per_page < 1:
+            errors['per_page'] = 'per_page debe ser mayor que 0'
+        if page < 1:
+            errors['page'] = 'page debe ser mayor que 0'
+
+        filters = {
+            'admin_id':  _parse_int(args, 'admin_id', errors),
+            'action':    (args.get('action') or '').strip() or None,
+            'entity':    (args.get('entity') or '').strip() or None,
+            'entity_id': _parse_int(args, 'entity_id', errors),
+            'date_from': _parse_datetime(args, 'date_from', errors),
+            'date_to':   _parse_datetime(args, 'date_to', errors, end_of_day=True),
+        }
+
+        if errors:
+            return None, errors
+
+        return {
+            'filters':  filters,
+            'per_page': min(per_page, MAX_PER_PAGE),
+            'page':     page,
+            # None = paginacion por offset; '' = primera pagina por cursor
+            'cursor':   args.get('cursor'),
+        }, None
+
+
+class AuditLogResponseSchema:
+    """Serializa una fila (AuditLog, admin_email) de la bitacora."""
+
+    @staticmethod
+    def serialize(log, admin_email):
+        return {
+            'id':          log.id,
+            'admin_id':    log.admin_id,
+            'admin_email': admin_email,
+            'action':      log.action,
+            'entity':      log.entity,
+            'entity_id':   log.entity_id,
+            'details':     log.details,
+            'ip_address':  log.ip_address,
+            'created_at':  log.created_at.isoformat() if log.created_at else None,
+        }
+
+    @staticmethod
+    def serialize_many(rows):
+        return [AuditLogResponseSchema.serialize(log, admin_email) for log, admin_email in rows]
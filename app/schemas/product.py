@@ -5,6 +5,13 @@ Schemas para Product con soporte de múltiples imágenes
 from ..utils.file import get_image_url
 
 
+def _build_srcset(variants):
+    """Arma el atributo srcset ("url 320w, url 640w, ...") desde {ancho: url}."""
+    if not variants:
+        return None
+    return ', '.join(f'{variants[w]} {w}w' for w in sorted(variants, key=int))
+
+
 class ProductImageSchema:
     """Schema para serializar ProductImage"""
     
@@ -19,6 +26,10 @@ class ProductImageSchema:
             'image_url': get_image_url(product_image.image_path),
             'is_primary': product_image.is_primary,
             'display_order': product_image.display_order,
+
+            # Variantes responsivas listas para <img srcset> y placeholder LQIP
+            'srcset': _build_srcset(product_image.variants),
+            'placeholder': product_image.placeholder,
         }
     
     @staticmethod
@@ -56,6 +67,10 @@ class ProductResponseSchema:
             # Compatibilidad: imagen principal
             'image_url': product.image_url,
         }
+
+        primary = product.primary_image
+        data['image_srcset']      = _build_srcset(primary.variants) if primary else None
+        data['image_placeholder'] = primary.placeholder if primary else None
         
         # Campos solo para admin
         if include_admin_fields:
@@ -151,4 +166,31 @@ class ProductUpdateSchema:
         if errors:
             return None, errors
         
-        return data, None
\ No newline at end of file
+        return data, None
+
+
+class ProductImageOrderSchema:
+    """Schema para reordenar las imágenes de un producto"""
+
+    @staticmethod
+    def validate(data):
+        """
+        Validar el nuevo orden de imágenes: {"image_ids": [3, 1, 2]}
+
+        Returns:
+            (validated_data, errors)
+        """
+        if not data or not isinstance(data, dict):
+            return None, {'general': 'Se requiere un objeto JSON'}
+
+        image_ids = data.get('image_ids')
+        if not isinstance(image_ids, list) or not image_ids:
+            return None, {'image_ids': 'image_ids debe ser un array no vacío'}
+
+        if not all(isinstance(i, int) and not isinstance(i, bool) for i in image_ids):
+            return None, {'image_ids': 'image_ids debe contener solo números enteros'}
+
+        if len(set(image_ids)) != len(image_ids):
+            return None, {'image_ids': 'image_ids no puede tener elementos repetidos'}
+
+        return {'image_ids': image_ids}, None
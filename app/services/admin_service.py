@@ -1,11 +1,38 @@
 from ..repositories.admin_repository import AdminRepository
 from ..utils.errors import AppError
+from ..utils.admin_cache import admin_cache
+from ..utils.passwords import password_hasher
 
 
 class AdminService:
     """Logica de negocio para administradores. No conoce Flask ni HTTP.
     Solo llama al repository y lanza AppError si algo no cumple."""
 
+    @staticmethod
+    def authenticate(email, password):
+        """Verificar credenciales. Retorna el admin o None.
+
+        Si el hash guardado usa un esquema distinto al configurado
+        (PASSWORD_HASH_METHOD), se recalcula con la contraseña recien verificada.
+        Si el pool de hashing esta saturado el login igual procede.
+        """
+        admin = AdminRepository.get_by_email(email)
+        if not admin or not admin.is_active:
+            return None
+
+        if not password_hasher.verify(admin.password_hash, password):
+            return None
+
+        if password_hasher.needs_rehash(admin.password_hash):
+            # Mejor esfuerzo: con el pool lleno (503) se conserva el hash viejo
+            # y se reintenta en el proximo login; la contraseña ya es valida
+            try:
+                AdminRepository.set_password_hash(admin, password_hasher.hash(password))
+            except AppError as e:
+                print(f"Rehash de contraseña pospuesto (admin {admin.id}): {e.message}")
+
+        return admin
+
     @staticmethod
     def list_all():
         """Listar todos los administradores."""
@@ -59,6 +86,7 @@ class AdminService:
                 raise AppError('El email ya esta en uso', 409)
 
         updated = AdminRepository.update(admin, email=new_email, name=new_name)
+        admin_cache.invalidate(admin_id)
         return updated, old_data
 
     @staticmethod
@@ -76,7 +104,9 @@ class AdminService:
             raise AppError('No tienes permisos para cambiar la contraseña del administrador principal', 403)
 
         new_password = validated_data['password']
-        return AdminRepository.update_password(admin, new_password)
+        updated = AdminRepository.update_password(admin, new_password)
+        admin_cache.invalidate(admin_id)
+        return updated
 
     @staticmethod
     def toggle_status(admin_id, current_admin_id):
@@ -100,6 +130,7 @@ class AdminService:
 
         old_status = admin.is_active
         updated = AdminRepository.toggle_active(admin)
+        admin_cache.invalidate(admin_id)
         
         action = 'ACTIVATE_ADMIN' if updated.is_active else 'DEACTIVATE_ADMIN'
         return updated, action, old_status
@@ -128,5 +159,6 @@ class AdminService:
         name = admin.name
         
         AdminRepository.delete(admin)
+        admin_cache.invalidate(admin_id)
         
         return email, name
\ No newline at end of file
@@ -0,0 +1,149 @@
+import glob
+import gzip
+import json
+import os
+from collections import deque
+from datetime import date, datetime
+from ..database import db
+from ..repositories.audit_partition_repository import AuditPartitionRepository, add_months
+from ..utils.errors import AppError
+
+
+ARCHIVE_PATTERN = 'audit_logs_{month}.ndjson.gz'
+
+
+def _archive_path(archive_dir, month_start):
+    return os.path.join(archive_dir, ARCHIVE_PATTERN.format(month=f'{month_start:%Y-%m}'))
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'No serializable: {type(value).__name__}')
+
+
+def _matches(entry, filters):
+    """Aplica los mismos filtros que AuditRepository sobre una fila archivada."""
+    if filters.get('admin_id') is not None and entry['admin_id'] != filters['admin_id']:
+        return False
+    if filters.get('action') and entry['action'] != filters['action']:
+        return False
+    if filters.get('entity') and entry['entity'] != filters['entity']:
+        return False
+    if filters.get('entity_id') is not None and entry['entity_id'] != filters['entity_id']:
+        return False
+    created_at = datetime.fromisoformat(entry['created_at'])
+    if filters.get('date_from') and created_at < filters['date_from']:
+        return False
+    if filters.get('date_to') and created_at >= filters['date_to']:
+        return False
+    return True
+
+
+class AuditArchiveService:
+    """
+    Retencion de la bitacora: las particiones mensuales mas viejas que
+    retention_months se exportan a NDJSON comprimido (gzip), se verifican
+    por cantidad de filas y recien entonces se eliminan de la base.
+    Los meses archivados se pueden seguir consultando (lectura lenta del archivo).
+    """
+
+    @staticmethod
+    def maintain_partitions(months_ahead):
+        """Crea por adelantado las particiones del mes actual y los siguientes."""
+        current_month = date.today().replace(day=1)
+        with db.engine.begin() as conn:
+            if not AuditPartitionRepository.is_partitioned(conn):
+                raise AppError('audit_logs no esta particionada. Ejecutar python migrate.py upgrade', 409)
+            AuditPartitionRepository.ensure_partitions(conn, current_month, add_months(current_month, months_ahead))
+
+    @staticmethod
+    def expired_partitions(retention_months):
+        """Particiones cuyo mes completo quedo fuera del periodo de retencion."""
+        cutoff = add_months(date.today().replace(day=1), -retention_months)
+        with db.engine.connect() as conn:
+            return [(name, month) for name, month in AuditPartitionRepository.list_partitions(conn) if month < cutoff]
+
+    @staticmethod
+    def archive_partition(name, month_start, archive_dir, dry_run=False):
+        """
+        Exporta una particion a archive_dir y, si la verificacion pasa, la elimina.
+        Retorna la cantidad de filas archivadas.
+        """
+        os.makedirs(archive_dir, exist_ok=True)
+        path = _archive_path(archive_dir, month_start)
+        tmp_path = f'{path}.tmp'
+
+        with db.engine.connect() as conn:
+            expected = AuditPartitionRepository.count_rows(conn, name)
+
+        if expected == 0:
+            # Nada que exportar: una particion vacia se elimina sin generar archivo
+            if not dry_run:
+                AuditArchiveService._drop_if_unchanged(name, expected)
+            return 0
+
+        with db.engine.connect() as conn:
+            written = 0
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                for row in AuditPartitionRepository.stream_rows(conn, name):
+                    f.write(json.dumps(dict(row), default=_json_default, ensure_ascii=False))
+                    f.write('\n')
+                    written += 1
+
+        # Verificacion: lo escrito y lo que se puede leer del archivo deben coincidir con la base
+        with gzip.open(tmp_path, 'rt', encoding='utf-8') as f:
+            readable = sum(1 for _ in f)
+        if not (expected == written == readable):
+            os.remove(tmp_path)
+            raise AppError(
+                f'Verificacion fallida para {name}: base={expected}, escritas={written}, legibles={readable}', 500
+            )
+
+        if dry_run:
+            os.remove(tmp_path)
+            return written
+
+        os.replace(tmp_path, path)
+        AuditArchiveService._drop_if_unchanged(name, expected)
+        return written
+
+    @staticmethod
+    def _drop_if_unchanged(name, expected):
+        with db.engine.begin() as conn:
+            # Si llegaron filas nuevas durante la exportacion no se borra nada
+            if AuditPartitionRepository.count_rows(conn, name) != expected:
+                raise AppError(f'La particion {name} cambio durante el archivado; reintentar', 409)
+            AuditPartitionRepository.drop_partition(conn, name)
+
+    @staticmethod
+    def list_archived_months(archive_dir):
+        """Meses archivados disponibles, ej: ['2024-01', '2024-02']."""
+        prefix, suffix = ARCHIVE_PATTERN.split('{month}')
+        paths = sorted(glob.glob(os.path.join(archive_dir, ARCHIVE_PATTERN.format(month='*'))))
+        return [os.path.basename(p)[len(prefix):-len(suffix)] for p in paths]
+
+    @staticmethod
+    def search_archive(archive_dir, month, filters, limit):
+        """
+        Lectura lenta: recorre el archivo del mes en streaming y retorna
+        hasta limit entradas que cumplan los filtros (mas recientes primero).
+        """
+        try:
+            month_start = datetime.strptime(month, '%Y-%m').date()
+        except ValueError:
+            raise AppError('month debe tener el formato YYYY-MM', 400)
+
+        path = _archive_path(archive_dir, month_start)
+        if not os.path.exists(path):
+            raise AppError('No hay bitacora archivada para ese mes', 404)
+
+        # El archivo esta en orden cronologico: se conservan solo las ultimas limit
+        matches = deque(maxlen=limit)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if _matches(entry, filters):
+                    matches.append(entry)
+
+        return list(reversed(matches))
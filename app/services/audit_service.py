@@ -0,0 +1,40 @@
+import base64
+import binascii
+from datetime import datetime
+from ..repositories.audit_repository import AuditRepository
+from ..utils.errors import AppError
+
+
+def encode_cursor(log):
+    """Cursor opaco con la posicion (created_at, id) de la ultima fila entregada."""
+    raw = f'{log.created_at.isoformat()}|{log.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(log_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise AppError('Cursor invalido', 400)
+
+
+class AuditService:
+    """Logica de lectura de la bitacora. No conoce Flask ni HTTP."""
+
+    @staticmethod
+    def list_paginated(filters, page, per_page):
+        return AuditRepository.get_paginated(filters, page, per_page)
+
+    @staticmethod
+    def list_by_cursor(filters, cursor, per_page):
+        """Retorna (filas, next_cursor). next_cursor es None en la ultima pagina."""
+        after = decode_cursor(cursor) if cursor else None
+
+        # Se pide una fila de mas para saber si hay otra pagina sin hacer COUNT
+        rows = AuditRepository.get_after(filters, after, per_page + 1)
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+
+        next_cursor = encode_cursor(rows[-1][0]) if has_more else None
+        return rows, next_cursor
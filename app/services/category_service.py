@@ -1,5 +1,6 @@
 from ..repositories.category_repository import CategoryRepository
 from ..utils.errors import AppError
+from ..utils.db_routing import read_replica
 
 
 class CategoryService:
@@ -7,6 +8,7 @@ class CategoryService:
     Solo llama al repository y lanza AppError si algo no cumple."""
 
     @staticmethod
+    @read_replica
     def list_all():
         return CategoryRepository.get_all()
 
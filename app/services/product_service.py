@@ -5,54 +5,54 @@ from ..repositories.provider_repository import ProviderRepository
 from ..models.product_image import ProductImage
 from ..database import db
 from ..utils.errors import AppError
-from ..utils.file import save_image, delete_image
+from ..utils.file import upload_image, delete_image
+from ..utils.db_routing import read_replica
 
 
 class ProductService:
 
     @staticmethod
-    def list_paginated(page, per_page, category_ids=None, tag_ids=None, provider_ids=None, search=None):
-        return ProductRepository.get_paginated(page, per_page, category_ids, tag_ids, provider_ids, search)
+    @read_replica
+    def list_paginated(page, per_page, category_ids=None, tag_ids=None, provider_ids=None, search=None,
+                       include_providers=False):
+        return ProductRepository.get_paginated(
+            page, per_page, category_ids, tag_ids, provider_ids, search, include_providers=include_providers
+        )
 
     @staticmethod
+    @read_replica
     def get_by_id(product_id):
         product = ProductRepository.get_by_id(product_id)
         if not product:
             raise AppError('Producto no encontrado', 404)
         return product
 
+    @staticmethod
+    def _resolve(repository, ids, not_found_message):
+        """
+        Carga las instancias de ids con una sola consulta (no una por id) y las
+        retorna en el orden pedido. Si alguna no existe lanza 404 con su id.
+        """
+        found = {item.id: item for item in repository.get_by_ids(ids)}
+        for item_id in ids:
+            if item_id not in found:
+                raise AppError(not_found_message.format(id=item_id), 404)
+        return [found[item_id] for item_id in ids]
+
     @staticmethod
     def _resolve_categories(category_ids):
         """Valida que todas las categorias existan y retorna las instancias."""
-        result = []
-        for cid in category_ids:
-            cat = CategoryRepository.get_by_id(cid)
-            if not cat:
-                raise AppError(f'Categoria con id {cid} no encontrada', 404)
-            result.append(cat)
-        return result
+        return ProductService._resolve(CategoryRepository, category_ids, 'Categoria con id {id} no encontrada')
 
     @staticmethod
     def _resolve_tags(tag_ids):
         """Valida que todas las etiquetas existan y retorna las instancias."""
-        result = []
-        for tid in tag_ids:
-            tag = TagRepository.get_by_id(tid)
-            if not tag:
-                raise AppError(f'Etiqueta con id {tid} no encontrada', 404)
-            result.append(tag)
-        return result
+        return ProductService._resolve(TagRepository, tag_ids, 'Etiqueta con id {id} no encontrada')
 
     @staticmethod
     def _resolve_providers(provider_ids):
         """Valida que todos los proveedores existan y retorna las instancias."""
-        result = []
-        for pid in provider_ids:
-            prov = ProviderRepository.get_by_id(pid)
-            if not prov:
-                raise AppError(f'Proveedor con id {pid} no encontrado', 404)
-            result.append(prov)
-        return result
+        return ProductService._resolve(ProviderRepository, provider_ids, 'Proveedor con id {id} no encontrado')
 
     @staticmethod
     def _save_product_images(product, image_files):
@@ -60,8 +60,8 @@ class ProductService:
         Guardar múltiples imágenes para un producto.
         
         LÓGICA:
-        - Si el producto YA tiene imágenes: las nuevas se agregan sin marcar ninguna como principal
-        - Si el producto NO tiene imágenes: la primera se marca como principal
+        - Si el producto YA tiene imagen principal: las nuevas se agregan sin marcar ninguna como principal
+        - Si el producto NO tiene imagen principal: la primera se marca como principal
         - El admin usa el endpoint set_primary_image para cambiar la principal manualmente
         
         Args:
@@ -74,38 +74,39 @@ class ProductService:
         if not image_files:
             return []
         
-        # Verificar si el producto YA tiene imágenes
-        is_new_product = len(product.images) == 0
+        # Verificar si el producto YA tiene imagen principal
+        needs_primary = product.primary_image_id is None
+        existing_count = len(product.images)
         
         saved_images = []
         
-        for i, image_file in enumerate(image_files):
-            # Guardar archivo físico
-            image_path = save_image(image_file)
-            if not image_path:
+        for image_file in image_files:
+            # Procesar y subir a Cloudinary (incluye variantes y placeholder)
+            uploaded = upload_image(image_file)
+            if not uploaded:
                 continue  # Saltar si el tipo no es válido
             
-            # Crear ProductImage
-            # Solo marcar como principal si es producto NUEVO y es la primera imagen
-            should_be_primary = is_new_product and i == 0
+            # Solo marcar como principal la primera imagen válida si no hay principal
+            should_be_primary = needs_primary and not saved_images
             
             product_image = ProductImage(
                 product_id=product.id,
-                image_path=image_path,
+                image_path=uploaded['url'],
+                variants=uploaded['variants'],
+                placeholder=uploaded['placeholder'],
                 is_primary=should_be_primary,
-                display_order=len(product.images) + len(saved_images)  # Continuar desde las existentes
+                display_order=existing_count + len(saved_images)  # Continuar desde las existentes
             )
             db.session.add(product_image)
             saved_images.append(product_image)
+
+            if should_be_primary:
+                product.primary_image = product_image
+                # Actualizar product.image_path con la imagen principal (compatibilidad)
+                product.image_path = product_image.image_path
         
         if saved_images:
             db.session.flush()  # Para obtener IDs
-            
-            # Actualizar product.image_path con la imagen principal (compatibilidad)
-            all_images = list(product.images) + saved_images
-            primary_img = next((img for img in all_images if img.is_primary), all_images[0] if all_images else None)
-            if primary_img:
-                product.image_path = primary_img.image_path
         
         return saved_images
 
@@ -133,6 +134,18 @@ class ProductService:
         
         return product
 
+    @staticmethod
+    def audit_snapshot(product):
+        """Campos editables del producto, para calcular el diff de la bitacora."""
+        return {
+            'name':         product.name,
+            'description':  product.description,
+            'price':        float(product.price) if product.price is not None else None,
+            'category_ids': sorted(c.id for c in product.categories),
+            'tag_ids':      sorted(t.id for t in product.tags),
+            'provider_ids': sorted(p.id for p in product.providers),
+        }
+
     @staticmethod
     def update(product_id, validated_data, image_files=None, keep_existing_images=True):
         """
@@ -143,11 +156,16 @@ class ProductService:
             validated_data: Datos validados
             image_files: Nueva lista de archivos de imagen (opcional)
             keep_existing_images: Si False, elimina imágenes existentes
+        
+        Returns:
+            (producto_actualizado, snapshot_anterior) para que la ruta pueda loguear la bitacora
         """
         product = ProductRepository.get_by_id(product_id)
         if not product:
             raise AppError('Producto no encontrado', 404)
 
+        old_data = ProductService.audit_snapshot(product)
+
         # Resolver relaciones solo si se incluyen en la actualización
         categories = None
         tags       = None
@@ -168,6 +186,7 @@ class ProductService:
             if not keep_existing_images:
                 # Eliminar imágenes existentes
                 old_images = list(product.images)  # Copiar lista
+                product.primary_image = None  # La primera imagen nueva pasa a ser la principal
                 for img in old_images:
                     delete_image(img.image_path)
                     db.session.delete(img)
@@ -177,7 +196,7 @@ class ProductService:
             ProductService._save_product_images(product, image_files)
             db.session.commit()
 
-        return updated
+        return updated, old_data
 
     @staticmethod
     def delete_product_image(product_id, image_id):
@@ -202,12 +221,12 @@ class ProductService:
             raise AppError('No se puede eliminar la única imagen del producto', 400)
         
         # Si es la imagen principal, marcar otra como principal
-        if image.is_primary and len(product.images) > 1:
+        if product.primary_image_id == image.id:
             # Marcar la primera imagen restante como principal
             next_primary = next((img for img in product.images if img.id != image_id), None)
-            if next_primary:
-                next_primary.is_primary = True
-                product.image_path = next_primary.image_path  # Actualizar cache
+            next_primary.is_primary = True
+            product.primary_image = next_primary
+            product.image_path = next_primary.image_path  # Actualizar cache
         
         # Eliminar archivo físico
         delete_image(image.image_path)
@@ -231,24 +250,39 @@ class ProductService:
         if not product:
             raise AppError('Producto no encontrado', 404)
         
-        # Buscar la imagen
-        new_primary = next((img for img in product.images if img.id == image_id), None)
+        # Buscar la imagen (solo si pertenece al producto)
+        new_primary = ProductRepository.get_image(product_id, image_id)
         if not new_primary:
             raise AppError('Imagen no encontrada', 404)
         
-        # Desmarcar todas las imágenes como principales
-        for img in product.images:
-            img.is_primary = False
+        # Mover el puntero y sincronizar flags con UPDATEs por conjunto
+        ProductRepository.set_primary_image(product, new_primary)
+        
+        return True
+
+    @staticmethod
+    def reorder_images(product_id, validated_data):
+        """
+        Reordenar las imágenes de un producto.
+        
+        Args:
+            product_id: ID del producto
+            validated_data: {'image_ids': [...]} con TODAS las imágenes del producto en el nuevo orden
+        """
+        product = ProductRepository.get_by_id(product_id)
+        if not product:
+            raise AppError('Producto no encontrado', 404)
         
-        # Marcar la nueva como principal
-        new_primary.is_primary = True
+        image_ids = validated_data['image_ids']
+        current_ids = ProductRepository.get_image_ids(product_id)
         
-        # Actualizar cache en product
-        product.image_path = new_primary.image_path
+        # El orden debe incluir exactamente las imágenes del producto
+        if set(image_ids) != set(current_ids):
+            raise AppError('image_ids debe contener exactamente las imágenes del producto', 400)
         
-        db.session.commit()
+        ProductRepository.reorder_images(product, image_ids)
         
-        return True
+        return product
 
     @staticmethod
     def delete(product_id):
@@ -1,4 +1,6 @@
 from ..repositories.site_content_repository import SiteContentRepository
+from ..repositories.audit_repository import AuditRepository
+from ..utils.diff import check_changes, revert_changes
 from ..utils.errors import AppError
 
 
@@ -24,4 +26,44 @@ class SiteContentService:
             'content': content.content,
         }
         updated = SiteContentRepository.update(content, validated_data, admin_id)
-        return updated, old_data
\ No newline at end of file
+        return updated, old_data
+
+    @staticmethod
+    def get_version(key, audit_id):
+        """
+        Reconstruye el contenido tal como quedo despues de la entrada de
+        bitacora audit_id: parte del contenido actual y revierte, de la mas
+        reciente a la mas vieja, cada edicion posterior.
+        """
+        content = SiteContentRepository.get_by_key(key)
+        if not content:
+            raise AppError('Contenido no encontrado', 404)
+
+        target = AuditRepository.get_by_id(audit_id)
+        if not target or target.entity != 'site_content' or target.entity_id != content.id:
+            raise AppError('Version no encontrada', 404)
+
+        snapshot = {'title': content.title, 'content': content.content}
+        for entry in AuditRepository.get_updates_after('site_content', content.id, target):
+            details = entry.details or {}
+            if 'changes' in details:
+                snapshot = revert_changes(snapshot, details['changes'])
+            elif 'old' in details:
+                # Entradas anteriores al formato diff guardaban la copia completa
+                SiteContentService._check_legacy(snapshot, details)
+                snapshot = {'title': details['old'].get('title'), 'content': details['old'].get('content')}
+
+        # El resultado tiene que ser lo que dejo la propia entrada: si no, falta
+        # alguna edicion entre ella y la siguiente
+        details = target.details or {}
+        if 'changes' in details:
+            check_changes(snapshot, details['changes'])
+        elif 'old' in details:
+            SiteContentService._check_legacy(snapshot, details)
+        return snapshot
+
+    @staticmethod
+    def _check_legacy(snapshot, details):
+        new = details.get('new') or {}
+        if any(field in new and new[field] != value for field, value in snapshot.items()):
+            raise AppError('El historial de este contenido esta incompleto', 409)
@@ -1,9 +1,11 @@
 from ..repositories.tag_repository import TagRepository
 from ..utils.errors import AppError
+from ..utils.db_routing import read_replica
 
 
 class TagService:
     @staticmethod
+    @read_replica
     def list_all():
         return TagRepository.get_all()
 
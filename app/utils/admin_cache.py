@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import namedtuple
+from ..database import db
+from ..models import Admin
+from ..repositories.cache_version_repository import CacheVersionRepository
+from .metrics import record_cache
+
+
+VERSION_KEY = 'admins'
+
+# Lo unico que las rutas usan de request.current_admin. No es un objeto de
+# la sesion, asi que se puede compartir entre requests sin problema.
+CachedAdmin = namedtuple('CachedAdmin', ['id', 'email', 'name', 'is_active'])
+
+
+class AdminCache:
+    """
+    Cache por worker de los admins autenticados, para que require_auth no
+    consulte la base en cada request del panel.
+
+    - Cada entrada vive ADMIN_CACHE_TTL segundos.
+    - AdminService llama a invalidate() al modificar, desactivar o eliminar
+      un admin: borra la entrada local e incrementa la version en la base.
+    - Los demas workers revisan la version cada ADMIN_CACHE_VERSION_CHECK
+      segundos y, si cambio, vacian su cache. Un admin desactivado queda
+      afuera en todos los workers en a lo sumo ese intervalo.
+    """
+
+    def __init__(self):
+        self.ttl = 0
+        self.version_check = 0
+        self._entries = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config['ADMIN_CACHE_TTL']
+        self.version_check = app.config['ADMIN_CACHE_VERSION_CHECK']
+        self.clear()
+
+    def get(self, admin_id):
+        """Retorna el CachedAdmin (o None si no existe)."""
+        if self.ttl <= 0:
+            record_cache('admin', hit=False)
+            return self._load(admin_id)
+
+        self._check_version()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(admin_id)
+        if entry and entry[1] > now:
+            record_cache('admin', hit=True)
+            return entry[0]
+
+        record_cache('admin', hit=False)
+
+        admin = self._load(admin_id)
+        if admin:
+            with self._lock:
+                self._entries[admin_id] = (admin, now + self.ttl)
+        return admin
+
+    def invalidate(self, admin_id):
+        """Descarta el admin en este worker y avisa al resto via la version."""
+        with self._lock:
+            self._entries.pop(admin_id, None)
+        if self.ttl > 0:
+            CacheVersionRepository.bump(VERSION_KEY)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+            self._checked_at = 0.0
+
+    def _check_version(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.version_check:
+            return
+        version = CacheVersionRepository.get(VERSION_KEY)
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._checked_at = now
+
+    @staticmethod
+    def _load(admin_id):
+        admin = db.session.get(Admin, admin_id)
+        if not admin:
+            return None
+        return CachedAdmin(admin.id, admin.email, admin.name, admin.is_active)
+
+
+admin_cache = AdminCache()
@@ -1,17 +1,259 @@
+import atexit
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
 from flask import request
 from ..database import db
 from ..models import AuditLog
+from .metrics import AUDIT_QUEUE_DEPTH, AUDIT_WRITE_FAILURES
+
+
+class AuditSink:
+    """
+    Destino de las entradas de bitacora.
+
+    Modo 'async' (produccion): log_audit solo encola la entrada y un hilo en
+    segundo plano la inserta junto con otras en un INSERT multi-fila, cuando
+    se juntan AUDIT_BATCH_SIZE entradas o pasan AUDIT_FLUSH_INTERVAL segundos.
+    Asi la respuesta al admin no espera un segundo commit contra la base.
+
+    Modo 'sync' (tests, scripts): add + commit en la sesion del request,
+    la entrada es visible apenas retorna log_audit.
+
+    Si el INSERT falla se reintenta AUDIT_WRITE_RETRIES veces con espera
+    exponencial. Agotados los intentos, el lote se agrega como NDJSON a
+    AUDIT_SPILL_DIR (un archivo por proceso) y se reinserta la proxima vez que
+    una escritura funcione; el archivo de un worker que ya termino lo toma el
+    siguiente que arranque o escriba. Las entradas que fallan se
+    cuentan en audit_write_failures_total.
+
+    Al terminar el proceso (atexit) se vacia la cola antes de salir.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.mode = 'sync'
+        self.batch_size = 50
+        self.flush_interval = 1.0
+        self.retries = 3
+        self.backoff = 0.5
+        self.spill_dir = None
+        self._spilled = False
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        self.mode = app.config['AUDIT_WRITE_MODE']
+        self.batch_size = app.config['AUDIT_BATCH_SIZE']
+        self.flush_interval = app.config['AUDIT_FLUSH_INTERVAL']
+        self.retries = app.config['AUDIT_WRITE_RETRIES']
+        self.backoff = app.config['AUDIT_RETRY_BACKOFF']
+        self.spill_dir = app.config['AUDIT_SPILL_DIR']
+        self._queue = queue.Queue(maxsize=app.config['AUDIT_QUEUE_MAX_SIZE'])
+        atexit.register(self.shutdown)
+
+    def submit(self, entry):
+        """Registra una entrada (dict con las columnas de AuditLog)."""
+        if self.mode != 'async':
+            db.session.add(AuditLog(**entry))
+            db.session.commit()
+            return
+
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # La base no da abasto: un intento directo (sin esperas en el request)
+            # y si falla la entrada va al archivo de respaldo
+            self._write([entry], attempts=1)
+        AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _ensure_worker(self):
+        """Arranca el hilo escritor en el primer uso. Se revisa el pid porque
+        los hilos no sobreviven al fork de los workers de gunicorn."""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='audit-sink', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        self._safe_replay()
+        while not self._stop.is_set():
+            batch = self._collect_batch()
+            if batch:
+                if self._write(batch) and self._spilled:
+                    self._safe_replay()
+                AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+
+    def _safe_replay(self):
+        # Un error inesperado al reinsertar no puede terminar el hilo escritor
+        try:
+            self._replay_spill()
+        except Exception as e:
+            print(f"Error reinsertando respaldos de bitacora: {e}")
+            self._spilled = True
+
+    def _collect_batch(self):
+        """Espera hasta juntar batch_size entradas o que venza flush_interval."""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _insert(self, entries):
+        """Inserta las entradas en una sola sentencia, en su propia conexion."""
+        with self.app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(AuditLog.__table__.insert(), entries)
+
+    def _write(self, entries, attempts=None):
+        """Inserta con reintentos; si no se puede, guarda el lote en disco.
+        Devuelve True si las entradas llegaron a la base."""
+        attempts = attempts or self.retries + 1
+        for attempt in range(attempts):
+            try:
+                self._insert(entries)
+                return True
+            except Exception as e:
+                error = e
+                if attempt + 1 < attempts:
+                    AUDIT_WRITE_FAILURES.labels('retried').inc(len(entries))
+                    time.sleep(self.backoff * 2 ** attempt)
+        print(f"Error escribiendo {len(entries)} entradas de bitacora: {error}")
+        self._spill(entries)
+        return False
+
+    def _spill(self, entries):
+        """Agrega las entradas como NDJSON al archivo de respaldo de este proceso."""
+        path = os.path.join(self.spill_dir, f'audit-spill-{os.getpid()}.ndjson')
+        try:
+            with self._spill_lock:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                with open(path, 'a', encoding='utf-8') as f:
+                    for entry in entries:
+                        f.write(json.dumps({**entry, 'created_at': entry['created_at'].isoformat()}) + '\n')
+            self._spilled = True
+            AUDIT_WRITE_FAILURES.labels('spilled').inc(len(entries))
+        except OSError as e:
+            print(f"No se pudieron respaldar {len(entries)} entradas de bitacora en {path}: {e}")
+            AUDIT_WRITE_FAILURES.labels('lost').inc(len(entries))
+
+    def _replay_spill(self):
+        """
+        Reinserta los archivos de respaldo de este proceso y los de workers que
+        ya no existen; el de un worker vivo puede estar escribiendose y no se toca.
+        Cada archivo se renombra antes de leerlo, asi dos workers no reinsertan
+        el mismo. Un archivo que no se puede leer (linea cortada, JSON invalido)
+        pasa a quarantine/ para revisarlo a mano.
+        """
+        self._spilled = False
+        for path in sorted(glob.glob(os.path.join(self.spill_dir, 'audit-spill-*.ndjson'))):
+            owner = _spill_owner(path)
+            if owner != os.getpid() and _pid_alive(owner):
+                continue
+            claimed = f'{path}.{os.getpid()}.replaying'
+            try:
+                with self._spill_lock:
+                    os.rename(path, claimed)
+                with open(claimed, encoding='utf-8') as f:
+                    entries = [json.loads(line) for line in f if line.strip()]
+                for entry in entries:
+                    entry['created_at'] = datetime.fromisoformat(entry['created_at'])
+            except OSError:
+                continue
+            except (ValueError, TypeError, KeyError) as e:
+                self._quarantine(claimed, os.path.basename(path), e)
+                continue
+            try:
+                # Una sola transaccion por archivo: o entra completo o queda para despues
+                self._insert(entries)
+                os.remove(claimed)
+            except Exception as e:
+                print(f"Error reinsertando {path}: {e}")
+                os.rename(claimed, os.path.join(self.spill_dir, f'audit-spill-{os.getpid()}-{time.time_ns()}.ndjson'))
+                self._spilled = True
+                return
+
+    def _quarantine(self, claimed, name, error):
+        target_dir = os.path.join(self.spill_dir, 'quarantine')
+        try:
+            os.makedirs(target_dir, exist_ok=True)
+            os.rename(claimed, os.path.join(target_dir, name))
+            print(f"Respaldo de bitacora ilegible, movido a {target_dir}/{name}: {error}")
+        except OSError as e:
+            print(f"No se pudo mover a cuarentena el respaldo {claimed}: {e}")
+
+    def shutdown(self, timeout=5.0):
+        """Detiene el hilo escritor y escribe lo que quede en la cola."""
+        if self._queue is None:
+            return
+        self._stop.set()
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            self._thread.join(timeout)
+        remaining = self._drain()
+        for start in range(0, len(remaining), self.batch_size):
+            self._write(remaining[start:start + self.batch_size])
+
+
+def _spill_owner(path):
+    """PID del worker que escribio el archivo (audit-spill-<pid>[-<n>].ndjson), o None."""
+    name = os.path.basename(path)[len('audit-spill-'):-len('.ndjson')]
+    owner = name.split('-', 1)[0]
+    return int(owner) if owner.isdigit() else None
+
+
+def _pid_alive(pid):
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True     # existe pero es de otro usuario
+    return True
+
+
+audit_sink = AuditSink()
 
 
 def log_audit(admin_id, action, entity=None, entity_id=None, details=None):
     """Registra una entrada en la bitacora. Se llama desde las rutas despues de cada operacion exitosa."""
-    entry = AuditLog(
-        admin_id=admin_id,
-        action=action,
-        entity=entity,
-        entity_id=entity_id,
-        details=details,
-        ip_address=request.remote_addr,
-    )
-    db.session.add(entry)
-    db.session.commit()
\ No newline at end of file
+    audit_sink.submit({
+        'admin_id':   admin_id,
+        'action':     action,
+        'entity':     entity,
+        'entity_id':  entity_id,
+        'details':    details,
+        'ip_address': request.remote_addr,
+        'created_at': datetime.utcnow(),  # Momento real de la operacion, no el del flush
+    })
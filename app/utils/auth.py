@@ -36,10 +36,15 @@ def require_auth(f):
         if not payload:
             return jsonify({'error': 'Token invalido o expirado'}), 401
 
-        from ..models import Admin
-        from ..database import db
+        from .admin_cache import admin_cache
+        from .db_routing import use_primary
+        from .timing import timed
 
-        admin = db.session.get(Admin, payload['admin_id'])
+        # Los admins leen lo que acaban de escribir: todo el request va al primario
+        use_primary()
+
+        with timed('auth'):
+            admin = admin_cache.get(payload['admin_id'])
         if not admin or not admin.is_active:
             return jsonify({'error': 'Admin no encontrado o inactivo'}), 401
 
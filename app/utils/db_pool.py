@@ -0,0 +1,103 @@
+from sqlalchemy import event
+
+
+POOLER_MODES = ('direct', 'session', 'transaction')
+
+
+def _read_int(env, name, default, minimum):
+    raw = env.get(name, default)
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} debe ser un entero (recibido: {raw!r})')
+    if value < minimum:
+        raise ValueError(f'{name} debe ser >= {minimum} (recibido: {value})')
+    return value
+
+
+def _read_bool(env, name, default):
+    raw = str(env.get(name, default)).lower()
+    if raw not in ('true', 'false', '1', '0'):
+        raise ValueError(f'{name} debe ser true o false (recibido: {raw!r})')
+    return raw in ('true', '1')
+
+
+def read_pool_settings(env):
+    """
+    Lee y valida el perfil de pool desde variables de entorno.
+    Lanza ValueError con el nombre de la variable si algo no es valido,
+    asi un valor mal escrito falla al arrancar y no bajo carga.
+    """
+    mode = env.get('DB_POOLER_MODE', 'direct')
+    if mode not in POOLER_MODES:
+        raise ValueError(f"DB_POOLER_MODE debe ser uno de {', '.join(POOLER_MODES)} (recibido: {mode!r})")
+
+    return {
+        'pool_size':            _read_int(env, 'DB_POOL_SIZE', 5, 1),
+        'max_overflow':         _read_int(env, 'DB_MAX_OVERFLOW', 5, 0),
+        'pool_timeout':         _read_int(env, 'DB_POOL_TIMEOUT', 10, 1),            # segundos esperando una conexion
+        'pool_recycle':         _read_int(env, 'DB_POOL_RECYCLE', 300, -1),          # segundos, -1 desactiva
+        'pool_pre_ping':        _read_bool(env, 'DB_POOL_PRE_PING', 'true'),
+        'connect_timeout':      _read_int(env, 'DB_CONNECT_TIMEOUT', 5, 1),          # segundos
+        'statement_timeout_ms': _read_int(env, 'DB_STATEMENT_TIMEOUT_MS', 15000, 0),  # 0 desactiva
+        'pooler_mode':          mode,
+    }
+
+
+def build_engine_options(database_uri, settings):
+    """
+    Arma SQLALCHEMY_ENGINE_OPTIONS a partir del perfil.
+
+    pooler_mode:
+      - direct / session: conexion directa o PgBouncer/Supavisor en modo sesion
+        (Supabase puerto 5432). statement_timeout va como parametro de arranque.
+      - transaction: PgBouncer/Supavisor en modo transaccion (Supabase puerto 6543).
+        Cada transaccion puede caer en otra conexion del servidor, asi que no se
+        usa estado de sesion: statement_timeout se aplica con SET LOCAL al iniciar
+        cada transaccion (ver configure_engine). psycopg2 no usa prepared
+        statements del servidor, por lo que no hay nada mas que desactivar.
+    """
+    if database_uri.startswith('sqlite'):
+        # SQLite (scripts/pruebas locales) no usa pool de red
+        return {}
+
+    options = {
+        'pool_size':     settings['pool_size'],
+        'max_overflow':  settings['max_overflow'],
+        'pool_timeout':  settings['pool_timeout'],
+        'pool_recycle':  settings['pool_recycle'],
+        'pool_pre_ping': settings['pool_pre_ping'],
+    }
+
+    if database_uri.startswith('postgres'):
+        connect_args = {'connect_timeout': settings['connect_timeout']}
+        if settings['pooler_mode'] != 'transaction' and settings['statement_timeout_ms']:
+            connect_args['options'] = f"-c statement_timeout={settings['statement_timeout_ms']}"
+        options['connect_args'] = connect_args
+
+    return options
+
+
+def configure_engine(engine, settings):
+    """Listeners que dependen del perfil. Se llama una vez por engine."""
+    if (
+        engine.dialect.name == 'postgresql'
+        and settings['pooler_mode'] == 'transaction'
+        and settings['statement_timeout_ms']
+    ):
+        timeout = int(settings['statement_timeout_ms'])
+
+        @event.listens_for(engine, 'begin')
+        def set_statement_timeout(conn):
+            conn.exec_driver_sql(f'SET LOCAL statement_timeout = {timeout}')
+
+
+def pool_stats(engine):
+    """Estado actual del pool de conexiones (para monitoreo)."""
+    pool = engine.pool
+    stats = {'pool': type(pool).__name__}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        method = getattr(pool, name, None)
+        if callable(method):
+            stats[name] = method()
+    return stats
@@ -0,0 +1,134 @@
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+
+
+REPLICA_BIND = 'replica'
+
+# 0 si esta al dia o si no es una replica (ej: en desarrollo apunta a la misma base)
+_LAG_SQL = text(
+    "SELECT CASE "
+    "  WHEN NOT pg_is_in_recovery() THEN 0 "
+    "  WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "  ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class ReplicaRouter:
+    """
+    Estado de la replica de lectura (REPLICA_DATABASE_URL) en este worker.
+
+    Cada REPLICA_CHECK_INTERVAL segundos mide el atraso de la replica. Si
+    supera REPLICA_MAX_LAG_SECONDS, o la replica no responde, las lecturas
+    vuelven al primario hasta el siguiente chequeo.
+    """
+
+    def __init__(self):
+        self.max_lag = 0.0
+        self.check_interval = 5.0
+        self.healthy = False
+        self.lag = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app, engine):
+        self.max_lag = app.config['REPLICA_MAX_LAG_SECONDS']
+        self.check_interval = app.config['REPLICA_CHECK_INTERVAL']
+        self._checked_at = None
+        if engine is not None:
+            # Un error de conexion en medio de un request manda el resto al primario
+            event.listen(engine, 'handle_error', self._on_error)
+
+    @staticmethod
+    def engine():
+        return current_app.extensions['sqlalchemy'].engines.get(REPLICA_BIND)
+
+    def available(self):
+        """True si hay replica configurada, responde y esta dentro del atraso tolerado."""
+        engine = self.engine()
+        if engine is None:
+            return False
+
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self.healthy
+
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return self.healthy
+            try:
+                with engine.connect() as conn:
+                    self.lag = float(conn.execute(_LAG_SQL).scalar())
+                self.healthy = self.lag <= self.max_lag
+            except Exception as e:
+                print(f"Replica no disponible, leyendo del primario: {e}")
+                self.lag = None
+                self.healthy = False
+            self._checked_at = now
+        return self.healthy
+
+    def status(self):
+        return {
+            'configured': self.engine() is not None,
+            'healthy': self.healthy,
+            'lag_seconds': self.lag,
+            'max_lag_seconds': self.max_lag,
+        }
+
+    def _on_error(self, context):
+        if context.is_disconnect or context.sqlalchemy_exception is not None:
+            self.healthy = False
+            self._checked_at = time.monotonic()
+
+
+replica_router = ReplicaRouter()
+
+
+def read_replica(f):
+    """
+    Marca una lectura que puede ir a la replica: desde ahi hasta el final del
+    request, las consultas de la sesion usan la replica si esta disponible.
+
+    No tiene efecto en requests autenticados (require_auth fija el primario),
+    asi un admin siempre lee lo que acaba de escribir.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if has_app_context() and not g.get('db_primary_only'):
+            g.db_read_replica = True
+        return f(*args, **kwargs)
+    return decorated
+
+
+def use_primary():
+    """Fuerza el primario para el resto del request."""
+    g.db_primary_only = True
+    g.db_read_replica = False
+
+
+class RoutingSession(Session):
+    """
+    Sesion que manda las lecturas marcadas con @read_replica a la replica.
+    Cualquier escritura (flush o INSERT/UPDATE/DELETE directo) pasa la
+    sesion al primario hasta que termina el request, para que las lecturas
+    siguientes vean lo escrito.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            return replica_router.engine()
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause):
+        if not has_app_context() or not g.get('db_read_replica'):
+            return False
+        if self.info.get('primary_only'):
+            return False
+        if self._flushing or getattr(clause, 'is_dml', False):
+            self.info['primary_only'] = True
+            return False
+        return replica_router.available()
@@ -0,0 +1,134 @@
+import hashlib
+import re
+from difflib import SequenceMatcher
+from .errors import AppError
+
+
+# Palabras con su espacio siguiente: el diff trabaja por palabra, pero el
+# parche se expresa en caracteres, asi que no importa como se tokenizo.
+_TOKEN_RE = re.compile(r'\S+\s*|\s+')
+
+
+_GAP_MESSAGE = 'El parche no corresponde al texto (historial incompleto)'
+
+
+def text_fingerprint(text):
+    """Huella corta de un texto (None se mantiene None) para detectar huecos en el historial."""
+    if text is None:
+        return None
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+def make_text_patch(old, new):
+    """
+    Genera un parche compacto y reversible entre dos textos.
+
+    Formato (lista JSON):
+        ['=', n]      -> n caracteres sin cambios
+        ['-', 'txt']  -> texto eliminado
+        ['+', 'txt']  -> texto insertado
+
+    Guarda solo lo que cambio (y lo eliminado, para poder revertir),
+    no dos copias completas del texto.
+    """
+    old = old or ''
+    new = new or ''
+    old_tokens = _TOKEN_RE.findall(old)
+    new_tokens = _TOKEN_RE.findall(new)
+
+    patch = []
+    matcher = SequenceMatcher(None, old_tokens, new_tokens, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            patch.append(['=', sum(len(t) for t in old_tokens[i1:i2])])
+            continue
+        if i2 > i1:
+            patch.append(['-', ''.join(old_tokens[i1:i2])])
+        if j2 > j1:
+            patch.append(['+', ''.join(new_tokens[j1:j2])])
+    return patch
+
+
+def _apply(text, patch, removed_op, inserted_op):
+    result = []
+    pos = 0
+    for op, value in patch:
+        if op == '=':
+            result.append(text[pos:pos + value])
+            pos += value
+        elif op == removed_op:
+            if text[pos:pos + len(value)] != value:
+                raise AppError(_GAP_MESSAGE, 409)
+            pos += len(value)
+        elif op == inserted_op:
+            result.append(value)
+    if pos != len(text):
+        raise AppError(_GAP_MESSAGE, 409)
+    return ''.join(result)
+
+
+def apply_text_patch(old, patch):
+    """Aplica el parche hacia adelante: old -> new."""
+    return _apply(old or '', patch, removed_op='-', inserted_op='+')
+
+
+def revert_text_patch(new, patch):
+    """Aplica el parche hacia atras: new -> old."""
+    return _apply(new or '', patch, removed_op='+', inserted_op='-')
+
+
+def diff_fields(old, new, text_fields=()):
+    """
+    Compara dos snapshots {campo: valor} y retorna solo los campos que cambiaron:
+        {'price': {'old': 10.0, 'new': 12.5},
+         'content': {'patch': [...], 'before': 'a1b2...', 'after': 'c3d4...'}}
+    Los campos en text_fields (textos largos) se guardan como parche, con la
+    huella del texto antes y despues (None si el campo era None).
+    """
+    changes = {}
+    for field, new_value in new.items():
+        old_value = old.get(field)
+        if old_value == new_value:
+            continue
+        if field in text_fields:
+            changes[field] = {
+                'patch':  make_text_patch(old_value, new_value),
+                'before': text_fingerprint(old_value),
+                'after':  text_fingerprint(new_value),
+            }
+        else:
+            changes[field] = {'old': old_value, 'new': new_value}
+    return changes
+
+
+def check_changes(snapshot, changes):
+    """
+    Verifica que snapshot sea el resultado de estos cambios. Si no (falta una
+    entrada posterior en la bitacora) lanza AppError 409. Los parches sin
+    huellas (formato anterior) no se pueden verificar aca.
+    """
+    for field, change in changes.items():
+        current = snapshot.get(field)
+        if 'patch' in change:
+            if 'after' in change and text_fingerprint(current) != change['after']:
+                raise AppError(_GAP_MESSAGE, 409)
+        elif field in snapshot and current != change['new']:
+            raise AppError(_GAP_MESSAGE, 409)
+
+
+def revert_changes(snapshot, changes):
+    """Reconstruye el snapshot anterior a partir del posterior y sus cambios."""
+    check_changes(snapshot, changes)
+    previous = dict(snapshot)
+    for field, change in changes.items():
+        if 'patch' in change:
+            previous[field] = revert_text_patch(snapshot.get(field), change['patch'])
+            if 'before' not in change:
+                continue
+            if change['before'] is None:
+                previous[field] = None
+            elif text_fingerprint(previous[field]) != change['before']:
+                raise AppError(_GAP_MESSAGE, 409)
+        else:
+            previous[field] = change['old']
+    return previous
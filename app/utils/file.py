@@ -1,7 +1,22 @@
+import base64
+import io
 import os
+import tempfile
+import warnings
 import cloudinary
 import cloudinary.uploader
 from flask import current_app
+from PIL import Image, ImageOps
+from .metrics import cloudinary_call
+from .timing import timed
+
+
+# Firmas binarias (magic bytes) de los formatos aceptados.
+# No confiamos en la extension ni en el Content-Type que manda el cliente.
+_IMAGE_SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'PNG'),
+    (b'\xff\xd8\xff',         'JPEG'),
+)
 
 
 def init_cloudinary():
@@ -18,30 +33,164 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
 
-def save_image(file):
+def _sniff_format(stream):
+    """Lee solo la cabecera del archivo y retorna el formato real (PNG, JPEG, WEBP) o None."""
+    header = stream.read(12)
+    stream.seek(0)
+
+    for signature, fmt in _IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return fmt
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'WEBP'
+    return None
+
+
+def process_image(file):
     """
-    Sube la imagen a Cloudinary y retorna la URL pública.
-    Retorna None si el archivo no es válido.
+    Procesa la imagen localmente antes de subirla:
+    - Verifica los magic bytes (el formato real debe coincidir con uno permitido)
+    - Rechaza bombas de descompresion (demasiados pixeles declarados en la cabecera)
+    - Elimina EXIF y demas metadatos (aplicando antes la orientacion)
+    - Reduce la imagen a IMAGE_MAX_DIMENSION en su lado mas largo
+
+    Pillow lee el archivo de forma incremental desde el stream (que Werkzeug ya
+    guarda en un archivo temporal si es grande), sin copiarlo completo a memoria.
+    El resultado se escribe en un SpooledTemporaryFile que pasa a disco si crece.
+
+    Retorna (archivo_procesado, placeholder). El archivo queda posicionado al
+    inicio; placeholder es el data URI LQIP (ver _build_placeholder).
+    Retorna (None, None) si la imagen no es valida.
+    """
+    stream = file.stream
+    fmt = _sniff_format(stream)
+    if fmt is None:
+        return None, None
+
+    max_pixels    = current_app.config['IMAGE_MAX_PIXELS']
+    max_dimension = current_app.config['IMAGE_MAX_DIMENSION']
+
+    try:
+        with warnings.catch_warnings():
+            # Pillow solo avisa entre MAX_IMAGE_PIXELS y el doble; lo tratamos como error
+            warnings.simplefilter('error', Image.DecompressionBombWarning)
+            img = Image.open(stream)  # Solo lee la cabecera
+
+        if img.format != fmt:
+            return None, None
+        if img.width * img.height > max_pixels:
+            return None, None
+
+        # En JPEG decodifica directamente a una escala reducida (menos memoria y CPU)
+        img.draft('RGB', (max_dimension, max_dimension))
+
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+        if img.mode not in ('RGB', 'RGBA'):
+            has_alpha = img.mode in ('LA', 'PA') or 'transparency' in img.info
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+
+        output = tempfile.SpooledTemporaryFile(max_size=current_app.config['IMAGE_SPOOL_MAX_SIZE'])
+        # Al no pasar exif= ni icc_profile= los metadatos originales se descartan
+        img.save(output, format='WEBP', quality=current_app.config['IMAGE_QUALITY'], method=4)
+        output.seek(0)
+        return output, _build_placeholder(img)
+    except (Image.DecompressionBombError, Image.DecompressionBombWarning, OSError, ValueError) as e:
+        print(f"Imagen rechazada en el procesamiento local: {e}")
+        return None, None
+    finally:
+        stream.seek(0)
+
+
+def _build_placeholder(img):
+    """
+    Genera un placeholder LQIP: la imagen reducida a IMAGE_PLACEHOLDER_SIZE px
+    codificada como data URI WebP en base64 (unos cientos de bytes).
+    El frontend lo muestra con blur mientras carga la imagen real.
+    """
+    size = current_app.config['IMAGE_PLACEHOLDER_SIZE']
+    thumb = img.copy()
+    thumb.thumbnail((size, size))
+
+    buffer = io.BytesIO()
+    thumb.save(buffer, format='WEBP', quality=30)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def build_variant_urls(image_url):
+    """
+    Construye las URLs de las variantes responsivas (una por ancho en
+    IMAGE_VARIANT_WIDTHS) usando transformaciones de Cloudinary.
+    Retorna {ancho: url} con el ancho como string (se guarda como JSON),
+    o None si la imagen no esta en Cloudinary.
+    """
+    public_id = _public_id_from_url(image_url)
+    if not public_id:
+        return None
+
+    return {
+        str(width): cloudinary.CloudinaryImage(public_id).build_url(
+            transformation=[
+                {'width': width, 'crop': 'limit'},
+                {'quality': 'auto', 'fetch_format': 'auto'},
+            ],
+            secure=True,
+        )
+        for width in current_app.config['IMAGE_VARIANT_WIDTHS']
+    }
+
+
+def upload_image(file):
+    """
+    Procesa la imagen localmente (ver process_image) y la sube a Cloudinary.
+
+    Retorna un dict con:
+        url:         URL pública de la imagen original
+        variants:    {ancho: url} para armar el srcset
+        placeholder: data URI LQIP
+    o None si el archivo no es válido.
     """
     if not file or not allowed_file(file.filename):
         return None
 
+    processed, placeholder = process_image(file)
+    if processed is None:
+        return None
+
     try:
         # Subir a Cloudinary con carpeta 'pisos-kermy'
-        result = cloudinary.uploader.upload(
-            file,
-            folder='pisos-kermy',
-            resource_type='image',
-            format='webp',  # Convertir a WebP automáticamente
-            transformation=[
-                {'quality': 'auto'},
-                {'fetch_format': 'auto'}
-            ]
-        )
-        return result['secure_url']
+        with timed('cloudinary'), cloudinary_call('upload'):
+            result = cloudinary.uploader.upload(
+                processed,
+                folder='pisos-kermy',
+                resource_type='image',
+                format='webp',  # Convertir a WebP automáticamente
+                transformation=[
+                    {'quality': 'auto'},
+                    {'fetch_format': 'auto'}
+                ]
+            )
     except Exception as e:
         print(f"Error subiendo imagen a Cloudinary: {e}")
         return None
+    finally:
+        processed.close()
+
+    return {
+        'url':         result['secure_url'],
+        'variants':    build_variant_urls(result['secure_url']),
+        'placeholder': placeholder,
+    }
+
+
+def save_image(file):
+    """
+    Sube la imagen a Cloudinary y retorna la URL pública.
+    Retorna None si el archivo no es válido.
+    """
+    uploaded = upload_image(file)
+    return uploaded['url'] if uploaded else None
 
 
 def get_image_url(image_path):
@@ -61,24 +210,33 @@ def get_image_url(image_path):
     return image_path
 
 
+def _public_id_from_url(image_url):
+    """
+    Extrae el public_id de una URL de Cloudinary.
+    Ejemplo: https://res.cloudinary.com/xxx/image/upload/v123/pisos-kermy/abc123.webp
+    public_id = pisos-kermy/abc123
+    """
+    if not image_url or not image_url.startswith('https://res.cloudinary.com'):
+        return None
+
+    parts = image_url.split('/')
+    if 'pisos-kermy' not in parts:
+        return None
+    idx = parts.index('pisos-kermy')
+    public_id = '/'.join(parts[idx:])
+    # Quitar extensión
+    return public_id.rsplit('.', 1)[0]
+
+
 def delete_image(image_url):
     """
     Elimina una imagen de Cloudinary dado su URL.
     Extrae el public_id de la URL y lo elimina.
     """
-    if not image_url or not image_url.startswith('https://res.cloudinary.com'):
-        return
-
     try:
-        # Extraer public_id de la URL de Cloudinary
-        # Ejemplo: https://res.cloudinary.com/xxx/image/upload/v123/pisos-kermy/abc123.webp
-        # public_id = pisos-kermy/abc123
-        parts = image_url.split('/')
-        if 'pisos-kermy' in parts:
-            idx = parts.index('pisos-kermy')
-            public_id = '/'.join(parts[idx:])
-            # Quitar extensión
-            public_id = public_id.rsplit('.', 1)[0]
-            cloudinary.uploader.destroy(public_id)
+        public_id = _public_id_from_url(image_url)
+        if public_id:
+            with timed('cloudinary'), cloudinary_call('destroy'):
+                cloudinary.uploader.destroy(public_id)
     except Exception as e:
         print(f"Error eliminando imagen de Cloudinary: {e}")
\ No newline at end of file
@@ -0,0 +1,151 @@
+import os
+import time
+from contextlib import contextmanager
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+
+# Con varios workers de gunicorn cada proceso escribe sus valores en
+# PROMETHEUS_MULTIPROC_DIR (lo define gunicorn.conf.py) y /metrics los suma.
+# Los Gauge declaran como se agregan entre procesos (multiprocess_mode).
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latencia de los requests',
+    ['blueprint', 'endpoint', 'method'],
+)
+REQUEST_COUNT = Counter(
+    'http_requests_total', 'Requests atendidos',
+    ['blueprint', 'endpoint', 'method', 'status'],
+)
+
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out', 'Conexiones del pool en uso',
+    ['bind'], multiprocess_mode='livesum',
+)
+DB_POOL_CAPACITY = Gauge(
+    'db_pool_capacity', 'Conexiones maximas del pool (pool_size + max_overflow)',
+    ['bind'], multiprocess_mode='livesum',
+)
+
+CACHE_REQUESTS = Counter(
+    'cache_requests_total', 'Lecturas de cache por resultado (hit/miss)',
+    ['cache', 'result'],
+)
+
+CLOUDINARY_LATENCY = Histogram(
+    'cloudinary_request_duration_seconds', 'Latencia de las llamadas a Cloudinary',
+    ['operation'],
+)
+CLOUDINARY_ERRORS = Counter(
+    'cloudinary_errors_total', 'Llamadas a Cloudinary que fallaron',
+    ['operation'],
+)
+
+AUDIT_QUEUE_DEPTH = Gauge(
+    'audit_queue_depth', 'Entradas de bitacora esperando ser escritas',
+    multiprocess_mode='livesum',
+)
+AUDIT_WRITE_FAILURES = Counter(
+    'audit_write_failures_total', 'Entradas de bitacora que no se pudieron insertar',
+    ['outcome'],
+)
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+@contextmanager
+def cloudinary_call(operation):
+    """Mide una llamada a Cloudinary y cuenta los errores (la excepcion se propaga)."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        CLOUDINARY_ERRORS.labels(operation).inc()
+        raise
+    finally:
+        CLOUDINARY_LATENCY.labels(operation).observe(time.perf_counter() - start)
+
+
+def instrument_pool(engine, bind, settings):
+    """
+    Ocupacion del pool de un engine (sync, o el sync_engine de uno async).
+    settings es DB_POOL_SETTINGS, el mismo perfil con el que se creo el pool.
+    """
+    capacity = settings['pool_size'] + settings['max_overflow'] if isinstance(engine.pool, QueuePool) else None
+
+    @event.listens_for(engine, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        # La capacidad se publica desde cada worker (despues del fork) para que sume bien
+        if capacity is not None:
+            DB_POOL_CAPACITY.labels(bind).set(capacity)
+        DB_POOL_CHECKED_OUT.labels(bind).inc()
+
+    @event.listens_for(engine, 'checkin')
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.labels(bind).dec()
+
+
+def observe_request(blueprint, endpoint, method, status, duration):
+    # Rutas inexistentes (404) bajo una sola etiqueta: no crear una serie por URL
+    endpoint = endpoint or 'unmatched'
+    REQUEST_LATENCY.labels(blueprint or '', endpoint, method).observe(duration)
+    REQUEST_COUNT.labels(blueprint or '', endpoint, method, str(status)).inc()
+
+
+class Metrics:
+    """
+    Metricas en formato Prometheus: latencia y cantidad de requests por
+    blueprint/endpoint, ocupacion del pool, hits/misses de cache, llamadas
+    a Cloudinary y profundidad de la cola de bitacora. Se exponen en /metrics
+    con Authorization: Bearer <METRICS_TOKEN>; sin token quedan desactivadas.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.token = None
+
+    def init_app(self, app):
+        self.enabled = app.config['METRICS_ENABLED']
+        if not self.enabled:
+            return
+        self.token = app.config['METRICS_TOKEN']
+        if not self.token:
+            # /metrics publico expone endpoints, volumen y errores: sin token no se sirve
+            print("⚠️  METRICS_ENABLED sin METRICS_TOKEN: las metricas quedan desactivadas. "
+                  "Configurar METRICS_TOKEN (o METRICS_ENABLED=false para silenciar este aviso).")
+            self.enabled = False
+            return
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.add_url_rule('/metrics', 'metrics', self._render)
+
+    def _start(self):
+        g.metrics_start = time.perf_counter()
+
+    def _finish(self, response):
+        start = g.pop('metrics_start', None)
+        if start is not None:
+            observe_request(request.blueprint, request.endpoint, request.method,
+                            response.status_code, time.perf_counter() - start)
+        return response
+
+    def _render(self):
+        if request.headers.get('Authorization') != f'Bearer {self.token}':
+            return Response('No autorizado\n', status=401, mimetype='text/plain')
+
+        if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+metrics = Metrics()
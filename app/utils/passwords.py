@@ -0,0 +1,84 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from werkzeug.security import generate_password_hash, check_password_hash
+from .errors import AppError
+
+
+class PasswordHasher:
+    """
+    Hash y verificacion de contraseñas con el esquema de PASSWORD_HASH_METHOD
+    (formato de Werkzeug, ej: 'pbkdf2:sha256:600000' o 'scrypt:32768:8:1').
+
+    La verificacion corre en un pool de PASSWORD_HASH_WORKERS hilos: pbkdf2 y
+    scrypt liberan el GIL, asi que mientras un login calcula el hash los demas
+    hilos del worker siguen atendiendo el catalogo. Como maximo hay
+    PASSWORD_HASH_MAX_PENDING verificaciones en curso o en espera; pasado ese
+    limite el login responde 503 en vez de acumular CPU.
+    """
+
+    def __init__(self):
+        self.method = 'pbkdf2:sha256'
+        self.workers = 2
+        self.timeout = 10.0
+        self._prefix = None
+        self._slots = None
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        try:
+            # Werkzeug completa los parametros por defecto ('pbkdf2:sha256' -> 'pbkdf2:sha256:600000');
+            # el prefijo de un hash de referencia es lo que se compara en needs_rehash
+            self._prefix = generate_password_hash('', method=self.method).split('$', 1)[0]
+        except ValueError as e:
+            raise RuntimeError(f'PASSWORD_HASH_METHOD invalido ({self.method}): {e}')
+        self._slots = threading.BoundedSemaphore(app.config['PASSWORD_HASH_MAX_PENDING'])
+
+    def hash(self, password):
+        """Genera el hash con el esquema configurado (en el pool)."""
+        return self._run(generate_password_hash, password, self.method)
+
+    def hash_inline(self, password):
+        """Genera el hash en el hilo actual (scripts y altas de admins)."""
+        return generate_password_hash(password, method=self.method)
+
+    def verify(self, password_hash, password):
+        """True si la contraseña corresponde al hash (en el pool)."""
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True si el hash fue generado con otro algoritmo o costo."""
+        return password_hash.split('$', 1)[0] != self._prefix
+
+    def _get_executor(self):
+        """El pool se crea en el primer uso y de nuevo tras el fork de gunicorn."""
+        if self._executor is not None and self._pid == os.getpid():
+            return self._executor
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+                self._pid = os.getpid()
+        return self._executor
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise AppError('Demasiados inicios de sesión simultáneos, intenta de nuevo en unos segundos', 503)
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # El cupo se libera cuando termina el calculo, aunque el request ya no espere
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise AppError('El servidor está ocupado, intenta de nuevo en unos segundos', 503)
+
+
+password_hasher = PasswordHasher()
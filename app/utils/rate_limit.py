@@ -0,0 +1,230 @@
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from flask import jsonify, request
+
+
+_RATE_RE = re.compile(r'^\s*(\d+)\s*/\s*(second|minute|hour)\s*$')
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600}
+
+
+def parse_rate(spec):
+    """'10/minute' -> (capacidad, tokens por segundo). Lanza ValueError si no es valido."""
+    match = _RATE_RE.match(spec or '')
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"limite invalido '{spec}' (usar N/second, N/minute o N/hour)")
+    capacity = int(match.group(1))
+    return capacity, capacity / _PERIODS[match.group(2)]
+
+
+# Token buckets atomicos en Redis: hash {tokens, ts} por clave, expira cuando el balde se llenaria.
+# Primero recarga y revisa todos los baldes; solo si todos tienen un token descuenta uno de cada uno.
+_REDIS_SCRIPT = """
+local now     = tonumber(ARGV[1])
+local tokens  = {}
+local allowed = 1
+for i, key in ipairs(KEYS) do
+  local capacity = tonumber(ARGV[i * 2])
+  local rate     = tonumber(ARGV[i * 2 + 1])
+  local state    = redis.call('HMGET', key, 'tokens', 'ts')
+  local current  = tonumber(state[1]) or capacity
+  local ts       = tonumber(state[2]) or now
+  tokens[i] = math.min(capacity, current + math.max(0, now - ts) * rate)
+  if tokens[i] < 1 then
+    allowed = 0
+  end
+end
+local result = {allowed}
+for i, key in ipairs(KEYS) do
+  local capacity = tonumber(ARGV[i * 2])
+  local rate     = tonumber(ARGV[i * 2 + 1])
+  tokens[i] = tokens[i] - allowed
+  redis.call('HSET', key, 'tokens', tostring(tokens[i]), 'ts', tostring(now))
+  redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+  result[i + 1] = tostring(tokens[i])
+end
+return result
+"""
+
+
+class MemoryBackend:
+    """
+    Baldes en memoria del proceso: cada worker de gunicorn lleva su propia cuenta.
+
+    Cada balde guarda cuando vuelve a estar lleno (full_at): desde ese momento
+    equivale a no tener registro y se puede descartar. Los baldes se mantienen
+    en orden LRU; pasado max_keys se descartan desde el menos usado, en O(1)
+    por clave (primero los ya llenos, si no el mas viejo aunque no lo este).
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()   # clave -> (tokens, ts, full_at)
+        self._lock = threading.Lock()
+
+    def consume(self, buckets, now):
+        """
+        buckets: [(clave, capacidad, tokens por segundo)]. Consume un token de
+        cada balde solo si todos tienen uno. Retorna (permitido, [tokens que quedan]).
+        """
+        with self._lock:
+            levels = []
+            for key, capacity, rate in buckets:
+                tokens, ts, _ = self._buckets.get(key, (capacity, now, now))
+                levels.append(min(capacity, tokens + max(0.0, now - ts) * rate))
+            allowed = all(tokens >= 1 for tokens in levels)
+            if allowed:
+                levels = [tokens - 1 for tokens in levels]
+            for (key, capacity, rate), tokens in zip(buckets, levels):
+                self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+                self._buckets.move_to_end(key)
+            self._evict(now)
+            return allowed, levels
+
+    def _evict(self, now):
+        buckets = self._buckets
+        # El menos usado primero: si ya se lleno no hace falta recordarlo
+        while buckets:
+            key, (_, _, full_at) = next(iter(buckets.items()))
+            if full_at > now:
+                break
+            buckets.popitem(last=False)
+        while len(buckets) > self.max_keys:
+            buckets.popitem(last=False)
+
+
+class RedisBackend:
+    """
+    Baldes compartidos entre workers en cualquier servidor que hable el
+    protocolo de Redis (Redis, Valkey, KeyDB, Dragonfly...). Requiere el
+    paquete `redis` (opcional, no esta en requirements.txt).
+    """
+
+    def __init__(self, url, prefix='ratelimit:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RATE_LIMIT_STORAGE apunta a Redis pero falta el paquete: pip install redis')
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._script = self._client.register_script(_REDIS_SCRIPT)
+
+    def consume(self, buckets, now):
+        args = [now]
+        for _, capacity, rate in buckets:
+            args += [capacity, rate]
+        allowed, *tokens = self._script(keys=[self.prefix + key for key, _, _ in buckets], args=args)
+        return bool(int(allowed)), [float(t) for t in tokens]
+
+
+def _client_ip():
+    return request.remote_addr or 'unknown'
+
+
+def _login_email():
+    data = request.get_json(silent=True) or {}
+    email = data.get('email')
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+# Endpoint -> [(politica, funcion que arma la clave)]. Una clave None no se limita.
+TOO_MANY_REQUESTS = 'Demasiadas solicitudes, intenta de nuevo más tarde'
+
+ROUTE_POLICIES = {
+    'auth.login':                    [('login_ip', _client_ip), ('login_email', _login_email)],
+    'products.list_products':        [('catalog', _client_ip)],
+    'products.get_product':          [('catalog', _client_ip)],
+    'categories.list_categories':    [('public', _client_ip)],
+    'tags.list_tags':                [('public', _client_ip)],
+    'site_content.get_site_content': [('public', _client_ip)],
+}
+
+
+class RateLimiter:
+    """
+    Limite de requests con token bucket, aplicado en before_request segun
+    ROUTE_POLICIES. Cada politica (RATE_LIMIT_<NOMBRE> en Config, ej:
+    '10/minute') define la capacidad del balde y a que ritmo se recarga.
+
+    Si un balde esta vacio responde 429 con Retry-After (segundos hasta el
+    proximo token). Si el backend compartido no responde, deja pasar el
+    request: un Redis caido no debe tirar la API.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.policies = {}
+        self.backend = None
+
+    def init_app(self, app):
+        self.enabled = app.config['RATE_LIMIT_ENABLED']
+        if not self.enabled:
+            return
+
+        try:
+            self.policies = {
+                name: parse_rate(app.config[f'RATE_LIMIT_{name.upper()}'])
+                for name in {policy for rules in ROUTE_POLICIES.values() for policy, _ in rules}
+            }
+        except ValueError as e:
+            raise RuntimeError(f'Configuracion de rate limit invalida: {e}')
+
+        storage = app.config['RATE_LIMIT_STORAGE']
+        if storage == 'memory':
+            self.backend = MemoryBackend()
+        elif storage.startswith(('redis://', 'rediss://', 'unix://')):
+            self.backend = RedisBackend(storage)
+        else:
+            raise RuntimeError(f"RATE_LIMIT_STORAGE invalido: '{storage}' (usar 'memory' o una URL redis://)")
+
+        if not app.config['TRUSTED_PROXIES']:
+            print("⚠️  Rate limiting activo con TRUSTED_PROXIES=0: detras de un proxy (Render, nginx) "
+                  "todos los clientes comparten el balde de la IP del proxy. Configurar TRUSTED_PROXIES.")
+
+        app.before_request(self._check)
+
+    def consume(self, keys, now=None):
+        """
+        keys: [(politica, clave)]. Revisa todos los baldes y, solo si todos
+        tienen un token, consume uno de cada uno (un login rechazado por email
+        no gasta el cupo de la IP). Retorna None si se permite o los segundos a
+        esperar (Retry-After). Lo usan tambien las rutas async de app/asgi
+        para compartir politicas y backend.
+        """
+        buckets = [(f'{policy}:{key}', *self.policies[policy]) for policy, key in keys]
+        if not buckets:
+            return None
+        try:
+            allowed, levels = self.backend.consume(buckets, now or time.time())
+        except Exception as e:
+            print(f"Rate limit no disponible ({', '.join(policy for policy, _ in keys)}): {e}")
+            return None
+        if allowed:
+            return None
+        # Esperar a que se recargue el balde vacio mas lento
+        return max(1, max(math.ceil((1 - tokens) / rate) for (_, _, rate), tokens in zip(buckets, levels) if tokens < 1))
+
+    def _check(self):
+        if request.method == 'OPTIONS':
+            return None
+        rules = ROUTE_POLICIES.get(request.endpoint)
+        if not rules:
+            return None
+
+        keys = []
+        for policy, key_func in rules:
+            key = key_func()
+            if key is not None:
+                keys.append((policy, key))
+        retry_after = self.consume(keys)
+        if retry_after is not None:
+            response = jsonify({'error': TOO_MANY_REQUESTS})
+            response.status_code = 429
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        return None
+
+
+rate_limiter = RateLimiter()
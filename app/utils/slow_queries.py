@@ -0,0 +1,178 @@
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from flask import has_request_context, request
+from sqlalchemy import event
+from .timing import current_timings
+
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Literales entre comillas en un plan: EXPLAIN muestra los valores de los parametros
+_PLAN_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+
+# Capas desde donde se origina una consulta, de la mas interna a la mas externa
+_LAYERS = ('repositories', 'asgi', 'services', 'routes')
+
+
+def redact_parameters(parameters):
+    """Reemplaza cada valor por su tipo: el log no debe guardar emails, hashes ni busquedas."""
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f'<{len(parameters)} filas>'  # executemany
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+def _origin():
+    """
+    Recorre la pila hasta encontrar la primera funcion de cada capa del repo.
+    Retorna {'repositories': 'ProductRepository.get_paginated', 'services': ...}.
+    """
+    found = {}
+    frame = sys._getframe(2)
+    while frame is not None and len(found) < len(_LAYERS):
+        path = frame.f_code.co_filename
+        if path.startswith(_APP_DIR):
+            layer = os.path.relpath(path, _APP_DIR).split(os.sep)[0]
+            if layer in _LAYERS and layer not in found:
+                found[layer] = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+        frame = frame.f_back
+    return found
+
+
+def _current_route():
+    timings = current_timings()
+    if timings is not None and timings.endpoint:
+        return timings.endpoint
+    if has_request_context():
+        return request.endpoint
+    return None
+
+
+class SlowQueryLog:
+    """
+    Registro opcional de consultas lentas. Cada sentencia que supera
+    SLOW_QUERY_THRESHOLD_MS se loguea (parametros redactados, ruta y funcion
+    de servicio/repositorio que la origino) y queda en un buffer circular de
+    SLOW_QUERY_BUFFER_SIZE entradas por worker, visible en /api/auth/slow-queries.
+
+    Una fraccion SLOW_QUERY_EXPLAIN_SAMPLE de los SELECT lentos se vuelve a
+    ejecutar con EXPLAIN (ANALYZE, BUFFERS) en la misma transaccion (dentro
+    de un SAVEPOINT) para guardar el plan real. Duplica el costo de esa
+    consulta: por eso es un muestreo y viene en 0.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.threshold = 0.0
+        self.explain_sample = 0.0
+        self._entries = deque(maxlen=100)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config['SLOW_QUERY_ENABLED']
+        self.threshold = app.config['SLOW_QUERY_THRESHOLD_MS'] / 1000
+        self.explain_sample = app.config['SLOW_QUERY_EXPLAIN_SAMPLE']
+        if not 0 <= self.explain_sample <= 1:
+            raise RuntimeError(f'SLOW_QUERY_EXPLAIN_SAMPLE debe estar entre 0 y 1 (recibido: {self.explain_sample})')
+        self._entries = deque(maxlen=app.config['SLOW_QUERY_BUFFER_SIZE'])
+
+    def instrument(self, engine):
+        if not self.enabled:
+            return
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('slow_query_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info['slow_query_start'].pop()
+            if elapsed >= self.threshold:
+                self._record(conn, statement, parameters, executemany, elapsed)
+
+        @event.listens_for(engine, 'handle_error')
+        def handle_error(exception_context):
+            conn = exception_context.connection
+            if conn is not None and conn.info.get('slow_query_start'):
+                conn.info['slow_query_start'].pop()
+
+    def _record(self, conn, statement, parameters, executemany, elapsed):
+        origin = _origin()
+        plan = None
+        if (
+            self.explain_sample
+            and not executemany
+            and statement.lstrip()[:6].upper() == 'SELECT'
+            and random.random() < self.explain_sample
+        ):
+            plan = self._explain(conn, statement, parameters)
+
+        entry = {
+            'at':          datetime.utcnow().isoformat(),
+            'duration_ms': round(elapsed * 1000, 1),
+            'statement':   statement,
+            'parameters':  redact_parameters(parameters),
+            'route':       _current_route(),
+            'service':     origin.get('services'),
+            'caller':      origin.get('repositories') or origin.get('asgi'),
+            'plan':        plan,
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+        log_entry = {key: value for key, value in entry.items() if key not in ('statement', 'plan')}
+        log_entry['statement'] = ' '.join(statement.split())[:500]
+        print(json.dumps({'event': 'slow_query', **log_entry, 'explained': plan is not None}), flush=True)
+
+    @staticmethod
+    def _explain(conn, statement, parameters):
+        """
+        EXPLAIN (ANALYZE, BUFFERS) en un cursor aparte de la misma conexion
+        (ve los mismos datos de la transaccion). Si falla, el SAVEPOINT evita
+        que la transaccion del request quede abortada. Solo psycopg2: en la
+        ruta async no se vuelve a ejecutar nada.
+        """
+        if conn.dialect.name != 'postgresql' or conn.dialect.driver != 'psycopg2':
+            return None
+        dbapi_connection = conn.connection.dbapi_connection
+        if dbapi_connection.autocommit:
+            return None  # sin transaccion no hay SAVEPOINT
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute('SAVEPOINT slow_query_explain')
+            try:
+                cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {statement}', parameters)
+                plan = '\n'.join(_PLAN_LITERAL_RE.sub("'?'", row[0]) for row in cursor.fetchall())
+                cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+                return plan
+            except Exception as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+                return f'EXPLAIN fallo: {e}'
+        except Exception as e:
+            print(f"No se pudo capturar el plan de una consulta lenta: {e}")
+            return None
+        finally:
+            cursor.close()
+
+    def snapshot(self, limit=None):
+        """Entradas del buffer de este worker, mas recientes primero."""
+        with self._lock:
+            entries = list(reversed(self._entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+slow_query_log = SlowQueryLog()
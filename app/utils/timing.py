@@ -0,0 +1,217 @@
+import json
+import time
+from collections import defaultdict
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from flask import g, request
+from sqlalchemy import event
+
+
+# Mediciones del request en curso. ContextVar y no flask.g: funciona igual en
+# los hilos de gunicorn, en el pool de a2wsgi y en las tareas async de app/asgi.
+_current = ContextVar('request_timings', default=None)
+
+# Orden de las secciones en Server-Timing y en el log
+SECTIONS = ('auth', 'db', 'cloudinary', 'serialize')
+
+
+class RequestTimings:
+    """Tiempos acumulados de un request (segundos) y cantidad de consultas SQL."""
+
+    def __init__(self, endpoint=None):
+        self.endpoint = endpoint
+        self.start = time.perf_counter()
+        self.sections = defaultdict(float)
+        self.queries = 0
+        self._depth = defaultdict(int)
+        self._entered = {}
+
+    def enter(self, section):
+        self._depth[section] += 1
+        if self._depth[section] == 1:
+            self._entered[section] = time.perf_counter()
+
+    def exit(self, section):
+        # Solo cuenta el nivel mas externo: serialize_many llama a serialize
+        self._depth[section] -= 1
+        if self._depth[section] == 0:
+            self.sections[section] += time.perf_counter() - self._entered.pop(section)
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+
+class timed(ContextDecorator):
+    """
+    Suma el tiempo del bloque a una seccion del request en curso.
+    Fuera de un request medido no hace nada.
+
+        with timed('cloudinary'):
+            cloudinary.uploader.upload(...)
+    """
+
+    def __init__(self, section):
+        self.section = section
+
+    def __enter__(self):
+        timings = _current.get()
+        if timings is not None:
+            timings.enter(self.section)
+        return self
+
+    def __exit__(self, *exc):
+        timings = _current.get()
+        if timings is not None:
+            timings.exit(self.section)
+        return False
+
+
+def start_timing(endpoint=None):
+    """Empieza a medir el request actual. Retorna el token para reset_timing."""
+    return _current.set(RequestTimings(endpoint))
+
+
+def reset_timing(token):
+    _current.reset(token)
+
+
+def current_timings():
+    return _current.get()
+
+
+class RequestTimer:
+    """
+    Instrumentacion por request: tiempo total, tiempo y cantidad de consultas
+    SQL (eventos de SQLAlchemy), tiempo en Cloudinary, en require_auth y
+    serializando. Se emite como cabecera Server-Timing (visible en la pestaña
+    Network del navegador) y como una linea JSON en el log.
+
+    Los requests que superan REQUEST_BUDGET_QUERIES consultas o
+    REQUEST_BUDGET_MS milisegundos quedan marcados en over_budget: un N+1 en
+    un serializer aparece como muchas consultas dentro de 'serialize'.
+    Con REQUEST_TIMING_LOG=budget (por defecto) solo esos se escriben al log.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.header = True
+        self.log_mode = 'budget'
+        self.budget_queries = 0
+        self.budget_ms = 0
+
+    def init_app(self, app):
+        self.enabled = app.config['REQUEST_TIMING_ENABLED']
+        if not self.enabled:
+            return
+
+        self.header = app.config['REQUEST_TIMING_HEADER']
+        self.log_mode = app.config['REQUEST_TIMING_LOG']
+        if self.log_mode not in ('all', 'budget', 'off'):
+            raise RuntimeError(f"REQUEST_TIMING_LOG invalido: '{self.log_mode}' (usar all, budget u off)")
+        self.budget_queries = app.config['REQUEST_BUDGET_QUERIES']
+        self.budget_ms = app.config['REQUEST_BUDGET_MS']
+
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._reset)
+
+    def instrument(self, engine):
+        """Cuenta y mide cada consulta del engine (sync, o el sync_engine de uno async)."""
+        if not self.enabled:
+            return
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('timing_query_start', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info['timing_query_start'].pop()
+            timings = _current.get()
+            if timings is not None:
+                timings.sections['db'] += time.perf_counter() - started
+                timings.queries += 1
+
+        @event.listens_for(engine, 'handle_error')
+        def handle_error(exception_context):
+            conn = exception_context.connection
+            if conn is not None and conn.info.get('timing_query_start'):
+                conn.info['timing_query_start'].pop()
+
+    def instrument_serializers(self, *schemas):
+        """
+        Mide serialize y serialize_many de los schemas de respuesta como la
+        seccion 'serialize'. Las rutas Flask y las async usan los mismos
+        schemas, asi que se mide en un solo lugar. Cada metodo se envuelve
+        una sola vez aunque create_app corra varias veces.
+        """
+        if not self.enabled:
+            return
+        for schema in schemas:
+            for name in ('serialize', 'serialize_many'):
+                method = schema.__dict__.get(name)
+                if method is None or getattr(method.__func__, 'timed_section', None):
+                    continue
+                wrapped = timed('serialize')(method.__func__)
+                wrapped.timed_section = 'serialize'
+                setattr(schema, name, staticmethod(wrapped))
+
+    def report(self, timings, method, path, endpoint, status):
+        """
+        Cierra la medicion: retorna el valor de Server-Timing (o None) y
+        escribe la linea de log segun REQUEST_TIMING_LOG.
+        """
+        total_ms = timings.elapsed() * 1000
+        over_budget = []
+        if self.budget_queries and timings.queries > self.budget_queries:
+            over_budget.append('queries')
+        if self.budget_ms and total_ms > self.budget_ms:
+            over_budget.append('latency')
+
+        if self.log_mode == 'all' or (self.log_mode == 'budget' and over_budget):
+            entry = {
+                'event':    'request_timing',
+                'method':   method,
+                'path':     path,
+                'endpoint': endpoint,
+                'status':   status,
+                'total_ms': round(total_ms, 1),
+                'queries':  timings.queries,
+            }
+            for section in SECTIONS:
+                entry[f'{section}_ms'] = round(timings.sections.get(section, 0.0) * 1000, 1)
+            entry['over_budget'] = over_budget
+            print(json.dumps(entry), flush=True)
+
+        if not self.header:
+            return None
+        metrics = [f'total;dur={total_ms:.1f}']
+        for section in SECTIONS:
+            if section in timings.sections:
+                metric = f'{section};dur={timings.sections[section] * 1000:.1f}'
+                if section == 'db':
+                    metric += f';desc="{timings.queries} queries"'
+                metrics.append(metric)
+        if over_budget:
+            metrics.append(f'budget;desc="{",".join(over_budget)}"')
+        return ', '.join(metrics)
+
+    def _start(self):
+        g.timing_token = start_timing(request.endpoint)
+
+    def _finish(self, response):
+        timings = _current.get()
+        if timings is None:
+            return response
+        header = self.report(timings, request.method, request.path, request.endpoint, response.status_code)
+        if header:
+            response.headers['Server-Timing'] = header
+        return response
+
+    def _reset(self, exc):
+        token = g.pop('timing_token', None)
+        if token is not None:
+            reset_timing(token)
+
+
+request_timer = RequestTimer()
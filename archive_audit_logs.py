@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Mantenimiento de la bitácora (audit_logs particionada por mes).
+
+1. Crea por adelantado las particiones del mes actual y AUDIT_PARTITIONS_AHEAD meses más
+2. Exporta las particiones más viejas que AUDIT_RETENTION_MONTHS a
+   AUDIT_ARCHIVE_DIR/audit_logs_YYYY-MM.ndjson.gz, verifica la cantidad de
+   filas y recién entonces elimina la partición
+
+Los meses archivados se consultan con GET /api/auth/audit/archive.
+Pensado para correr una vez al día (cron). Requiere haber ejecutado python migrate.py upgrade.
+
+Ejecutar desde la raiz del repo:
+
+    python archive_audit_logs.py
+    python archive_audit_logs.py --dry-run   # exporta a un temporal y verifica, sin borrar nada
+"""
+import argparse
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Tareas de mantenimiento largas: sin el statement_timeout de la API (salvo que se pida explicitamente)
+os.environ.setdefault('DB_STATEMENT_TIMEOUT_MS', '0')
+
+from app import create_app
+from app.services.audit_archive_service import AuditArchiveService
+
+
+def main(dry_run):
+    app = create_app()
+    with app.app_context():
+        config = app.config
+
+        AuditArchiveService.maintain_partitions(config['AUDIT_PARTITIONS_AHEAD'])
+        print(f"Particiones creadas hasta {config['AUDIT_PARTITIONS_AHEAD']} meses adelante.")
+
+        expired = AuditArchiveService.expired_partitions(config['AUDIT_RETENTION_MONTHS'])
+        if not expired:
+            print(f"No hay particiones con más de {config['AUDIT_RETENTION_MONTHS']} meses.")
+            return
+
+        for name, month in expired:
+            rows = AuditArchiveService.archive_partition(name, month, config['AUDIT_ARCHIVE_DIR'], dry_run=dry_run)
+            if dry_run:
+                print(f"[dry-run] {name}: {rows} filas verificadas, no se eliminó nada.")
+            else:
+                print(f"{name}: {rows} filas archivadas en {config['AUDIT_ARCHIVE_DIR']} y partición eliminada.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Crear particiones y archivar la bitácora vencida.')
+    parser.add_argument('--dry-run', action='store_true', help='Verificar la exportación sin eliminar particiones')
+    main(parser.parse_args().dry_run)
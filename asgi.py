@@ -0,0 +1,9 @@
+"""
+Entrada ASGI: catalogo publico async + app Flask para el resto.
+
+    uvicorn asgi:app --proxy-headers
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn asgi:app
+"""
+from app.asgi import create_asgi_app
+
+app = create_asgi_app()
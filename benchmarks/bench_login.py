@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark de login.
+
+1. Costo de cada esquema de hash (sin base ni API): cuanto tarda una
+   verificacion con cada valor posible de PASSWORD_HASH_METHOD.
+2. Throughput de POST /api/auth/login contra una API corriendo, con
+   --concurrency clientes en paralelo durante --duration segundos, midiendo
+   al mismo tiempo la latencia de GET /api/products (el catalogo no deberia
+   degradarse mientras hay logins en curso).
+
+Ejecutar desde la raiz del repo:
+
+    python benchmarks/bench_login.py --hashes-only
+    python benchmarks/bench_login.py --url http://localhost:5000 --email admin@x.com --password secreto
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import requests
+from werkzeug.security import generate_password_hash, check_password_hash
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import percentile
+
+
+DEFAULT_METHODS = [
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:260000',
+    'scrypt:32768:8:1',
+    'scrypt:16384:8:1',
+]
+
+
+def bench_hashes(methods, rounds):
+    print(f"\n🔐 Costo por verificacion ({rounds} rondas)")
+    print(f"{'esquema':<26}{'promedio ms':>14}{'verif/s por hilo':>20}")
+    for method in methods:
+        password_hash = generate_password_hash('benchmark-password', method=method)
+        times = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            check_password_hash(password_hash, 'benchmark-password')
+            times.append(time.perf_counter() - start)
+        avg = statistics.mean(times)
+        print(f"{method:<26}{avg * 1000:>14.1f}{1 / avg:>20.1f}")
+
+
+def bench_login(url, email, password, concurrency, duration):
+    print(f"\n🚀 Login contra {url}: {concurrency} clientes, {duration}s")
+    stop = time.monotonic() + duration
+    login_times, catalog_times = [], []
+    statuses = {}
+    lock = threading.Lock()
+
+    def login_client():
+        session = requests.Session()
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            r = session.post(f"{url}/api/auth/login", json={'email': email, 'password': password})
+            elapsed = time.perf_counter() - start
+            with lock:
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+                if r.status_code == 200:
+                    login_times.append(elapsed)
+
+    def catalog_client():
+        session = requests.Session()
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            session.get(f"{url}/api/products")
+            with lock:
+                catalog_times.append(time.perf_counter() - start)
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=login_client) for _ in range(concurrency)]
+    threads.append(threading.Thread(target=catalog_client))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(f"   Respuestas: {dict(sorted(statuses.items()))}")
+    print(f"   Logins OK/s: {len(login_times) / duration:.1f}")
+    print(f"   Login    p50={percentile(login_times, 50) * 1000:.0f}ms  p95={percentile(login_times, 95) * 1000:.0f}ms")
+    print(f"   Catalogo p50={percentile(catalog_times, 50) * 1000:.0f}ms  p95={percentile(catalog_times, 95) * 1000:.0f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de hash de contraseñas y login.')
+    parser.add_argument('--methods', nargs='+', default=DEFAULT_METHODS, help='Esquemas a comparar')
+    parser.add_argument('--rounds', type=int, default=5, help='Verificaciones por esquema')
+    parser.add_argument('--hashes-only', action='store_true', help='Solo medir los esquemas, sin API')
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--email')
+    parser.add_argument('--password')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=int, default=20, help='Segundos')
+    args = parser.parse_args()
+
+    bench_hashes(args.methods, args.rounds)
+
+    if args.hashes_only:
+        return
+    if not args.email or not args.password:
+        parser.error('--email y --password son requeridos para medir el login (o usar --hashes-only)')
+    bench_login(args.url.rstrip('/'), args.email, args.password, args.concurrency, args.duration)
+
+
+if __name__ == '__main__':
+    main()
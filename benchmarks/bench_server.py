@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark del perfil de gunicorn.
+
+Levanta la API con cada perfil y mide el catalogo publico bajo carga
+concurrente, opcionalmente con logins en paralelo (el caso en que un
+request lento bloquea a los demas):
+
+  - sync-1: como antes (1 worker sync, 1 request a la vez)
+  - tuned:  gunicorn.conf.py (workers gthread segun CPU/memoria, preload)
+
+Usa la base configurada en el entorno (DATABASE_URL / DB_*), con el esquema
+migrado. El rate limiting se desactiva en el servidor del benchmark.
+
+Ejecutar desde la raiz del repo:
+
+    python benchmarks/bench_server.py
+    python benchmarks/bench_server.py --email admin@x.com --password secreto --login-clients 2
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.common import percentile
+
+PROFILES = {
+    'sync-1': {'WEB_CONCURRENCY': '1', 'GUNICORN_THREADS': '1', 'GUNICORN_WORKER_CLASS': 'sync'},
+    'tuned':  {},
+}
+
+
+def start_server(profile, port):
+    env = {**os.environ, **PROFILES[profile], 'PORT': str(port), 'RATE_LIMIT_ENABLED': 'false'}
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'app:create_app()'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn termino al arrancar:\n{process.stderr.read()[-2000:]}')
+        try:
+            if requests.get(f'{url}/health', timeout=1).status_code == 200:
+                return process, url
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn no respondio en 30s')
+
+
+def run_load(url, clients, login_clients, email, password, duration):
+    stop = time.monotonic() + duration
+    catalog_times, errors = [], [0]
+    lock = threading.Lock()
+
+    def catalog_client():
+        session = requests.Session()
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            try:
+                ok = session.get(f'{url}/api/products', params={'page': random.randint(1, 5)}, timeout=30).ok
+            except requests.RequestException:
+                ok = False
+            with lock:
+                if ok:
+                    catalog_times.append(time.perf_counter() - start)
+                else:
+                    errors[0] += 1
+
+    def login_client():
+        session = requests.Session()
+        while time.monotonic() < stop:
+            session.post(f'{url}/api/auth/login', json={'email': email, 'password': password}, timeout=30)
+
+    threads = [threading.Thread(target=catalog_client) for _ in range(clients)]
+    if email and password:
+        threads += [threading.Thread(target=login_client) for _ in range(login_clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return catalog_times, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Comparar perfiles de gunicorn.')
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument('--clients', type=int, default=16, help='Clientes concurrentes del catalogo')
+    parser.add_argument('--login-clients', type=int, default=0, help='Clientes haciendo login en paralelo')
+    parser.add_argument('--email')
+    parser.add_argument('--password')
+    parser.add_argument('--duration', type=int, default=15, help='Segundos por perfil')
+    parser.add_argument('--port', type=int, default=5055)
+    args = parser.parse_args()
+
+    print(f"{'perfil':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errores':>10}")
+    for profile in args.profiles:
+        process, url = start_server(profile, args.port)
+        try:
+            requests.get(f'{url}/api/products', timeout=30)  # calentar
+            times, errors = run_load(url, args.clients, args.login_clients, args.email, args.password, args.duration)
+        finally:
+            process.terminate()
+            process.wait(timeout=40)
+        print(
+            f"{profile:<10}{len(times) / args.duration:>10.1f}"
+            f"{percentile(times, 50) * 1000:>10.0f}{percentile(times, 95) * 1000:>10.0f}"
+            f"{percentile(times, 99) * 1000:>10.0f}{errors:>10}"
+        )
+
+
+if __name__ == '__main__':
+    main()
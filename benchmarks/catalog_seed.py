@@ -0,0 +1,279 @@
+import bisect
+import csv
+import io
+import json
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.database import db
+from app.repositories.audit_partition_repository import AuditPartitionRepository
+from app.utils.errors import AppError
+from app.utils.file import build_variant_urls
+
+
+# Fecha de referencia fija: con la misma semilla se generan exactamente los mismos datos
+DEFAULT_ANCHOR = datetime(2025, 1, 1)
+
+CATEGORY_NAMES = [
+    'Porcelanatos', 'Cerámicas', 'Pisos laminados', 'Pisos vinílicos', 'Mármoles', 'Pisos de madera',
+    'Piedras naturales', 'Revestimientos de pared', 'Exteriores', 'Baños', 'Cocinas', 'Mosaicos',
+    'Gran formato', 'Zócalos', 'Adhesivos', 'Fraguas', 'Perfiles', 'Decks', 'Cementicios', 'Terrazos',
+    'Hidráulicos', 'Piscinas', 'Fachadas', 'Escaleras', 'Outlet',
+]
+TAG_NAMES = [
+    'Antideslizante', 'Alto tránsito', 'Rectificado', 'Mate', 'Brillante', 'Satinado', 'Imitación madera',
+    'Imitación mármol', 'Resistente al agua', 'Interior', 'Exterior', 'Oferta', 'Nuevo', 'Importado',
+    'Nacional', 'Ecológico', 'Resistente a heladas', 'Uso comercial', 'Uso residencial', 'Bajo mantenimiento',
+    'Rústico', 'Minimalista', 'Clásico', 'Tonos cálidos', 'Tonos fríos', 'Click', 'Pegado', 'Calefacción radiante',
+]
+PROVIDER_PREFIXES = ['Cerámicas', 'Revestimientos', 'Pisos', 'Distribuidora', 'Importadora', 'Grupo', 'Industrias']
+PROVIDER_SUFFIXES = ['del Norte', 'del Sur', 'Andina', 'del Pacífico', 'San Martín', 'La Esperanza', 'Santa Rosa',
+                     'Los Álamos', 'Central', 'del Valle', 'Mediterránea', 'Atlántica']
+
+MATERIALS = ['Porcelanato', 'Cerámica', 'Laminado', 'Vinílico', 'Mármol', 'Madera', 'Granito', 'Cemento', 'Terrazo']
+STYLES = ['Calacatta', 'Travertino', 'Cementicio', 'Hidráulico', 'Rústico', 'Nórdico', 'Industrial', 'Provenzal',
+          'Mediterráneo', 'Clásico', 'Moderno', 'Veteado', 'Pizarra', 'Roble', 'Nogal']
+COLORS = ['Blanco', 'Gris', 'Beige', 'Arena', 'Grafito', 'Negro', 'Marfil', 'Miel', 'Cedro', 'Humo', 'Perla', 'Terracota']
+FORMATS = ['60x60', '60x120', '45x45', '30x60', '20x120', '80x80', '15x90', '33x33', '120x120']
+USES = ['Ideal para cocinas y baños', 'Apto para exteriores y terrazas', 'Recomendado para áreas de alto tránsito',
+        'Perfecto para salas y dormitorios', 'Pensado para locales comerciales', 'Resiste el uso en piscinas']
+DETAILS = ['Acabado {finish}.', 'Resistente a manchas y humedad.', 'Fácil instalación y mantenimiento.',
+           'Incluye garantía de 10 años.', 'Bordes rectificados para juntas mínimas.', 'Baja absorción de agua.',
+           'Tono uniforme entre lotes.']
+FINISHES = ['mate', 'brillante', 'satinado', 'pulido', 'rústico', 'antideslizante']
+
+BATCH_SIZE = 20_000
+
+
+class ZipfSampler:
+    """Indices 0..n-1 con probabilidad proporcional a 1 / (rango ^ s): pocos muy populares, una cola larga."""
+
+    def __init__(self, n, s, rng):
+        self.rng = rng
+        weights = [1 / (rank ** s) for rank in range(1, n + 1)]
+        total = sum(weights)
+        self.cumulative = []
+        acc = 0.0
+        for weight in weights:
+            acc += weight / total
+            self.cumulative.append(acc)
+
+    def one(self):
+        return min(bisect.bisect_left(self.cumulative, self.rng.random()), len(self.cumulative) - 1)
+
+    def distinct(self, k):
+        """k indices distintos (como mucho n)."""
+        chosen = set()
+        k = min(k, len(self.cumulative))
+        while len(chosen) < k:
+            chosen.add(self.one())
+        return sorted(chosen)
+
+
+def _names(base, count):
+    """Los nombres de la lista y, si faltan, variantes numeradas (las columnas son UNIQUE)."""
+    names = list(base[:count])
+    round_number = 2
+    while len(names) < count:
+        names.extend(f'{name} {round_number}' for name in base[:count - len(names)])
+        round_number += 1
+    return names
+
+
+class _CopyBuffer:
+    """Acumula filas en CSV y las envia con COPY ... FROM STDIN al llenarse."""
+
+    def __init__(self, cursor, table, columns):
+        self.cursor = cursor
+        self.table = table
+        self.sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.pending = 0
+        self.total = 0
+
+    def add(self, row):
+        self.writer.writerow(row)
+        self.pending += 1
+        self.total += 1
+
+    def flush(self):
+        if not self.pending:
+            return
+        self.buffer.seek(0)
+        self.cursor.copy_expert(self.sql, self.buffer)
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.pending = 0
+
+
+class CatalogSeedService:
+    """
+    Catalogo sintetico para pruebas de carga y escala (solo PostgreSQL).
+
+    Todo sale de random.Random(seed) y de una fecha de referencia fija:
+    misma semilla, mismos datos. Las filas se cargan con COPY en lotes
+    dentro de una sola transaccion, asi 100k productos tardan segundos.
+    """
+
+    @staticmethod
+    def reset():
+        """Vacia todas las tablas de la app (no toca schema_migrations)."""
+        tables = ', '.join(t.name for t in db.metadata.sorted_tables)
+        with db.engine.begin() as conn:
+            conn.execute(text(f'TRUNCATE {tables} RESTART IDENTITY CASCADE'))
+
+    @staticmethod
+    def generate(products, seed=42, categories=25, tags=28, providers=30, admins=3,
+                 zipf_s=1.1, anchor=DEFAULT_ANCHOR, log=print):
+        """
+        Genera en una base sin productos:
+
+          - categorias, etiquetas y proveedores con popularidad Zipf (exponente zipf_s)
+          - products con nombres y descripciones en español, precios log-normales
+            y altas repartidas en los dos años anteriores a anchor
+          - 1 a 5 ProductImage por producto con URLs y variantes de Cloudinary falsas
+          - bitacora: alta y ediciones de precio de cada producto, y logins
+
+        Retorna ({tabla: filas}, segundos).
+        """
+        rng = random.Random(seed)
+        started = time.perf_counter()
+
+        category_zipf = ZipfSampler(categories, zipf_s, rng)
+        tag_zipf = ZipfSampler(tags, zipf_s, rng)
+        provider_zipf = ZipfSampler(providers, zipf_s, rng)
+        material_zipf = ZipfSampler(len(MATERIALS), zipf_s, rng)
+
+        # Variantes: se arman una vez con un public_id marcador y se reemplaza por imagen
+        variant_template = json.dumps(
+            build_variant_urls('https://res.cloudinary.com/seed/image/upload/v1/pisos-kermy/__ID__.webp')
+        )
+        first_day = anchor - timedelta(days=730)
+        seconds_per_product = 730 * 86400 / max(products, 1)
+
+        with db.engine.begin() as conn:
+            if conn.execute(text('SELECT EXISTS (SELECT 1 FROM products)')).scalar():
+                raise AppError('La tabla products no esta vacia (usar --reset para vaciar la base antes)', 409)
+
+            if AuditPartitionRepository.is_partitioned(conn):
+                # La bitacora historica va a sus particiones mensuales, no a audit_logs_default
+                AuditPartitionRepository.ensure_partitions(conn, first_day.date().replace(day=1), anchor.date().replace(day=1))
+
+            admin_ids = conn.execute(text(
+                'INSERT INTO admins (email, password_hash, name, is_active, created_at) '
+                "SELECT 'semilla' || i || '@pisoskermy.local', '!', 'Admin semilla ' || i, true, :created_at "
+                'FROM generate_series(1, :count) i RETURNING id'
+            ), {'count': admins, 'created_at': first_day}).scalars().all()
+
+            category_ids = CatalogSeedService._insert_names(conn, 'categories', _names(CATEGORY_NAMES, categories), first_day)
+            tag_ids = CatalogSeedService._insert_names(conn, 'tags', _names(TAG_NAMES, tags), first_day)
+            provider_names = [
+                f'{rng.choice(PROVIDER_PREFIXES)} {rng.choice(PROVIDER_SUFFIXES)} {suffix}'
+                for suffix in rng.choices(['S.A.', 'S.R.L.', 'Ltda.', 'e Hijos'], k=providers)
+            ]
+            provider_ids = CatalogSeedService._insert_names(conn, 'providers', provider_names, first_day)
+
+            first_id = conn.execute(text('SELECT COALESCE(max(id), 0) FROM products')).scalar() + 1
+            cursor = conn.connection.cursor()
+
+            product_rows = _CopyBuffer(cursor, 'products', ['id', 'name', 'description', 'price', 'created_at', 'updated_at'])
+            category_rows = _CopyBuffer(cursor, 'product_categories', ['product_id', 'category_id'])
+            tag_rows = _CopyBuffer(cursor, 'product_tags', ['product_id', 'tag_id'])
+            provider_rows = _CopyBuffer(cursor, 'product_providers', ['product_id', 'provider_id'])
+            image_rows = _CopyBuffer(
+                cursor, 'product_images', ['product_id', 'image_path', 'is_primary', 'display_order', 'variants', 'created_at']
+            )
+            audit_rows = _CopyBuffer(
+                cursor, 'audit_logs', ['admin_id', 'action', 'entity', 'entity_id', 'details', 'ip_address', 'created_at']
+            )
+            # Orden de envio: primero products, que el resto referencia
+            buffers = [product_rows, category_rows, tag_rows, provider_rows, image_rows, audit_rows]
+
+            for offset in range(products):
+                product_id = first_id + offset
+                created_at = first_day + timedelta(seconds=offset * seconds_per_product + rng.random() * 3600)
+                # Un solo str() por fecha: la misma se repite en imagenes y bitacora
+                created = updated = str(created_at)
+                material = MATERIALS[material_zipf.one()]
+                style, color, size = rng.choice(STYLES), rng.choice(COLORS), rng.choice(FORMATS)
+                name = f'{material} {style} {color} {size}'
+                description = (
+                    f'{material} {style.lower()} en tono {color.lower()}, formato {size} cm. {rng.choice(USES)}. '
+                    + ' '.join(d.format(finish=rng.choice(FINISHES)) for d in rng.sample(DETAILS, rng.randint(1, 3)))
+                )
+
+                for index in category_zipf.distinct(rng.choice((1, 1, 2, 2, 3))):
+                    category_rows.add([product_id, category_ids[index]])
+                for index in tag_zipf.distinct(rng.randint(1, 5)):
+                    tag_rows.add([product_id, tag_ids[index]])
+                for index in provider_zipf.distinct(rng.choice((1, 1, 1, 2))):
+                    provider_rows.add([product_id, provider_ids[index]])
+
+                images = rng.choice((1, 2, 2, 3, 3, 4, 5))
+                for position in range(images):
+                    public_id = f'semilla-{seed}-{product_id}-{position}'
+                    image_rows.add([
+                        product_id,
+                        f'https://res.cloudinary.com/seed/image/upload/v1/pisos-kermy/{public_id}.webp',
+                        't' if position == 0 else 'f',
+                        position,
+                        variant_template.replace('__ID__', public_id),
+                        created,
+                    ])
+
+                # Mismo formato de details que las rutas de productos
+                audit_rows.add([rng.choice(admin_ids), 'CREATE', 'product', product_id,
+                                json.dumps({'name': name, 'images_count': images}), '10.0.0.1', created])
+                price = round(math.exp(rng.gauss(3.3, 0.6)), 2)
+                edited_at = created_at
+                for _ in range(int(rng.expovariate(1.2))):
+                    edited_at += timedelta(hours=rng.uniform(1, 24 * 60))
+                    if edited_at >= anchor:
+                        break
+                    new_price = round(price * rng.uniform(0.85, 1.2), 2)
+                    details = {'name': name, 'changes': {'price': {'old': price, 'new': new_price}}, 'new_images_count': 0}
+                    audit_rows.add([rng.choice(admin_ids), 'UPDATE', 'product', product_id,
+                                    json.dumps(details), '10.0.0.1', edited_at])
+                    price, updated = new_price, str(edited_at)
+
+                product_rows.add([product_id, name, description, f'{price:.2f}', created, updated])
+
+                if product_rows.pending >= BATCH_SIZE:
+                    for buffer in buffers:
+                        buffer.flush()
+                    log(f'  {offset + 1}/{products} productos')
+
+            # Logins de los admins repartidos en el periodo
+            for admin_id in admin_ids:
+                for _ in range(max(10, products // 1000)):
+                    login_at = first_day + timedelta(seconds=rng.random() * 730 * 86400)
+                    audit_rows.add([admin_id, 'LOGIN', None, None, None, '10.0.0.1', login_at])
+
+            for buffer in buffers:
+                buffer.flush()
+
+            conn.execute(text(
+                'UPDATE products p SET primary_image_id = i.id, image_path = i.image_path '
+                'FROM product_images i WHERE i.product_id = p.id AND i.is_primary AND p.id >= :first_id'
+            ), {'first_id': first_id})
+            # Los ids de products se asignaron a mano: la secuencia sigue desde el maximo
+            conn.execute(text("SELECT setval(pg_get_serial_sequence('products', 'id'), (SELECT max(id) FROM products))"))
+
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.execute(text('ANALYZE'))
+
+        counts = {'admins': len(admin_ids), 'categories': len(category_ids), 'tags': len(tag_ids),
+                  'providers': len(provider_ids)}
+        counts.update((buffer.table, buffer.total) for buffer in buffers)
+        return counts, time.perf_counter() - started
+
+    @staticmethod
+    def _insert_names(conn, table, names, created_at):
+        return conn.execute(text(
+            f'INSERT INTO {table} (name, created_at, updated_at) '
+            'SELECT name, :created_at, :created_at FROM unnest(CAST(:names AS text[])) WITH ORDINALITY AS t(name, ord) '
+            'ORDER BY ord RETURNING id'
+        ), {'names': names, 'created_at': created_at}).scalars().all()
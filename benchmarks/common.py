@@ -0,0 +1,9 @@
+"""Utilidades compartidas por los scripts de benchmarks/."""
+
+
+def percentile(values, pct):
+    """Percentil pct (0-100) por rango mas cercano; 0.0 si no hay valores."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
@@ -0,0 +1,45 @@
+"""
+Backend de imagenes falso para benchmarks y pruebas de carga: reemplaza las
+llamadas a Cloudinary por respuestas locales con la misma forma, opcionalmente
+con una latencia simulada. Las imagenes se siguen procesando con Pillow
+(ese costo es real y queda medido).
+"""
+import itertools
+import os
+import threading
+import time
+import cloudinary
+import cloudinary.uploader
+
+# build_variant_urls necesita un cloud_name para armar las URLs
+os.environ.setdefault('CLOUDINARY_CLOUD_NAME', 'bench')
+
+_counter = itertools.count(1)
+_lock = threading.Lock()
+
+
+def install(latency_ms=0):
+    """Parchea cloudinary.uploader en este proceso. latency_ms simula la ida y vuelta a Cloudinary."""
+    delay = latency_ms / 1000
+
+    def upload(file, **options):
+        data = file.read()
+        if delay:
+            time.sleep(delay)
+        with _lock:
+            number = next(_counter)
+        folder = options.get('folder', 'pisos-kermy')
+        return {
+            'public_id':  f'{folder}/bench-{os.getpid()}-{number}',
+            'secure_url': f'https://res.cloudinary.com/bench/image/upload/v1/{folder}/bench-{os.getpid()}-{number}.webp',
+            'bytes':      len(data),
+            'format':     options.get('format', 'webp'),
+        }
+
+    def destroy(public_id, **options):
+        if delay:
+            time.sleep(delay)
+        return {'result': 'ok'}
+
+    cloudinary.uploader.upload = upload
+    cloudinary.uploader.destroy = destroy
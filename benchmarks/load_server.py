@@ -0,0 +1,16 @@
+"""
+Entrada de gunicorn para benchmarks/load_test.py: la app real con el perfil
+de gunicorn.conf.py, pero con Cloudinary reemplazado por el backend falso
+(FAKE_CLOUDINARY_LATENCY_MS simula la ida y vuelta). Con preload_app el
+parche se aplica en el maestro y los workers lo heredan.
+
+    gunicorn -c gunicorn.conf.py benchmarks.load_server:app
+"""
+import os
+from benchmarks import fake_cloudinary
+
+fake_cloudinary.install(float(os.environ.get('FAKE_CLOUDINARY_LATENCY_MS', '0')))
+
+from app import create_app
+
+app = create_app()
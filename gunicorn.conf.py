@@ -0,0 +1,178 @@
+"""
+Perfil de produccion de gunicorn. Se carga solo al ejecutar `gunicorn` desde
+la raiz del repo:
+
+    gunicorn 'app:create_app()'
+
+Workers gthread: cada worker atiende GUNICORN_THREADS requests a la vez, asi
+una subida a Cloudinary o un login (pbkdf2 libera el GIL) no bloquean el
+catalogo. La cantidad de workers sale de los CPUs y la memoria disponibles
+(respetando los limites del contenedor); WEB_CONCURRENCY la fija a mano.
+
+La app se carga una vez en el proceso maestro (preload_app) y los workers la
+heredan por fork: arrancan mas rapido y comparten memoria. Las conexiones a
+la base abiertas en el maestro se descartan en cada worker (post_fork).
+"""
+import glob
+import math
+import os
+import tempfile
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _cgroup_cpus():
+    """CPUs asignados al contenedor (cgroup v2 / v1), o None si no hay limite."""
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+        if quota != 'max':
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _memory_limit_mb():
+    """Memoria disponible para el contenedor en MB, o None si no se puede leer."""
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                raw = f.read().strip()
+        except OSError:
+            continue
+        # cgroup v1 reporta un numero enorme cuando no hay limite
+        if raw != 'max' and int(raw) < 1 << 60:
+            return int(raw) // (1024 * 1024)
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // (1024 * 1024)
+    except (ValueError, OSError):
+        return None
+
+
+def available_cpus():
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+    quota = _cgroup_cpus()
+    return max(1, math.ceil(min(cpus, quota) if quota else cpus))
+
+
+def connections_per_worker():
+    """
+    Conexiones que puede abrir un worker contra cada servidor (primario y, si hay,
+    replica): DB_POOL_SIZE + DB_MAX_OVERFLOW del engine sincrono, que comparten los
+    requests, el hilo de la bitacora y el chequeo de version del cache de admins.
+    Con UvicornWorker se suma el pool asyncpg del catalogo (mismo perfil).
+    No importa app.utils.db_pool: importar la app aca crearia las metricas antes
+    de definir PROMETHEUS_MULTIPROC_DIR.
+    """
+    per_pool = _env_int('DB_POOL_SIZE', 5) + _env_int('DB_MAX_OVERFLOW', 5)
+    asgi = 'uvicorn' in os.environ.get('GUNICORN_WORKER_CLASS', 'gthread').lower()
+    return per_pool * (2 if asgi else 1)
+
+
+def default_workers():
+    """
+    2 x CPU + 1, acotado por la memoria (cada worker es un proceso con la app
+    completa) y, con DB_MAX_CONNECTIONS, por las conexiones que la base acepta.
+    """
+    by_cpu = 2 * available_cpus() + 1
+    limits = [by_cpu]
+    memory_mb = _memory_limit_mb()
+    if memory_mb is not None:
+        limits.append(memory_mb // _env_int('GUNICORN_WORKER_MEMORY_MB', 150))
+    max_connections = _env_int('DB_MAX_CONNECTIONS', 0)
+    if max_connections:
+        limits.append(max_connections // connections_per_worker())
+    return max(1, min(limits))
+
+
+# --- Red -------------------------------------------------------------------
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+keepalive = 5
+
+# --- Workers ---------------------------------------------------------------
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = _env_int('WEB_CONCURRENCY', default_workers())
+threads = _env_int('GUNICORN_THREADS', 4)
+
+# Reciclar workers cada ~1000 requests (con jitter para que no reinicien todos juntos)
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+# --- Tiempos ---------------------------------------------------------------
+timeout = _env_int('GUNICORN_TIMEOUT', 30)                    # worker colgado -> se reinicia
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)  # requests en curso al reiniciar/apagar
+
+# Heartbeat en memoria: en Docker /tmp puede estar en disco y frenar a los workers
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# --- Carga de la app -------------------------------------------------------
+preload_app = True
+
+# --- Metricas --------------------------------------------------------------
+# Cada worker escribe sus metricas en este directorio y /metrics las suma
+# (prometheus_client en modo multiproceso). Se define antes de cargar la app
+# y se vacia al arrancar: los valores de una corrida anterior no deben sumarse.
+if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = os.path.join(
+        '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'pisos-kermy-metrics'
+    )
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+for stale in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], '*.db')):
+    os.remove(stale)
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+
+def when_ready(server):
+    from prometheus_client import multiprocess
+
+    # El maestro uso el pool al cargar la app (preload): sus gauges no deben sumar
+    multiprocess.mark_process_dead(os.getpid())
+    server.log.info(
+        f"Perfil: {workers} workers {worker_class} x {threads} hilos, "
+        f"max_requests={max_requests}±{max_requests_jitter}"
+    )
+
+    connections = workers * connections_per_worker()
+    max_connections = _env_int('DB_MAX_CONNECTIONS', 0)
+    server.log.info(f"Conexiones a la base: hasta {connections} por servidor ({workers} x {connections_per_worker()})")
+    if max_connections and connections > max_connections:
+        server.log.warning(
+            f"{connections} conexiones posibles superan DB_MAX_CONNECTIONS={max_connections}: "
+            f"bajar WEB_CONCURRENCY o DB_POOL_SIZE/DB_MAX_OVERFLOW"
+        )
+    elif not max_connections:
+        server.log.warning("DB_MAX_CONNECTIONS no definido: no se verifica el limite de conexiones de la base")
+
+
+def post_fork(server, worker):
+    """Los sockets del pool abiertos en el maestro no se comparten entre procesos."""
+    from app.database import db
+
+    app = worker.app.wsgi()
+    # Con asgi:app (UvicornWorker) la app Flask va montada dentro de Starlette
+    flask_app = getattr(getattr(app, 'state', None), 'flask_app', app)
+    with flask_app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def child_exit(server, worker):
+    """Los gauges 'live' de un worker que termino dejan de sumar en /metrics."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Migraciones de esquema (ver app/migrations).
+
+Ejecutar desde la raiz del repo:
+
+    python migrate.py upgrade              # aplica las revisiones pendientes
+    python migrate.py upgrade --to 0003    # aplica hasta esa revision
+    python migrate.py status               # lista revisiones y cuales estan aplicadas
+    python migrate.py stamp 0001           # marca como aplicadas sin ejecutarlas
+    python migrate.py new "indices de productos"   # crea el archivo de la siguiente revision
+
+Correr `upgrade` antes de levantar la API en cada deploy: la API no arranca
+si la base no esta en la ultima revision (SCHEMA_CHECK=strict).
+"""
+import argparse
+import re
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# La verificacion de arranque no aplica aca: este script es el que migra.
+# Y las migraciones largas no deben cortarse por el statement_timeout de la API.
+os.environ['SCHEMA_CHECK'] = 'off'
+os.environ.setdefault('DB_STATEMENT_TIMEOUT_MS', '0')
+
+from app import create_app
+from app.database import db
+from app import migrations
+
+
+TEMPLATE = '''"""
+{description}
+"""
+from sqlalchemy import text
+
+revision = '{revision}'
+description = '{description}'
+transactional = True
+
+
+def upgrade(conn):
+    conn.execute(text(''))
+'''
+
+
+def cmd_upgrade(args):
+    count = migrations.upgrade(db.engine, target=args.to)
+    if count:
+        print(f"🎉 {count} revisiones aplicadas.")
+    else:
+        print("La base ya está al día.")
+
+
+def cmd_status(args):
+    for revision, description, applied in migrations.status(db.engine):
+        mark = '✅' if applied else '⏳'
+        print(f"{mark} {revision} {description}")
+
+
+def cmd_stamp(args):
+    migrations.stamp(db.engine, args.version)
+    print(f"Revisiones hasta {args.version} marcadas como aplicadas.")
+
+
+def cmd_new(args):
+    head = migrations.head_revision()
+    revision = f'{int(head or 0) + 1:04d}'
+    slug = re.sub(r'[^a-z0-9]+', '_', args.description.lower()).strip('_')
+    path = os.path.join(os.path.dirname(migrations.__file__), 'versions', f'{revision}_{slug}.py')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(TEMPLATE.format(revision=revision, description=args.description))
+    print(f"Creada {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Migraciones de esquema versionadas.')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('upgrade', help='Aplicar revisiones pendientes')
+    p.add_argument('--to', help='Revision hasta la que aplicar (inclusive)')
+    p.set_defaults(func=cmd_upgrade)
+
+    sub.add_parser('status', help='Ver revisiones aplicadas y pendientes').set_defaults(func=cmd_status)
+
+    p = sub.add_parser('stamp', help='Marcar revisiones como aplicadas sin ejecutarlas')
+    p.add_argument('version')
+    p.set_defaults(func=cmd_stamp)
+
+    p = sub.add_parser('new', help='Crear el archivo de una nueva revision')
+    p.add_argument('description')
+    p.set_defaults(func=cmd_new)
+
+    args = parser.parse_args()
+    if args.command == 'new':
+        args.func(args)
+        return
+
+    app = create_app()
+    with app.app_context():
+        args.func(args)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        sys.exit(1)
@@ -1,112 +1,195 @@
 """
 Script de migración para agregar soporte de múltiples imágenes por producto.
 
-Pasos:
-1. Crea tabla product_images
-2. Migra imágenes existentes de product.image_path a product_images
-3. Marca imágenes migradas como principales
+Migra las imágenes legacy de product.image_path a la tabla product_images:
+- Lee los productos en streaming (yield_per), sin cargarlos todos en memoria
+- Inserta las ProductImage de cada lote con un INSERT multi-fila
+- Apunta products.primary_image_id a la imagen migrada
+- Hace commit por lote y guarda un checkpoint (último product_id migrado)
+- Reporta throughput y tiempo estimado restante
 
-Ejecutar: python migrate_product_images.py
+Es seguro re-ejecutarlo: continúa desde el checkpoint y además salta los
+productos que ya tienen imágenes en product_images.
+
+Ejecutar:
+    python migrate_product_images.py                  # migrar
+    python migrate_product_images.py --dry-run        # solo contar y simular, sin escribir
+    python migrate_product_images.py --batch-size 200 # lotes más chicos (transacciones más cortas)
+    python migrate_product_images.py --reset          # ignorar el checkpoint y empezar de cero
 """
 
+import argparse
+import json
 import sys
 import os
+import time
+from datetime import datetime
 
 # Agregar path para imports
 sys.path.insert(0, os.path.dirname(__file__))
 
+# Tareas de mantenimiento largas: sin el statement_timeout de la API (salvo que se pida explicitamente)
+os.environ.setdefault('DB_STATEMENT_TIMEOUT_MS', '0')
+
+from sqlalchemy import exists, func, insert, select, update
 from app import create_app
 from app.database import db
 from app.models.product import Product
+from app.models.product_image import ProductImage
+from app.utils.file import build_variant_urls
+
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.migrate_product_images.checkpoint')
+
+
+def load_checkpoint(path):
+    """Retorna el último product_id migrado (0 si no hay checkpoint)."""
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return json.load(f).get('last_product_id', 0)
+
+
+def save_checkpoint(path, last_product_id, migrated):
+    """Escribe el checkpoint de forma atómica (archivo temporal + rename)."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'last_product_id': last_product_id,
+            'migrated': migrated,
+            'updated_at': datetime.utcnow().isoformat(),
+        }, f)
+    os.replace(tmp_path, path)
+
+
+def pending_products_query(after_id):
+    """Productos con imagen legacy, sin filas en product_images, posteriores al checkpoint."""
+    has_images = exists().where(ProductImage.product_id == Product.id)
+    return (
+        select(Product.id, Product.image_path)
+        .where(Product.image_path.isnot(None))
+        .where(Product.id > after_id)
+        .where(~has_images)
+        .order_by(Product.id)
+    )
+
+
+def migrate_batch(rows):
+    """Inserta las imágenes del lote y apunta cada producto a su imagen principal."""
+    now = datetime.utcnow()
+    image_rows = [
+        {
+            'product_id':    row.id,
+            'image_path':    row.image_path,
+            'variants':      build_variant_urls(row.image_path),
+            'is_primary':    True,  # Marcar como principal
+            'display_order': 0,
+            'created_at':    now,
+        }
+        for row in rows
+    ]
+
+    inserted = db.session.execute(
+        insert(ProductImage).returning(ProductImage.id, ProductImage.product_id),
+        image_rows,
+    ).all()
+
+    # UPDATE masivo por clave primaria (una sentencia executemany)
+    db.session.execute(
+        update(Product),
+        [{'id': product_id, 'primary_image_id': image_id} for image_id, product_id in inserted],
+    )
+
+
+def format_eta(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours:d}h{minutes:02d}m{seconds:02d}s' if hours else f'{minutes:d}m{seconds:02d}s'
+
 
-def migrate_product_images():
-    """Migrar imágenes existentes a la nueva tabla"""
+def migrate_product_images(batch_size, dry_run, checkpoint_path, reset):
+    """Migrar imágenes existentes a la nueva tabla, por lotes."""
     app = create_app()
-    
+
     with app.app_context():
         print("🔄 Iniciando migración de imágenes de productos...")
-        
-        # 1. Crear tabla product_images si no existe
-        print("📊 Creando tabla product_images...")
-        try:
-            db.create_all()
-            print("✅ Tabla product_images creada/verificada")
-        except Exception as e:
-            print(f"❌ Error creando tabla: {e}")
-            return
-        
-        # Importar ProductImage después de crear la tabla
-        try:
-            from app.models.product_image import ProductImage
-        except ImportError as e:
-            print(f"❌ Error importando ProductImage: {e}")
-            print("   Asegúrate de que product_image.py está en app/models/")
-            return
-        
-        # 2. Migrar imágenes existentes
-        try:
-            products_with_images = Product.query.filter(Product.image_path.isnot(None)).all()
-        except Exception as e:
-            print(f"❌ Error consultando productos: {e}")
-            return
-        
-        if not products_with_images:
+
+        if reset and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        after_id = load_checkpoint(checkpoint_path)
+        if after_id:
+            print(f"↪️  Continuando desde el checkpoint: product_id > {after_id}")
+
+        query = pending_products_query(after_id)
+        total = db.session.execute(select(func.count()).select_from(query.subquery())).scalar()
+
+        if not total:
             print("ℹ️  No hay productos con imágenes para migrar")
             return
-        
-        print(f"📦 Encontrados {len(products_with_images)} productos con imágenes")
-        
-        migrated_count = 0
-        skipped_count = 0
-        error_count = 0
-        
-        for product in products_with_images:
-            try:
-                # Verificar si ya tiene imágenes en la nueva tabla
-                existing_images = ProductImage.query.filter_by(product_id=product.id).count()
-                
-                if existing_images > 0:
-                    print(f"⏭️  Producto {product.id} ({product.name}) ya tiene imágenes migradas, saltando...")
-                    skipped_count += 1
-                    continue
-                
-                # Crear ProductImage desde image_path legacy
-                product_image = ProductImage(
-                    product_id=product.id,
-                    image_path=product.image_path,
-                    is_primary=True,  # Marcar como principal
-                    display_order=0
+
+        print(f"📦 Encontrados {total} productos con imágenes (lotes de {batch_size})")
+        if dry_run:
+            print("🧪 DRY RUN: no se escribirá nada en la base de datos")
+
+        migrated = 0
+        started = time.monotonic()
+
+        # Conexión dedicada para leer en streaming (cursor del lado del servidor).
+        # Las escrituras van por db.session, con commit por lote, así ninguna
+        # transacción de escritura queda abierta más que un lote.
+        with db.engine.connect() as stream_conn:
+            result = stream_conn.execution_options(yield_per=batch_size).execute(query)
+
+            for rows in result.partitions():
+                try:
+                    migrate_batch(rows)
+                    if dry_run:
+                        db.session.rollback()
+                    else:
+                        db.session.commit()
+                        save_checkpoint(checkpoint_path, rows[-1].id, migrated + len(rows))
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"❌ Error en el lote que termina en el producto {rows[-1].id}: {e}")
+                    print("   Re-ejecutar el script para continuar desde el último checkpoint.")
+                    raise
+
+                migrated += len(rows)
+                elapsed = time.monotonic() - started
+                rate = migrated / elapsed if elapsed else 0
+                eta = (total - migrated) / rate if rate else 0
+                print(
+                    f"✅ {migrated}/{total} productos "
+                    f"({rate:.0f} productos/s, ETA {format_eta(eta)}) "
+                    f"- último id {rows[-1].id}"
                 )
-                
-                db.session.add(product_image)
-                migrated_count += 1
-                print(f"✅ Migrado: Producto {product.id} ({product.name})")
-                
-            except Exception as e:
-                print(f"❌ Error migrando producto {product.id}: {e}")
-                error_count += 1
-                continue
-        
-        # Commit de todas las migraciones
-        try:
-            db.session.commit()
-            print(f"\n{'='*60}")
-            print(f"✅ Migración completada!")
-            print(f"📊 Productos migrados: {migrated_count}")
-            print(f"⏭️  Productos saltados (ya migrados): {skipped_count}")
-            if error_count > 0:
-                print(f"❌ Errores: {error_count}")
-            print(f"{'='*60}")
-            print("\n⚠️  NOTA: El campo 'image_path' en la tabla 'products' se mantiene")
-            print("   por compatibilidad pero ya NO se usa. Usar 'images' en su lugar.")
-        except Exception as e:
-            print(f"\n❌ Error al hacer commit: {e}")
-            db.session.rollback()
+
+        elapsed = time.monotonic() - started
+        print(f"\n{'='*60}")
+        print("✅ Migración simulada!" if dry_run else "✅ Migración completada!")
+        print(f"📊 Productos migrados: {migrated} en {elapsed:.1f}s")
+        print(f"{'='*60}")
+        print("\n⚠️  NOTA: El campo 'image_path' en la tabla 'products' se mantiene")
+        print("   por compatibilidad pero ya NO se usa. Usar 'images' en su lugar.")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Migrar product.image_path a product_images por lotes.')
+    parser.add_argument('--batch-size', type=int, default=500, help='Productos por lote/commit (default: 500)')
+    parser.add_argument('--dry-run', action='store_true', help='Simular sin escribir ni mover el checkpoint')
+    parser.add_argument('--checkpoint-file', default=DEFAULT_CHECKPOINT, help='Archivo de checkpoint')
+    parser.add_argument('--reset', action='store_true', help='Ignorar el checkpoint y empezar de cero')
+    args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error('--batch-size debe ser mayor que 0')
+    return args
+
 
 if __name__ == '__main__':
+    args = parse_args()
     try:
-        migrate_product_images()
+        migrate_product_images(args.batch_size, args.dry_run, args.checkpoint_file, args.reset)
     except Exception as e:
         print(f"\n❌ Error fatal: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Genera un catálogo sintético para pruebas de carga y escala (solo PostgreSQL).
+
+Crea N productos con nombres y descripciones en español, categorías, etiquetas
+y proveedores con popularidad Zipf, varias imágenes por producto (URLs falsas,
+no sube nada a Cloudinary) e historial en la bitácora. Misma semilla, mismos datos.
+
+Ejecutar desde la raiz del repo, NUNCA contra la base de producción:
+
+    python seed_catalog.py --products 100000
+    python seed_catalog.py --products 5000 --seed 7 --reset --yes   # vacía la base antes
+"""
+import argparse
+import sys, os
+from datetime import datetime
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Carga masiva: sin el statement_timeout de la API (salvo que se pida explicitamente)
+os.environ.setdefault('DB_STATEMENT_TIMEOUT_MS', '0')
+
+from app import create_app
+from benchmarks.catalog_seed import CatalogSeedService, DEFAULT_ANCHOR
+from app.utils.errors import AppError
+
+
+def main(args):
+    app = create_app()
+    with app.app_context():
+        if args.reset:
+            if not args.yes:
+                answer = input("⚠️  Se van a BORRAR todas las tablas de la base configurada. ¿Continuar? (s/N): ")
+                if answer.strip().lower() != 's':
+                    print("Abortando.")
+                    return 1
+            CatalogSeedService.reset()
+            print("🗑️  Base vaciada.")
+
+        print(f"🌱 Generando {args.products} productos (semilla {args.seed})...")
+        try:
+            counts, seconds = CatalogSeedService.generate(
+                args.products,
+                seed=args.seed,
+                categories=args.categories,
+                tags=args.tags,
+                providers=args.providers,
+                admins=args.admins,
+                zipf_s=args.zipf,
+                anchor=args.anchor_date,
+            )
+        except AppError as e:
+            print(f"❌ {e.message}")
+            return 1
+
+    print(f"✅ Catálogo generado en {seconds:.1f}s:")
+    for table, rows in counts.items():
+        print(f"   {table:<20} {rows}")
+    return 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generar un catálogo sintético determinista.')
+    parser.add_argument('--products', type=int, required=True, help='Cantidad de productos')
+    parser.add_argument('--seed', type=int, default=42, help='Semilla (misma semilla, mismos datos)')
+    parser.add_argument('--categories', type=int, default=25)
+    parser.add_argument('--tags', type=int, default=28)
+    parser.add_argument('--providers', type=int, default=30)
+    parser.add_argument('--admins', type=int, default=3, help='Admins que firman la bitácora (sin contraseña usable)')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Exponente Zipf de la popularidad (0 = uniforme)')
+    parser.add_argument('--anchor-date', type=datetime.fromisoformat, default=DEFAULT_ANCHOR,
+                        help='Fecha de referencia: las altas cubren los dos años anteriores (default 2025-01-01)')
+    parser.add_argument('--reset', action='store_true', help='Vaciar todas las tablas antes de generar')
+    parser.add_argument('--yes', action='store_true', help='No pedir confirmación para --reset')
+    args = parser.parse_args()
+    if min(args.products, args.categories, args.tags, args.providers, args.admins) < 1:
+        parser.error('las cantidades deben ser mayores a 0')
+    sys.exit(main(args))
@@ -0,0 +1,38 @@
+"""
+Login con rehash de contraseñas (AdminService.authenticate). No usan la base:
+el repositorio y el hasher se reemplazan por objetos en memoria.
+"""
+from types import SimpleNamespace
+import pytest
+
+from app.repositories.admin_repository import AdminRepository
+from app.services.admin_service import AdminService
+from app.utils.errors import AppError
+from app.utils.passwords import password_hasher
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    admin = SimpleNamespace(id=1, email='admin@example.com', is_active=True, password_hash='viejo$hash')
+    saved = []
+    monkeypatch.setattr(AdminRepository, 'get_by_email', lambda email: admin)
+    monkeypatch.setattr(AdminRepository, 'set_password_hash', lambda a, h: saved.append(h))
+    monkeypatch.setattr(password_hasher, 'verify', lambda password_hash, password: True)
+    monkeypatch.setattr(password_hasher, 'needs_rehash', lambda password_hash: True)
+    admin.saved = saved
+    return admin
+
+
+def test_authenticate_rehashes_old_hash(admin, monkeypatch):
+    monkeypatch.setattr(password_hasher, 'hash', lambda password: 'nuevo$hash')
+    assert AdminService.authenticate(admin.email, 'secreta') is admin
+    assert admin.saved == ['nuevo$hash']
+
+
+def test_authenticate_keeps_old_hash_when_pool_is_full(admin, monkeypatch):
+    def saturated(password):
+        raise AppError('Demasiados inicios de sesión simultáneos', 503)
+
+    monkeypatch.setattr(password_hasher, 'hash', saturated)
+    assert AdminService.authenticate(admin.email, 'secreta') is admin
+    assert admin.saved == []
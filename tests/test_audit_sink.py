@@ -0,0 +1,93 @@
+"""
+Reinsercion de los respaldos en disco de la bitacora (AuditSink._replay_spill).
+No usan la base: _insert se reemplaza por una lista en memoria.
+"""
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+import pytest
+
+from app.utils.audit import AuditSink
+
+
+def entry(action):
+    return {'admin_id': None, 'action': action, 'entity': 'product', 'entity_id': 1,
+            'details': {'name': 'x'}, 'ip_address': '127.0.0.1', 'created_at': datetime(2025, 1, 1, 12, 0)}
+
+
+@pytest.fixture(scope='module')
+def dead_pid():
+    """PID de un proceso que ya termino."""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+@pytest.fixture
+def sink(tmp_path):
+    sink = AuditSink()
+    sink.spill_dir = str(tmp_path)
+    sink.inserted = []
+    sink._insert = lambda entries: sink.inserted.extend(entries)
+    return sink
+
+
+def write_spill(directory, pid, lines):
+    path = os.path.join(directory, f'audit-spill-{pid}.ndjson')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(line + '\n' for line in lines))
+    return path
+
+
+def encoded(action):
+    return json.dumps({**entry(action), 'created_at': entry(action)['created_at'].isoformat()})
+
+
+def test_spill_and_replay_round_trip(sink):
+    sink._spill([entry('CREATE'), entry('UPDATE')])
+    assert sink._spilled
+
+    sink._replay_spill()
+    assert [e['action'] for e in sink.inserted] == ['CREATE', 'UPDATE']
+    assert sink.inserted[0]['created_at'] == datetime(2025, 1, 1, 12, 0)
+    assert os.listdir(sink.spill_dir) == []
+
+
+def test_corrupt_spill_goes_to_quarantine(sink, dead_pid):
+    corrupt = write_spill(sink.spill_dir, dead_pid, [encoded('CREATE'), '{"action": "UPD'])
+    sink._replay_spill()
+
+    assert sink.inserted == []
+    assert not os.path.exists(corrupt)
+    quarantined = os.path.join(sink.spill_dir, 'quarantine', os.path.basename(corrupt))
+    with open(quarantined, encoding='utf-8') as f:
+        assert f.read().startswith(encoded('CREATE'))
+
+
+def test_corrupt_spill_does_not_stop_other_files(sink, dead_pid):
+    write_spill(sink.spill_dir, dead_pid, ['no es json'])
+    write_spill(sink.spill_dir, f'{dead_pid}-1', [encoded('DELETE')])
+    sink._replay_spill()
+    assert [e['action'] for e in sink.inserted] == ['DELETE']
+
+
+def test_live_worker_spill_is_not_claimed(sink):
+    live = write_spill(sink.spill_dir, os.getppid(), [encoded('CREATE')])
+    sink._replay_spill()
+    assert sink.inserted == []
+    assert os.path.exists(live)
+
+
+def test_failed_replay_keeps_the_file(sink, dead_pid):
+    def fail(entries):
+        raise RuntimeError('base caida')
+
+    write_spill(sink.spill_dir, dead_pid, [encoded('CREATE')])
+    sink._insert = fail
+    sink._replay_spill()
+
+    assert sink._spilled
+    [name] = os.listdir(sink.spill_dir)
+    assert name.startswith(f'audit-spill-{os.getpid()}-') and name.endswith('.ndjson')
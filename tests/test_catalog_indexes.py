@@ -0,0 +1,114 @@
+"""
+Verifica con EXPLAIN que las consultas del catalogo usan los indices de la
+revision 0006 sobre un conjunto de datos sembrado de tamaño realista.
+"""
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import selectinload
+from app.models import Product
+from app.repositories.product_repository import ProductRepository
+
+
+PRODUCTS = 20_000
+CATEGORIES = 100
+TAGS = 100
+PROVIDERS = 50
+
+SEED_SQL = [
+    f"INSERT INTO categories (name) SELECT 'Categoria ' || i FROM generate_series(1, {CATEGORIES}) i",
+    f"INSERT INTO tags (name) SELECT 'Etiqueta ' || i FROM generate_series(1, {TAGS}) i",
+    f"INSERT INTO providers (name) SELECT 'Proveedor ' || i FROM generate_series(1, {PROVIDERS}) i",
+    f"""
+    INSERT INTO products (name, price, created_at)
+    SELECT md5(i::text), (i % 500) + 10, now() - i * interval '1 minute'
+    FROM generate_series(1, {PRODUCTS}) i
+    """,
+    f"""
+    INSERT INTO product_categories (product_id, category_id)
+    SELECT i, (i % {CATEGORIES}) + 1 FROM generate_series(1, {PRODUCTS}) i
+    UNION
+    SELECT i, ((i * 7) % {CATEGORIES}) + 1 FROM generate_series(1, {PRODUCTS}) i
+    """,
+    f"""
+    INSERT INTO product_tags (product_id, tag_id)
+    SELECT i, ((i * 3) % {TAGS}) + 1 FROM generate_series(1, {PRODUCTS}) i
+    """,
+    f"""
+    INSERT INTO product_providers (product_id, provider_id)
+    SELECT i, (i % {PROVIDERS}) + 1 FROM generate_series(1, {PRODUCTS}) i
+    """,
+    f"""
+    INSERT INTO product_images (product_id, image_path, is_primary, display_order)
+    SELECT i, 'https://example.com/' || i || '-' || n || '.webp', n = 0, n
+    FROM generate_series(1, {PRODUCTS}) i, generate_series(0, 2) n
+    """,
+    'ANALYZE',
+]
+
+
+@pytest.fixture(scope='module')
+def seeded(db):
+    with db.engine.begin() as conn:
+        for statement in SEED_SQL:
+            conn.execute(text(statement))
+    return db
+
+
+def capture_selects(db, fn):
+    """Ejecuta fn y retorna las SELECT que emitio, con sus parametros."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        db.session.rollback()
+    return statements
+
+
+def explain(db, statements):
+    """Planes de ejecucion de todas las sentencias, concatenados."""
+    plans = []
+    with db.engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f'EXPLAIN {statement}', parameters).scalars()
+            plans.append('\n'.join(rows))
+    return '\n\n'.join(plans)
+
+
+@pytest.mark.parametrize('filter_name, index_name', [
+    ('category_ids', 'ix_product_categories_category_id_product_id'),
+    ('tag_ids',      'ix_product_tags_tag_id_product_id'),
+    ('provider_ids', 'ix_product_providers_provider_id_product_id'),
+])
+def test_association_filters_use_reverse_index(seeded, filter_name, index_name):
+    statements = capture_selects(seeded, lambda: ProductRepository.get_paginated(
+        page=1, per_page=15, **{filter_name: [3, 4]}
+    ))
+    assert index_name in explain(seeded, statements)
+
+
+def test_catalog_order_uses_name_index(seeded):
+    statements = capture_selects(seeded, lambda: ProductRepository.get_paginated(page=5, per_page=15))
+    assert 'ix_products_name' in explain(seeded, statements)
+
+
+def test_newest_products_use_created_at_index(seeded):
+    statements = capture_selects(seeded, lambda: (
+        Product.query.order_by(Product.created_at.desc()).limit(15).all()
+    ))
+    assert 'ix_products_created_at' in explain(seeded, statements)
+
+
+def test_page_images_use_product_display_order_index(seeded):
+    statements = capture_selects(seeded, lambda: (
+        Product.query.options(selectinload(Product.images)).order_by(Product.name).limit(15).all()
+    ))
+    image_statements = [s for s in statements if 'FROM product_images' in s[0]]
+    assert image_statements
+    assert 'ix_product_images_product_id_display_order' in explain(seeded, image_statements)
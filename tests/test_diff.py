@@ -0,0 +1,146 @@
+"""
+Parches de texto de la bitacora (app/utils/diff.py) y reconstruccion de
+versiones de site_content. No usan la base: los repositorios se reemplazan
+por objetos en memoria.
+"""
+from types import SimpleNamespace
+import pytest
+
+from app.utils.diff import apply_text_patch, diff_fields, make_text_patch, revert_changes, revert_text_patch
+from app.utils.errors import AppError
+
+
+TEXTS = [
+    ('', ''),
+    ('', 'Texto nuevo'),
+    ('Texto viejo', ''),
+    ('Pisos de porcelanato para exteriores', 'Pisos de porcelanato rectificado para interiores'),
+    ('uno dos tres cuatro', 'uno tres cuatro cinco'),
+    ('  espacios   raros\n\nlineas ', 'espacios raros\nlineas'),
+    ('acentos: cerámica, baño', 'acentos: cerámica y baño ñandú'),
+]
+
+
+@pytest.mark.parametrize('old, new', TEXTS)
+def test_text_patch_round_trip(old, new):
+    patch = make_text_patch(old, new)
+    assert apply_text_patch(old, patch) == new
+    assert revert_text_patch(new, patch) == old
+
+
+def test_text_patch_rejects_wrong_text():
+    patch = make_text_patch('uno dos tres', 'uno tres')
+    with pytest.raises(AppError) as error:
+        revert_text_patch('uno cuatro', patch)
+    assert error.value.status_code == 409
+
+
+@pytest.mark.parametrize('old, new', [(None, 'Ahora tiene texto'), ('Tenia texto', None), (None, '')])
+def test_revert_changes_keeps_none(old, new):
+    changes = diff_fields({'content': old}, {'content': new}, text_fields=('content',))
+    assert revert_changes({'content': new}, changes) == {'content': old}
+
+
+def test_revert_changes_plain_fields():
+    changes = diff_fields({'title': 'A', 'price': 10.0}, {'title': 'B', 'price': 10.0})
+    assert changes == {'title': {'old': 'A', 'new': 'B'}}
+    assert revert_changes({'title': 'B', 'price': 10.0}, changes) == {'title': 'A', 'price': 10.0}
+
+
+def test_revert_changes_detects_missing_intermediate_entry():
+    """v1 -> v2 -> v3 sin la entrada v2 -> v3: revertir v1 -> v2 sobre v3 tiene que fallar,
+    aunque el parche solo tenga operaciones '=' y '+' y las longitudes cuadren."""
+    v1, v2, v3 = 'abc def ', 'abc def ghi', 'abc def xyz'
+    first = diff_fields({'content': v1}, {'content': v2}, text_fields=('content',))
+    assert {op for op, _ in first['content']['patch']} <= {'=', '+'}
+
+    with pytest.raises(AppError) as error:
+        revert_changes({'content': v3}, first)
+    assert error.value.status_code == 409
+
+
+def test_revert_changes_detects_missing_plain_field_entry():
+    changes = diff_fields({'title': 'A'}, {'title': 'B'})
+    with pytest.raises(AppError):
+        revert_changes({'title': 'C'}, changes)
+
+
+# ---------------------------------------------------------------------------
+# SiteContentService.get_version
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def history(monkeypatch):
+    """Contenido actual + entradas UPDATE en memoria (la mas nueva primero al consultar)."""
+    from app.repositories.audit_repository import AuditRepository
+    from app.repositories.site_content_repository import SiteContentRepository
+
+    state = {'content': SimpleNamespace(id=1, title=None, content=None), 'entries': []}
+
+    def add(details):
+        entry = SimpleNamespace(id=len(state['entries']) + 1, entity='site_content', entity_id=1, details=details)
+        state['entries'].append(entry)
+        return entry.id
+
+    def updates_after(entity, entity_id, log):
+        return [entry for entry in reversed(state['entries']) if entry.id > log.id]
+
+    monkeypatch.setattr(SiteContentRepository, 'get_by_key', lambda key: state['content'])
+    monkeypatch.setattr(AuditRepository, 'get_by_id',
+                        lambda audit_id: next(entry for entry in state['entries'] if entry.id == audit_id))
+    monkeypatch.setattr(AuditRepository, 'get_updates_after', updates_after)
+    state['add'] = add
+    return state
+
+
+def edit(history, title, content, legacy=False):
+    """Simula update_site_content: aplica la edicion y registra la entrada (diff o formato viejo)."""
+    current = history['content']
+    old = {'title': current.title, 'content': current.content}
+    new = {'title': title, 'content': content}
+    current.title, current.content = title, content
+    if legacy:
+        return history['add']({'key': 'about_us', 'old': old, 'new': {'key': 'about_us', **new}})
+    return history['add']({'key': 'about_us', 'changes': diff_fields(old, new, text_fields=('content',))})
+
+
+def test_get_version_with_legacy_and_diff_entries(history):
+    from app.services.site_content_service import SiteContentService
+
+    versions = [
+        ('Nosotros', 'Somos una empresa familiar', True),
+        ('Nosotros', 'Somos una empresa familiar desde 1990', True),
+        ('Sobre nosotros', 'Somos una empresa familiar desde 1990.', False),
+        ('Sobre nosotros', 'Somos una empresa familiar con 35 años en pisos.', False),
+    ]
+    ids = [edit(history, title, content, legacy) for title, content, legacy in versions]
+
+    for audit_id, (title, content, _) in zip(ids, versions):
+        assert SiteContentService.get_version('about_us', audit_id) == {'title': title, 'content': content}
+
+
+def test_get_version_with_missing_entry_raises(history):
+    from app.services.site_content_service import SiteContentService
+
+    first = edit(history, 'Nosotros', 'abc def ')
+    second = edit(history, 'Nosotros', 'abc def ghi')
+    edit(history, 'Nosotros', 'abc def xyz')
+    edit(history, 'Nosotros', 'abc def xyz!')
+    del history['entries'][2]
+
+    for audit_id in (first, second):
+        with pytest.raises(AppError) as error:
+            SiteContentService.get_version('about_us', audit_id)
+        assert error.value.status_code == 409
+
+
+def test_get_version_with_missing_entry_before_legacy_raises(history):
+    from app.services.site_content_service import SiteContentService
+
+    first = edit(history, 'Nosotros', 'uno', legacy=True)
+    edit(history, 'Nosotros', 'dos', legacy=True)
+    edit(history, 'Nosotros', 'tres')
+    del history['entries'][2]
+
+    with pytest.raises(AppError):
+        SiteContentService.get_version('about_us', first)
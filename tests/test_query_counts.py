@@ -0,0 +1,206 @@
+"""
+Cantidad maxima de sentencias SQL (y de COMMIT) por endpoint, sobre un
+catalogo sembrado con varias imagenes, categorias, etiquetas y proveedores
+por producto. Si un cambio agrega un N+1 (una relacion lazy recorrida por
+producto) o un commit de mas, estas pruebas fallan y muestran las sentencias.
+
+Los limites no dependen del tamaño de la pagina: una relacion nueva en el
+listado tiene que cargarse con selectinload (una consulta por pagina).
+"""
+import io
+import json
+import pytest
+from PIL import Image
+
+
+PRODUCTS = 40
+
+# require_auth con la cache de admins fria: chequeo de version + carga del admin
+AUTH_QUERIES = 2
+
+
+@pytest.fixture(scope='module')
+def catalog(db):
+    from app.models import Admin
+    from benchmarks.catalog_seed import CatalogSeedService
+
+    CatalogSeedService.generate(PRODUCTS, seed=3, categories=6, tags=8, providers=4, log=lambda message: None)
+
+    admin = Admin(email='queries@pisoskermy.local', name='Consultas')
+    admin.set_password('queries-password-123')
+    db.session.add(admin)
+    db.session.commit()
+    admin_id = admin.id
+    db.session.remove()
+    return {'admin_id': admin_id}
+
+
+@pytest.fixture
+def client(app, catalog):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth(catalog):
+    """Cabecera de un admin valido, con la cache de admins vacia (peor caso de require_auth)."""
+    from app.utils.admin_cache import admin_cache
+    from app.utils.auth import generate_token
+
+    admin_cache.clear()
+    return {'Authorization': f"Bearer {generate_token(catalog['admin_id'])}"}
+
+
+@pytest.fixture
+def fake_upload(monkeypatch):
+    """Reemplaza la subida a Cloudinary: las pruebas miden la base, no la red."""
+    import cloudinary.uploader
+
+    counter = iter(range(1, 1000))
+
+    def upload(file, **options):
+        number = next(counter)
+        return {'public_id': f'pisos-kermy/test-{number}',
+                'secure_url': f'https://res.cloudinary.com/test/image/upload/v1/pisos-kermy/test-{number}.webp'}
+
+    monkeypatch.setattr(cloudinary.uploader, 'upload', upload)
+    monkeypatch.setattr(cloudinary.uploader, 'destroy', lambda public_id, **options: {'result': 'ok'})
+
+
+def jpeg():
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 48), (120, 90, 60)).save(buffer, 'JPEG')
+    buffer.seek(0)
+    return buffer
+
+
+# ---------------------------------------------------------------------------
+# Catalogo publico: count + pagina + una consulta por relacion serializada
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize('query_string', [
+    'page=1',
+    'page=2',
+    'category_id=1',
+    'category_id=1&category_id=2&tag_id=1',
+    'tag_id=2&search=o',
+    'search=porcelanato',
+])
+def test_list_products(client, assert_max_queries, query_string):
+    with assert_max_queries(6):
+        response = client.get(f'/api/products?{query_string}')
+    assert response.status_code == 200
+
+
+def test_list_products_full_page_has_related_rows(client, assert_max_queries):
+    """El limite vale para una pagina llena de productos con varias imagenes y relaciones."""
+    with assert_max_queries(6):
+        products = client.get('/api/products').get_json()['products']
+    assert len(products) == 15
+    assert all(product['images'] and product['categories'] and product['tags'] for product in products)
+
+
+def test_get_product(client, assert_max_queries):
+    with assert_max_queries(4):
+        response = client.get('/api/products/5')
+    assert response.status_code == 200
+
+
+def test_get_product_not_found(client, assert_max_queries):
+    with assert_max_queries(1):
+        response = client.get('/api/products/999999')
+    assert response.status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# Admin (require_auth)
+# ---------------------------------------------------------------------------
+
+def test_require_auth_with_warm_cache_does_not_query(client, auth, assert_max_queries, monkeypatch):
+    from app.utils.admin_cache import admin_cache
+
+    monkeypatch.setattr(admin_cache, 'version_check', 3600)
+    client.get('/api/auth/slow-queries', headers=auth)
+    with assert_max_queries(0):
+        response = client.get('/api/auth/slow-queries', headers=auth)
+    assert response.status_code == 200
+
+
+def test_require_auth_rejects_without_queries(client, assert_max_queries):
+    with assert_max_queries(0):
+        response = client.get('/api/admin/products', headers={'Authorization': 'Bearer invalido'})
+    assert response.status_code == 401
+
+
+@pytest.mark.parametrize('query_string', ['page=1', 'provider_id=1', 'category_id=2&search=a'])
+def test_admin_list_products(client, auth, assert_max_queries, query_string):
+    # El listado admin tambien carga los proveedores
+    with assert_max_queries(AUTH_QUERIES + 7):
+        response = client.get(f'/api/admin/products?{query_string}', headers=auth)
+    assert response.status_code == 200
+
+
+def test_create_product(client, auth, assert_max_queries, fake_upload):
+    data = {
+        'name':         'Porcelanato de prueba',
+        'price':        '25.50',
+        'category_ids': json.dumps([1, 2, 3]),
+        'tag_ids':      json.dumps([1, 2, 3, 4]),
+        'provider_ids': json.dumps([1, 2]),
+        'images':       [(jpeg(), 'a.jpg'), (jpeg(), 'b.jpg')],
+    }
+    # Producto, imagenes y bitacora: un commit cada uno
+    with assert_max_queries(AUTH_QUERIES + 19, commits=3):
+        response = client.post('/api/admin/products', headers=auth, data=data, content_type='multipart/form-data')
+    assert response.status_code == 201
+
+
+def test_create_product_relations_do_not_scale_with_ids(client, auth, assert_max_queries):
+    """Las categorias/etiquetas/proveedores se resuelven con una consulta por tipo, no una por id."""
+    from app.utils.admin_cache import admin_cache
+
+    counts = []
+    for size in (1, 4):
+        admin_cache.clear()
+        data = {
+            'name':         f'Relaciones {size}',
+            'price':        10,
+            'category_ids': list(range(1, size + 1)),
+            'tag_ids':      list(range(1, size + 1)),
+            'provider_ids': list(range(1, size + 1)),
+        }
+        with assert_max_queries(AUTH_QUERIES + 14, commits=2) as counter:
+            response = client.post('/api/admin/products', headers=auth, json=data)
+        assert response.status_code == 201
+        counts.append(len(counter.statements))
+    assert counts[0] == counts[1]
+
+
+def test_update_product(client, auth, assert_max_queries):
+    data = {'price': 99.9, 'description': 'Nueva descripcion', 'category_ids': [2, 3], 'tag_ids': [1]}
+    with assert_max_queries(AUTH_QUERIES + 20, commits=2):
+        response = client.put('/api/admin/products/7', headers=auth, json=data)
+    assert response.status_code == 200
+
+
+def test_update_product_with_image(client, auth, assert_max_queries, fake_upload):
+    with assert_max_queries(AUTH_QUERIES + 18, commits=3):
+        response = client.put('/api/admin/products/8', headers=auth, content_type='multipart/form-data',
+                              data={'name': 'Con imagen nueva', 'images': [(jpeg(), 'c.jpg')]})
+    assert response.status_code == 200
+
+
+def test_delete_product(client, auth, assert_max_queries, fake_upload):
+    with assert_max_queries(AUTH_QUERIES + 12, commits=2):
+        response = client.delete('/api/admin/products/9', headers=auth)
+    assert response.status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# Bitacora
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize('query_string', ['', 'page=2', 'cursor=', 'entity=product&entity_id=3', 'action=UPDATE'])
+def test_audit_listing(client, auth, assert_max_queries, query_string):
+    with assert_max_queries(AUTH_QUERIES + 2):
+        response = client.get(f'/api/auth/audit?{query_string}', headers=auth)
+    assert response.status_code == 200